@@ -0,0 +1,143 @@
+/*
+ * Swap the static Bloch sphere images for rotatable 3D scenes.
+ *
+ * scripts/mkdocs_hooks.py marks the images of interactive figures with
+ * data-plotly-scene (the figure's <name>.plotly.json) and
+ * data-plotly-geometry (the sphere and equator shared by every scene, see
+ * scripts/bloch_interactive.py). Nothing is fetched until an image comes
+ * near the viewport; then the scene, the shared geometry and plotly.js
+ * (from the URL in the scene's layout.meta) are loaded, each only once
+ * per page. If anything fails, the image stays.
+ */
+(function () {
+  "use strict";
+
+  var geometryRequests = {};
+  var plotlyRequest = null;
+
+  function fetchJSON(url) {
+    return fetch(url).then(function (response) {
+      if (!response.ok) {
+        throw new Error(url + ": " + response.status);
+      }
+      return response.json();
+    });
+  }
+
+  function loadGeometry(url) {
+    if (!geometryRequests[url]) {
+      geometryRequests[url] = fetchJSON(url);
+    }
+    return geometryRequests[url];
+  }
+
+  function loadPlotly(url) {
+    if (window.Plotly) {
+      return Promise.resolve(window.Plotly);
+    }
+    if (!plotlyRequest) {
+      plotlyRequest = new Promise(function (resolve, reject) {
+        var script = document.createElement("script");
+        script.src = url;
+        script.async = true;
+        script.onload = function () { resolve(window.Plotly); };
+        script.onerror = function () {
+          plotlyRequest = null;
+          reject(new Error(url));
+        };
+        document.head.appendChild(script);
+      });
+    }
+    return plotlyRequest;
+  }
+
+  function resolveGeometry(scene, geometry) {
+    scene.data.forEach(function (trace) {
+      var name = trace.meta && trace.meta.geometry;
+      if (name && geometry[name]) {
+        Object.assign(trace, geometry[name]);
+      }
+    });
+    return scene;
+  }
+
+  function showScene(img) {
+    var sceneRequest = fetchJSON(img.dataset.plotlyScene);
+    var geometryRequest = loadGeometry(img.dataset.plotlyGeometry);
+    var plotlyReady = sceneRequest.then(function (scene) {
+      return loadPlotly(scene.layout.meta.plotlyjs);
+    });
+
+    return Promise.all([sceneRequest, geometryRequest, plotlyReady]).then(function (loaded) {
+      var scene = resolveGeometry(loaded[0], loaded[1]);
+      var container = document.createElement("div");
+      container.className = "bloch-interactive";
+      container.setAttribute("role", "img");
+      container.setAttribute("aria-label", img.alt);
+      container.style.width = "100%";
+      container.style.aspectRatio = String(scene.layout.meta.aspect);
+      img.replaceWith(container);
+      return loaded[2].newPlot(container, scene.data, scene.layout,
+                               { responsive: true, displaylogo: false });
+    });
+  }
+
+  function restore(img) {
+    if (img.dataset.srcset) {
+      img.srcset = img.dataset.srcset;
+      delete img.dataset.srcset;
+    }
+    if (img.dataset.src) {
+      img.src = img.dataset.src;
+      delete img.dataset.src;
+    }
+  }
+
+  function init() {
+    var images = document.querySelectorAll("img[data-plotly-scene]");
+    if (!images.length || !window.fetch || !window.Promise) {
+      return;
+    }
+
+    var observer = "IntersectionObserver" in window
+      ? new IntersectionObserver(function (entries) {
+          entries.forEach(function (entry) {
+            if (entry.isIntersecting) {
+              observer.unobserve(entry.target);
+              load(entry.target);
+            }
+          });
+        }, { rootMargin: "200px" })
+      : null;
+
+    function load(img) {
+      showScene(img).catch(function (error) {
+        restore(img);
+        console.warn("Interactive Bloch sphere unavailable:", error);
+      });
+    }
+
+    images.forEach(function (img) {
+      // The scene replaces the image, so skip downloading it if not started
+      if (!img.complete) {
+        if (img.hasAttribute("srcset")) {
+          img.dataset.srcset = img.getAttribute("srcset");
+          img.removeAttribute("srcset");
+        }
+        img.dataset.src = img.getAttribute("src");
+        img.removeAttribute("src");
+      }
+      if (observer) {
+        observer.observe(img);
+      } else {
+        load(img);
+      }
+    });
+  }
+
+  if (document.readyState === "loading") {
+    document.addEventListener("DOMContentLoaded", init);
+  } else {
+    init();
+  }
+})();
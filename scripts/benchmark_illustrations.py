@@ -0,0 +1,264 @@
+#!/usr/bin/env python3
+"""
+Benchmark the illustration generators figure by figure.
+
+Each figure from both generator scripts runs in its own fresh Python
+process, several times, so import costs are real cold starts and one
+figure's memory use cannot hide another's. Per run it records:
+
+- import:  numpy, matplotlib, the generator script and the figure's @requires
+- compute: time inside the generate_* function outside savefig (state
+  preparation and building the artists)
+- draw:    matplotlib's render pass (Figure.draw), which happens inside
+  savefig, once more with bbox_inches='tight'
+- savefig: the rest of savefig: PNG encoding and writing the file
+- peak RSS of the process and the size of the written PNG
+
+Outputs are redirected into a temporary directory, so benchmarking never
+touches the committed illustrations. The persistent simulation and
+circuit diagram caches are turned off in the child processes, so every
+iteration times the simulation itself rather than a cache hit. Times are
+reported as the median over the iterations, peak RSS as the maximum.
+
+Results can be saved as JSON and compared with a stored baseline; any
+metric that grew by more than the threshold is flagged as a regression
+and the exit status is non-zero. Timings below a small absolute noise
+floor are never flagged.
+
+Requirements:
+- matplotlib
+- numpy
+- qiskit (for the circuit and simulation figures)
+
+Usage:
+    python scripts/benchmark_illustrations.py
+    python scripts/benchmark_illustrations.py --iterations 5 --json bench/baseline.json
+    python scripts/benchmark_illustrations.py --baseline bench/baseline.json --threshold 15
+    python scripts/benchmark_illustrations.py --only bloch_sphere_basic
+"""
+
+import argparse
+import contextlib
+import importlib
+import io
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+import illustration_store
+from build_illustrations import select_figures
+from illustration_cache import library_versions
+from illustration_registry import BASE_MODULES, discover_figures, import_requirements
+from statevector_scaling import peak_rss_bytes
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.dirname(SCRIPT_DIR)
+
+RESULTS_VERSION = 1
+
+TIME_METRICS = ['import_ms', 'compute_ms', 'draw_ms', 'savefig_ms', 'total_ms']
+METRICS = TIME_METRICS + ['peak_rss_mb', 'output_bytes']
+
+# Differences below these are noise, whatever the percentage
+NOISE_FLOOR = {'ms': 25.0, 'peak_rss_mb': 5.0, 'output_bytes': 1024}
+
+
+# ============================================================================
+# Child process: one run of one figure
+# ============================================================================
+
+def _run_once(module_name, func_name, output_dir):
+    """
+    Run inside a fresh interpreter: time one figure and print the result as JSON.
+
+    Figure.savefig and Figure.draw are wrapped to attribute time to them;
+    savefig also rewrites the target path into ``output_dir``, and nothing
+    is committed to the output store.
+    """
+    timings = {'draw': 0.0, 'savefig': 0.0}
+    written = []
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        start = time.perf_counter()
+        for name in BASE_MODULES:
+            importlib.import_module(name)
+        module = importlib.import_module(module_name)
+        func = getattr(module, func_name)
+        import_requirements(func)
+        import_seconds = time.perf_counter() - start
+
+        from matplotlib.figure import Figure
+        original_draw, original_savefig = Figure.draw, Figure.savefig
+
+        def draw(self, renderer):
+            draw_start = time.perf_counter()
+            try:
+                return original_draw(self, renderer)
+            finally:
+                timings['draw'] += time.perf_counter() - draw_start
+
+        def savefig(self, fname, *args, **kwargs):
+            if isinstance(fname, (str, os.PathLike)):
+                fname = os.path.join(output_dir, os.path.basename(fname))
+                written.append(fname)
+            save_start = time.perf_counter()
+            try:
+                return original_savefig(self, fname, *args, **kwargs)
+            finally:
+                timings['savefig'] += time.perf_counter() - save_start
+
+        Figure.draw, Figure.savefig = draw, savefig
+        illustration_store.commit = lambda staged, path: os.remove(staged)
+
+        start = time.perf_counter()
+        func()
+        run_seconds = time.perf_counter() - start
+
+    print(json.dumps({
+        'import_ms': import_seconds * 1000,
+        'compute_ms': (run_seconds - timings['savefig']) * 1000,
+        'draw_ms': timings['draw'] * 1000,
+        'savefig_ms': (timings['savefig'] - timings['draw']) * 1000,
+        'total_ms': (import_seconds + run_seconds) * 1000,
+        'peak_rss_mb': peak_rss_bytes() / 2**20,
+        'output_bytes': sum(os.path.getsize(path) for path in written),
+    }))
+
+
+def run_figure(spec, output_dir):
+    """Benchmark one run of a figure in a fresh Python process."""
+    # Imported here, so the child's own import of this module stays light
+    from circuit_diagrams import CACHE_ENV as DIAGRAM_CACHE_ENV
+    from simulation_cache import CACHE_ENV as SIM_CACHE_ENV
+
+    code = (f'import sys; sys.path.insert(0, {SCRIPT_DIR!r}); '
+            f'from benchmark_illustrations import _run_once; '
+            f'_run_once({spec.module!r}, {spec.name!r}, {output_dir!r})')
+    env = dict(os.environ, MPLBACKEND='Agg', **{SIM_CACHE_ENV: '0', DIAGRAM_CACHE_ENV: '0'})
+    result = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True,
+                            cwd=PROJECT_ROOT, env=env)
+    if result.returncode != 0:
+        raise RuntimeError(f'{spec.id} failed:\n{result.stderr.rstrip()}')
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+# ============================================================================
+# Benchmark driver
+# ============================================================================
+
+def summarize(runs):
+    """Median times, maximum peak RSS and the last output size over several runs."""
+    summary = {metric: statistics.median(run[metric] for run in runs)
+               for metric in TIME_METRICS}
+    summary['peak_rss_mb'] = max(run['peak_rss_mb'] for run in runs)
+    summary['output_bytes'] = runs[-1]['output_bytes']
+    return summary
+
+
+def benchmark(figures, iterations=3):
+    """
+    Benchmark each figure over several isolated runs.
+
+    Returns:
+        Results dict ready to be written as JSON.
+    """
+    results = {}
+    with tempfile.TemporaryDirectory(prefix='illustration-bench-') as output_dir:
+        for spec in figures:
+            runs = [run_figure(spec, output_dir) for _ in range(iterations)]
+            results[spec.id] = summarize(runs)
+            row = results[spec.id]
+            print(f"{spec.name:<40} {row['import_ms']:8.0f} {row['compute_ms']:8.0f} "
+                  f"{row['draw_ms']:8.0f} {row['savefig_ms']:8.0f} {row['total_ms']:8.0f} "
+                  f"{row['peak_rss_mb']:7.0f} {row['output_bytes'] / 1024:8.0f}")
+    return {
+        'version': RESULTS_VERSION,
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'libraries': library_versions(),
+        'iterations': iterations,
+        'figures': results,
+    }
+
+
+def _noise_floor(metric):
+    return NOISE_FLOOR['ms'] if metric.endswith('_ms') else NOISE_FLOOR[metric]
+
+
+def compare(current, baseline, threshold=10.0):
+    """
+    Compare results with a baseline.
+
+    Args:
+        current: Results from ``benchmark``
+        baseline: Previously saved results
+        threshold: Allowed growth in percent before a metric counts as a regression
+
+    Returns:
+        List of (figure id, metric, baseline value, current value, percent change)
+        for every regression.
+    """
+    regressions = []
+    for figure_id, metrics in current['figures'].items():
+        before = baseline.get('figures', {}).get(figure_id)
+        if before is None:
+            continue
+        for metric in METRICS:
+            old, new = before.get(metric), metrics[metric]
+            if not old or new - old <= _noise_floor(metric):
+                continue
+            change = (new - old) / old * 100
+            if change > threshold:
+                regressions.append((figure_id, metric, old, new, change))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmark illustration generation.')
+    parser.add_argument('--only', action='append', metavar='FIGURE',
+                        help='benchmark only this figure (repeatable)')
+    parser.add_argument('-n', '--iterations', type=int, default=3,
+                        help='isolated runs per figure (default: 3)')
+    parser.add_argument('--json', metavar='PATH', help='write the results to this file')
+    parser.add_argument('--baseline', metavar='PATH',
+                        help='compare with results saved earlier with --json')
+    parser.add_argument('--threshold', type=float, default=10.0,
+                        help='percent growth that counts as a regression (default: 10)')
+    args = parser.parse_args(argv)
+
+    figures = select_figures(discover_figures(), args.only)
+
+    print(f"📊 Benchmarking {len(figures)} figure(s), {args.iterations} run(s) each")
+    print("=" * 60)
+    print(f"{'figure':<40} {'import':>8} {'compute':>8} {'draw':>8} {'savefig':>8} "
+          f"{'total':>8} {'RSS MB':>7} {'KB':>8}")
+    results = benchmark(figures, iterations=args.iterations)
+
+    if args.json:
+        os.makedirs(os.path.dirname(os.path.abspath(args.json)), exist_ok=True)
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2, sort_keys=True)
+            f.write('\n')
+        print(f"\n💾 Saved results to {args.json}")
+
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, threshold=args.threshold)
+        print("\n" + "=" * 60)
+        if regressions:
+            print(f"❌ {len(regressions)} regression(s) over {args.threshold:.0f}%:")
+            for figure_id, metric, old, new, change in regressions:
+                print(f"   {figure_id} {metric}: {old:.1f} → {new:.1f} (+{change:.0f}%)")
+            return 1
+        print(f"✅ No regressions over {args.threshold:.0f}% against {args.baseline}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,308 @@
+#!/usr/bin/env python3
+"""
+Compare the local simulator engines on the teaching circuits.
+
+Runs the circuits from simulator_backends.py (H + measure, the Bell
+circuit, the foundations gate sequence, and a GHZ chain at increasing
+qubit counts) on every installed engine: NumPy, memmap, Qiskit Aer, Cirq,
+PennyLane and Braket. Per engine, circuit and qubit count it reports:
+
+- latency:   median wall time of a 1-shot run, i.e. the fixed cost of
+             translating, setting up and running a circuit
+- shots/sec: throughput of a run with --shots shots
+- build:     median time of a run at the build's shot count (1000), which
+             is what the illustration figures actually pay
+- TVD:       total variation distance of the sampled histogram from the
+             exact distribution; a point is flagged when it is far beyond
+             sampling noise, which catches translation mistakes
+
+Each engine's first import is timed separately and every point is warmed
+up once before it is measured. An engine stops growing the GHZ chain once
+a point takes longer than the time limit.
+
+Results are written as JSON (default: data/simulator-throughput.json), and
+--markdown writes the comparison as a Markdown table for the frameworks
+chapter. The engine with the lowest total build time over the teaching
+circuits is printed as the recommendation for ``--engine`` on
+build_illustrations.py.
+
+Requirements:
+- numpy
+- qiskit
+- qiskit-aer, cirq, pennylane, amazon-braket-sdk (optional; each engine
+  is benchmarked when installed)
+
+Usage:
+    python scripts/benchmark_simulators.py
+    python scripts/benchmark_simulators.py --engine numpy --engine cirq --qubits 1 2 4 8
+    python scripts/benchmark_simulators.py --shots 100000 --markdown /tmp/simulators.md
+"""
+
+import argparse
+import json
+import math
+import os
+import platform
+import statistics
+import sys
+import time
+from importlib import metadata
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.dirname(SCRIPT_DIR)
+DATA_PATH = os.path.join(PROJECT_ROOT, 'data', 'simulator-throughput.json')
+
+DATA_VERSION = 1
+
+# Shots per figure in the illustration builds
+BUILD_SHOTS = 1000
+
+DEFAULT_SHOTS = 10000
+DEFAULT_QUBITS = (1, 2, 4, 8, 12, 16)
+DEFAULT_REPEATS = 5
+
+# A histogram is flagged when its TVD exceeds this many times the typical
+# sampling noise, sqrt(outcomes / shots)
+TVD_TOLERANCE = 5
+
+# Installed package versions recorded with the results
+PACKAGES = ['numpy', 'qiskit', 'qiskit-aer', 'cirq-core', 'pennylane', 'amazon-braket-sdk']
+
+
+def package_versions():
+    versions = {}
+    for name in PACKAGES:
+        try:
+            versions[name] = metadata.version(name)
+        except metadata.PackageNotFoundError:
+            versions[name] = None
+    return versions
+
+
+def workloads(qubits):
+    """(circuit name, qubit count, QuantumCircuit) for every benchmarked point."""
+    from simulator_backends import TEACHING_CIRCUITS
+
+    points = []
+    for name, factory in TEACHING_CIRCUITS.items():
+        if name == 'ghz':
+            points += [(name, n, factory(n)) for n in qubits]
+        else:
+            circuit = factory()
+            points.append((name, circuit.num_qubits, circuit))
+    return points
+
+
+# ============================================================================
+# Measurement
+# ============================================================================
+
+def _median_seconds(run, repeats):
+    times = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        run()
+        times.append(time.perf_counter() - start)
+    return statistics.median(times)
+
+
+def total_variation(counts, probabilities):
+    """Total variation distance between sampled counts and exact probabilities."""
+    shots = sum(counts.values())
+    outcomes = set(counts) | set(probabilities)
+    return 0.5 * sum(abs(counts.get(o, 0) / shots - probabilities.get(o, 0.0))
+                     for o in outcomes)
+
+
+def measure_point(engine, circuit, shots, repeats):
+    """
+    Latency, throughput, build time and accuracy of one engine on one circuit.
+
+    Returns:
+        Dict with latency_ms, shots_per_second, build_ms, tvd and ok
+    """
+    from statevector_sim import probabilities, run_counts
+
+    def run(shots):
+        # Bypass the results cache: every run must simulate
+        return run_counts(circuit, shots=shots, engine=engine, cache=False)
+
+    run(1)  # warm up lazy imports and caches
+    latency = _median_seconds(lambda: run(1), repeats)
+    build = _median_seconds(lambda: run(BUILD_SHOTS), repeats)
+    counts = {}
+
+    def sample():
+        counts.clear()
+        counts.update(run(shots))
+
+    throughput = shots / _median_seconds(sample, max(1, repeats // 2))
+    exact = probabilities(circuit)
+    tvd = total_variation(counts, exact)
+    return {
+        'latency_ms': latency * 1000,
+        'shots_per_second': throughput,
+        'build_ms': build * 1000,
+        'tvd': tvd,
+        'ok': tvd <= TVD_TOLERANCE * math.sqrt(len(exact) / shots),
+    }
+
+
+def run_benchmark(engines, qubits=DEFAULT_QUBITS, shots=DEFAULT_SHOTS,
+                  repeats=DEFAULT_REPEATS, time_limit=10.0):
+    """
+    Benchmark every engine on every workload.
+
+    Args:
+        engines: Engine names (see statevector_sim.ENGINES)
+        qubits: GHZ chain sizes
+        shots: Shots for the throughput runs
+        repeats: Runs per timing (the median is kept)
+        time_limit: Stop an engine's GHZ chain once a point takes longer (seconds)
+
+    Returns:
+        Results dict ready to be written as JSON
+    """
+    from illustration_registry import timed_import
+    from simulator_backends import BACKEND_MODULES
+
+    points = workloads(sorted(qubits))
+    imports = {}
+    results = []
+    for engine in engines:
+        imports[engine] = timed_import(BACKEND_MODULES[engine])
+        print(f"⚙️  {engine} (import {imports[engine]:.0f} ms)")
+        for name, num_qubits, circuit in points:
+            start = time.perf_counter()
+            try:
+                point = measure_point(engine, circuit, shots, repeats)
+            except Exception as e:
+                print(f"   ⚠️  {name} ({num_qubits} qubits) failed: {e}")
+                if name == 'ghz':
+                    break
+                continue
+            point.update(engine=engine, circuit=name, qubits=num_qubits)
+            results.append(point)
+            flag = '✅' if point['ok'] else '❌'
+            print(f"   {flag} {name:<14} {num_qubits:3d}q {point['latency_ms']:10.2f} ms "
+                  f"{point['shots_per_second']:14,.0f} shots/s")
+            if name == 'ghz' and time.perf_counter() - start > time_limit:
+                print(f"   ⏱️  stopping {engine} after {num_qubits} qubits")
+                break
+
+    return {
+        'version': DATA_VERSION,
+        'shots': shots,
+        'build_shots': BUILD_SHOTS,
+        'machine': {
+            'platform': platform.platform(),
+            'processor': platform.processor() or platform.machine(),
+            'cpu_count': os.cpu_count(),
+        },
+        'packages': package_versions(),
+        'imports_ms': imports,
+        'results': results,
+    }
+
+
+# ============================================================================
+# Reporting
+# ============================================================================
+
+def build_ranking(data):
+    """
+    Engines by total build time over the fixed-size teaching circuits.
+
+    Only engines that ran every one of those circuits correctly are ranked.
+
+    Returns:
+        List of (engine, milliseconds), fastest first
+    """
+    teaching = {(point['circuit'], point['qubits']) for point in data['results']
+                if point['circuit'] != 'ghz'}
+    totals = {}
+    for engine in data['imports_ms']:
+        points = [point for point in data['results'] if point['engine'] == engine
+                  and point['circuit'] != 'ghz']
+        if len(points) == len(teaching) and all(point['ok'] for point in points):
+            totals[engine] = sum(point['build_ms'] for point in points)
+    return sorted(totals.items(), key=lambda item: item[1])
+
+
+def markdown_table(data):
+    """The results as a Markdown table."""
+    lines = [
+        f"Measured on {data['machine']['processor']} ({data['machine']['cpu_count']} CPUs); "
+        f"throughput at {data['shots']:,} shots, build time at {data['build_shots']:,}.",
+        '',
+        '| Engine | Circuit | Qubits | Latency (ms) | Shots/s | Build (ms) |',
+        '|--------|---------|-------:|-------------:|--------:|-----------:|',
+    ]
+    for point in data['results']:
+        lines.append(f"| {point['engine']} | {point['circuit']} | {point['qubits']} | "
+                     f"{point['latency_ms']:.2f} | {point['shots_per_second']:,.0f} | "
+                     f"{point['build_ms']:.2f} |")
+    return '\n'.join(lines) + '\n'
+
+
+def main(argv=None):
+    if SCRIPT_DIR not in sys.path:
+        sys.path.insert(0, SCRIPT_DIR)
+    from simulator_backends import available_backends
+    from statevector_sim import ENGINES
+
+    parser = argparse.ArgumentParser(description='Benchmark the local simulator engines.')
+    parser.add_argument('--engine', action='append', choices=sorted(ENGINES), dest='engines',
+                        help='engine to benchmark (repeatable, default: every installed one)')
+    parser.add_argument('--qubits', type=int, nargs='+', default=list(DEFAULT_QUBITS),
+                        metavar='N', help='GHZ chain sizes (default: '
+                                          f"{' '.join(map(str, DEFAULT_QUBITS))})")
+    parser.add_argument('--shots', type=int, default=DEFAULT_SHOTS,
+                        help=f'shots per throughput run (default: {DEFAULT_SHOTS})')
+    parser.add_argument('--repeats', type=int, default=DEFAULT_REPEATS,
+                        help=f'runs per timing, median kept (default: {DEFAULT_REPEATS})')
+    parser.add_argument('--time-limit', type=float, default=10.0,
+                        help="stop an engine's GHZ chain after a point slower than this, "
+                             "in seconds")
+    parser.add_argument('--output', default=DATA_PATH, help='results file')
+    parser.add_argument('--markdown', metavar='PATH',
+                        help='also write the comparison as a Markdown table')
+    args = parser.parse_args(argv)
+
+    requested = args.engines or list(ENGINES)
+    engines = available_backends(requested)
+    for engine in requested:
+        if engine not in engines:
+            print(f"⚠️  {engine} is not installed, skipping")
+    if not engines:
+        print("❌ None of the requested engines is installed")
+        return 1
+
+    print(f"🏎️  Simulator throughput on {', '.join(engines)}")
+    print("=" * 60)
+    data = run_benchmark(engines, qubits=args.qubits, shots=args.shots,
+                         repeats=args.repeats, time_limit=args.time_limit)
+
+    os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(data, f, indent=2)
+        f.write('\n')
+    print(f"\n💾 Saved results to {args.output}")
+    if args.markdown:
+        with open(args.markdown, 'w', encoding='utf-8') as f:
+            f.write(markdown_table(data))
+        print(f"📝 Markdown table written to {args.markdown}")
+
+    ranking = build_ranking(data)
+    if ranking:
+        print(f"🏁 Fastest for builds: {ranking[0][0]} "
+              f"({', '.join(f'{engine} {ms:.1f} ms' for engine, ms in ranking)})")
+    failed = [point for point in data['results'] if not point['ok']]
+    for point in failed:
+        print(f"❌ {point['engine']} {point['circuit']} ({point['qubits']} qubits): "
+              f"TVD {point['tvd']:.3f} is beyond sampling noise")
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,423 @@
+#!/usr/bin/env python3
+"""
+Animate gate rotations on the Bloch sphere as a streaming frame pipeline.
+
+Sweeps a state vector continuously through a gate sequence (by default the
+|0⟩ → H → Z → H → |1⟩ sequence from generate_gate_transformation_sequence),
+treating each gate as a rotation of the Bloch sphere.
+
+The pipeline is built for hundreds of frames:
+- The sphere, axes and labels are drawn once per worker and kept as a
+  blitting background; each frame restores it and redraws only the moving
+  vector, its trail, the rotation axis and the caption.
+- Frames are rendered in chunks across a process pool and handed to the
+  encoder in order, with only a few chunks in flight at a time, so the
+  full animation is never held in memory.
+- GIF frames are written incrementally with Pillow. MP4 and WebP stream
+  raw frames into ffmpeg, which must be on PATH for those formats.
+- Each format is written to a staging file and committed through the
+  output store once complete (see illustration_store.py), so a failed
+  or interrupted render never leaves a truncated file behind.
+
+Requirements:
+- matplotlib
+- numpy
+- pillow (GIF)
+- ffmpeg (MP4/WebP)
+
+Usage:
+    python scripts/bloch_animation.py
+    python scripts/bloch_animation.py --sequence x y z h --format gif --format mp4
+    python scripts/bloch_animation.py --frames-per-gate 90 --jobs 4
+"""
+
+import argparse
+import itertools
+import os
+import shutil
+import subprocess
+import sys
+import time
+from collections import deque, namedtuple
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.dirname(SCRIPT_DIR)
+DEFAULT_OUTPUT = os.path.join(PROJECT_ROOT, 'docs', 'foundations', 'illustrations',
+                              'gate-rotations')
+
+# Rotation (axis, angle) each gate applies to the Bloch sphere
+GATE_ROTATIONS = {
+    'x': ((1, 0, 0), np.pi),
+    'y': ((0, 1, 0), np.pi),
+    'z': ((0, 0, 1), np.pi),
+    'h': ((1 / np.sqrt(2), 0, 1 / np.sqrt(2)), np.pi),
+    's': ((0, 0, 1), np.pi / 2),
+    'sdg': ((0, 0, 1), -np.pi / 2),
+    't': ((0, 0, 1), np.pi / 4),
+    'tdg': ((0, 0, 1), -np.pi / 4),
+}
+
+FORMATS = ('gif', 'mp4', 'webp')
+
+
+class AnimationSpec(namedtuple('AnimationSpec', ['sequence', 'frames_per_gate',
+                                                 'hold_frames', 'size', 'dpi', 'fps'])):
+    """
+    Everything that determines the frames of an animation.
+
+    sequence: Gate names, applied to |0⟩ in order
+    frames_per_gate: Frames spent sweeping each rotation
+    hold_frames: Still frames at the start and after each gate
+    size: Figure size in inches (square)
+    dpi: Render resolution
+    fps: Playback rate
+    """
+
+    __slots__ = ()
+
+
+# ============================================================================
+# Trajectory
+# ============================================================================
+
+def rotate(vectors, axis, angles):
+    """
+    Rotate Bloch vectors about an axis (Rodrigues' formula, batched over angles).
+
+    Args:
+        vectors: Array of shape (3,) or (n, 3)
+        axis: Rotation axis, shape (3,)
+        angles: Array of n rotation angles
+
+    Returns:
+        Array of shape (n, 3)
+    """
+    axis = np.asarray(axis, dtype=float)
+    axis = axis / np.linalg.norm(axis)
+    vectors = np.broadcast_to(np.asarray(vectors, dtype=float), (len(angles), 3))
+    cos, sin = np.cos(angles)[:, None], np.sin(angles)[:, None]
+    return (vectors * cos + np.cross(axis, vectors) * sin
+            + axis * (vectors @ axis)[:, None] * (1 - cos))
+
+
+def trajectory(spec):
+    """
+    Bloch vector and active gate for every frame.
+
+    Returns:
+        (points, steps): points has shape (n_frames, 3); steps[i] is the index
+        of the gate being applied in frame i, or -1 while holding still.
+    """
+    state = np.array([0.0, 0.0, 1.0])  # |0⟩
+    points = [np.tile(state, (spec.hold_frames, 1))]
+    steps = [np.full(spec.hold_frames, -1)]
+    for index, gate in enumerate(spec.sequence):
+        axis, angle = GATE_ROTATIONS[gate]
+        sweep = rotate(state, axis, np.linspace(0, angle, spec.frames_per_gate))
+        state = sweep[-1]
+        points += [sweep, np.tile(state, (spec.hold_frames, 1))]
+        steps += [np.full(spec.frames_per_gate, index), np.full(spec.hold_frames, index)]
+    return np.concatenate(points), np.concatenate(steps)
+
+
+def frame_count(spec):
+    return spec.hold_frames + len(spec.sequence) * (spec.frames_per_gate + spec.hold_frames)
+
+
+# ============================================================================
+# Frame rendering (runs in worker processes)
+# ============================================================================
+
+class FrameRenderer:
+    """
+    Renders frames of one animation by blitting over a cached background.
+
+    The static sphere is drawn once when the renderer is created; all
+    per-frame artists are marked animated so they stay out of it.
+    """
+
+    def __init__(self, spec):
+        from matplotlib.backends.backend_agg import FigureCanvasAgg
+        from matplotlib.figure import Figure
+
+        from bloch_sphere import BlochSphere
+
+        self.spec = spec
+        self.points, self.steps = trajectory(spec)
+
+        self.figure = Figure(figsize=(spec.size, spec.size), dpi=spec.dpi, facecolor='white')
+        self.canvas = FigureCanvasAgg(self.figure)
+        self.ax = self.figure.add_subplot(projection='3d')
+        BlochSphere(equator_style={'color': 'b', 'linestyle': '--', 'alpha': 0.3,
+                                   'linewidth': 1}).draw(self.ax)
+        self.figure.suptitle(' → '.join(['|0⟩'] + [gate.upper() for gate in spec.sequence]),
+                             fontsize=14, fontweight='bold')
+
+        ax = self.ax
+        self.trail, = ax.plot([], [], [], color='red', alpha=0.4, linewidth=1.5, animated=True)
+        self.rotation_axis, = ax.plot([], [], [], 'g--', linewidth=2, alpha=0.7, animated=True)
+        self.vector, = ax.plot([], [], [], color='red', linewidth=3, animated=True)
+        self.tip, = ax.plot([], [], [], 'o', color='red', markersize=7, animated=True)
+        self.caption = ax.text2D(0.5, 0.02, '', transform=ax.transAxes, ha='center',
+                                 fontsize=12, fontweight='bold', animated=True)
+        self.artists = [self.trail, self.rotation_axis, self.vector, self.tip, self.caption]
+
+        self.canvas.draw()
+        self.background = self.canvas.copy_from_bbox(self.figure.bbox)
+        self.size = self.canvas.get_width_height()
+
+    def render(self, index):
+        """Render frame ``index`` and return its RGBA bytes."""
+        point = self.points[index]
+        step = self.steps[index]
+        trail = self.points[:index + 1]
+
+        self.trail.set_data_3d(trail[:, 0], trail[:, 1], trail[:, 2])
+        self.vector.set_data_3d([0, point[0]], [0, point[1]], [0, point[2]])
+        self.tip.set_data_3d([point[0]], [point[1]], [point[2]])
+        if step >= 0:
+            gate = self.spec.sequence[step]
+            axis = 1.5 * np.asarray(GATE_ROTATIONS[gate][0])
+            self.rotation_axis.set_data_3d([-axis[0], axis[0]], [-axis[1], axis[1]],
+                                           [-axis[2], axis[2]])
+            self.caption.set_text(f'{gate.upper()} gate: rotation about the green axis')
+        else:
+            self.rotation_axis.set_data_3d([], [], [])
+            self.caption.set_text('Initial state |0⟩')
+
+        self.canvas.restore_region(self.background)
+        for artist in self.artists:
+            self.ax.draw_artist(artist)
+        return bytes(self.canvas.buffer_rgba())
+
+
+# One renderer per animation per worker, so the background is drawn once
+_renderers = {}
+
+
+def render_chunk(spec, start, stop):
+    """Render frames [start, stop); returns ((width, height), [rgba bytes, ...])."""
+    if SCRIPT_DIR not in sys.path:
+        sys.path.insert(0, SCRIPT_DIR)
+    if spec not in _renderers:
+        _renderers[spec] = FrameRenderer(spec)
+    renderer = _renderers[spec]
+    return renderer.size, [renderer.render(index) for index in range(start, stop)]
+
+
+def stream_frames(spec, jobs=1, chunk_size=16):
+    """
+    Yield ((width, height), rgba bytes) for every frame, in order.
+
+    With ``jobs > 1`` chunks render in parallel; at most ``2 * jobs`` chunks
+    are in flight, which bounds memory regardless of animation length.
+    """
+    total = frame_count(spec)
+    chunks = iter([(start, min(start + chunk_size, total))
+                   for start in range(0, total, chunk_size)])
+
+    if jobs <= 1:
+        for start, stop in chunks:
+            size, frames = render_chunk(spec, start, stop)
+            for frame in frames:
+                yield size, frame
+        return
+
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        pending = deque(pool.submit(render_chunk, spec, *chunk)
+                        for chunk in itertools.islice(chunks, 2 * jobs))
+        while pending:
+            size, frames = pending.popleft().result()
+            chunk = next(chunks, None)
+            if chunk is not None:
+                pending.append(pool.submit(render_chunk, spec, *chunk))
+            for frame in frames:
+                yield size, frame
+
+
+# ============================================================================
+# Encoders
+# ============================================================================
+
+# Colours of the moving artists, blended over white as they appear on screen.
+# They are reserved in the GIF palette because the first frame (which fixes
+# the palette) does not show the trail or the rotation axis yet.
+ACCENT_COLORS = [(255, 0, 0), (255, 153, 153), (0, 128, 0), (77, 166, 77), (0, 0, 0)]
+
+
+class GifEncoder:
+    """Writes GIF frames one at a time with one palette shared by all frames."""
+
+    def __init__(self, path, fps, accents=ACCENT_COLORS):
+        self.path = path
+        self.duration = round(1000 / fps)
+        self.accents = accents
+        self.file = None
+        self.palette = None
+
+    def _reference_palette(self, frame):
+        """Quantize the first frame plus accent swatches into a 256-colour palette."""
+        from PIL import Image
+
+        swatch = 16
+        reference = Image.new('RGB', (frame.width, frame.height + swatch), 'white')
+        reference.paste(frame)
+        for index, color in enumerate(self.accents):
+            reference.paste(color, (index * swatch, frame.height,
+                                    (index + 1) * swatch, frame.height + swatch))
+        return reference.quantize(colors=255)
+
+    def write(self, size, rgba):
+        from PIL import GifImagePlugin, Image
+
+        frame = Image.frombuffer('RGBA', size, rgba, 'raw', 'RGBA', 0, 1).convert('RGB')
+        if self.palette is None:
+            self.palette = self._reference_palette(frame)
+            self.file = open(self.path, 'wb')
+            # The reference has the swatch row below the frame; the logical
+            # screen must be the frame's size
+            header, _ = GifImagePlugin.getheader(self.palette.crop((0, 0, *frame.size)),
+                                                 info={'loop': 0, 'optimize': False})
+            self.file.write(b''.join(header))
+        indexed = frame.quantize(palette=self.palette, dither=Image.Dither.NONE)
+        for chunk in GifImagePlugin.getdata(indexed, duration=self.duration):
+            self.file.write(chunk)
+
+    def close(self):
+        if self.file:
+            self.file.write(b';')  # GIF trailer
+            self.file.close()
+
+    def abort(self):
+        """Stop after a failure, without finishing the file."""
+        if self.file:
+            self.file.close()
+
+
+class FFmpegEncoder:
+    """Pipes raw RGBA frames into an ffmpeg process."""
+
+    CODECS = {
+        'mp4': ['-c:v', 'libx264', '-pix_fmt', 'yuv420p', '-movflags', '+faststart'],
+        'webp': ['-c:v', 'libwebp', '-lossless', '0', '-q:v', '80', '-loop', '0'],
+    }
+
+    def __init__(self, path, fps, fmt):
+        if shutil.which('ffmpeg') is None:
+            raise RuntimeError(f'{fmt.upper()} output needs ffmpeg on PATH')
+        self.path = path
+        self.fps = fps
+        self.fmt = fmt
+        self.process = None
+
+    def write(self, size, rgba):
+        if self.process is None:
+            width, height = size
+            command = ['ffmpeg', '-y', '-loglevel', 'error',
+                       '-f', 'rawvideo', '-pix_fmt', 'rgba', '-s', f'{width}x{height}',
+                       '-r', str(self.fps), '-i', '-',
+                       # libx264 needs even dimensions
+                       '-vf', 'pad=ceil(iw/2)*2:ceil(ih/2)*2:color=white',
+                       *self.CODECS[self.fmt], self.path]
+            self.process = subprocess.Popen(command, stdin=subprocess.PIPE)
+        self.process.stdin.write(rgba)
+
+    def close(self):
+        if self.process:
+            self.process.stdin.close()
+            if self.process.wait() != 0:
+                raise RuntimeError(f'ffmpeg failed writing {self.path}')
+
+    def abort(self):
+        """Stop after a failure, without finishing the file."""
+        if self.process and self.process.poll() is None:
+            self.process.kill()
+            self.process.wait()
+
+
+def make_encoder(fmt, path, fps):
+    if fmt == 'gif':
+        return GifEncoder(path, fps)
+    return FFmpegEncoder(path, fps, fmt)
+
+
+def render_animation(spec, output, formats=('gif',), jobs=1, chunk_size=16):
+    """
+    Render an animation once and stream it into every requested format.
+
+    Args:
+        spec: AnimationSpec
+        output: Output path without extension
+        formats: Any of 'gif', 'mp4', 'webp'
+        jobs: Worker processes rendering frame chunks
+        chunk_size: Frames per chunk
+
+    Returns:
+        List of written file paths
+    """
+    from illustration_store import commit, staging_path
+
+    paths = [f'{output}.{fmt}' for fmt in formats]
+    staged = []
+    encoders = []
+    try:
+        for fmt, path in zip(formats, paths):
+            staged.append(staging_path(path))
+            encoders.append(make_encoder(fmt, staged[-1], spec.fps))
+        for size, frame in stream_frames(spec, jobs=jobs, chunk_size=chunk_size):
+            for encoder in encoders:
+                encoder.write(size, frame)
+        for encoder in encoders:
+            encoder.close()
+    except BaseException:
+        for encoder in encoders:
+            encoder.abort()
+        for path in staged:
+            os.remove(path)
+        raise
+    for path, final in zip(staged, paths):
+        commit(path, final)
+    return paths
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Animate gate rotations on the Bloch sphere.')
+    parser.add_argument('--sequence', nargs='+', default=['h', 'z', 'h'],
+                        choices=sorted(GATE_ROTATIONS), metavar='GATE',
+                        help='gates applied to |0⟩ (default: h z h)')
+    parser.add_argument('--format', action='append', choices=FORMATS, dest='formats',
+                        help='output format (repeatable, default: gif)')
+    parser.add_argument('--output', default=DEFAULT_OUTPUT,
+                        help='output path without extension')
+    parser.add_argument('--frames-per-gate', type=int, default=60)
+    parser.add_argument('--hold-frames', type=int, default=15)
+    parser.add_argument('--size', type=float, default=6, help='figure size in inches')
+    parser.add_argument('--dpi', type=int, default=100)
+    parser.add_argument('--fps', type=int, default=30)
+    parser.add_argument('-j', '--jobs', type=int, default=os.cpu_count() or 1,
+                        help='worker processes rendering frame chunks')
+    parser.add_argument('--chunk-size', type=int, default=16, help='frames per chunk')
+    args = parser.parse_args(argv)
+
+    os.environ.setdefault('MPLBACKEND', 'Agg')
+    spec = AnimationSpec(tuple(args.sequence), args.frames_per_gate, args.hold_frames,
+                         args.size, args.dpi, args.fps)
+    print(f"🎬 Rendering {frame_count(spec)} frames with {args.jobs} worker(s)...")
+    start = time.perf_counter()
+    try:
+        paths = render_animation(spec, args.output, formats=args.formats or ['gif'],
+                                 jobs=args.jobs, chunk_size=args.chunk_size)
+    except RuntimeError as e:
+        print(f"❌ Error: {e}")
+        return 1
+    for path in paths:
+        print(f"   ✅ Saved: {path}")
+    print(f"Done in {time.perf_counter() - start:.1f}s")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,434 @@
+#!/usr/bin/env python3
+"""
+Interactive (rotatable) exports of the 3D Bloch sphere figures.
+
+A figure declared with ``@figure(..., interactive=True)`` gets a Plotly
+scene next to its PNG (``bloch-sphere-basic.plotly.json`` beside
+``bloch-sphere-basic.png``). The scene is converted from the Figure
+the PNG was saved from (the build passes it on, see
+``figure_output.saved_figure``): every 3D panel becomes a Plotly scene with its vectors,
+lines, points, labels, title and camera.
+
+The sphere surface and the equator are the bulk of every panel and are
+identical everywhere, so they are not embedded. Each trace only names its
+geometry (``meta.geometry``), and one decimated copy is written to
+``docs/assets/bloch/bloch-geometry.json`` (only when it changed): a 24 x 12 triangle mesh
+instead of the PNG's 2,500 shaded faces per panel. A scene is a few KB,
+the geometry about 12 KB, and plotly.js comes from the CDN, cached
+across pages.
+
+On the site, mkdocs_hooks.py marks each interactive image for
+docs/assets/javascripts/bloch-interactive.js, which defers the image and
+loads the 3D view when it scrolls near the viewport. The image stays
+when JavaScript or the CDN is unavailable.
+
+Requirements:
+- matplotlib
+- numpy
+- plotly
+
+Usage:
+    python scripts/bloch_interactive.py
+    python scripts/bloch_interactive.py --only bloch_sphere_basic --html /tmp/bloch
+"""
+
+import argparse
+import functools
+import importlib
+import json
+import os
+import posixpath
+import sys
+
+import numpy as np
+from image_variants import IMG_TAG
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.dirname(SCRIPT_DIR)
+
+# Shared geometry, written once for every scene (path on the site and on disk)
+GEOMETRY_URL = 'assets/bloch/bloch-geometry.json'
+GEOMETRY_PATH = os.path.join(PROJECT_ROOT, 'docs', *GEOMETRY_URL.split('/'))
+
+# Decimation of the shared geometry
+MESH_LONGITUDES = 24
+MESH_LATITUDES = 12
+EQUATOR_POINTS = 49
+
+# Coordinates are stored to this many decimals
+PRECISION = 4
+
+# Distance of the Plotly camera from the centre, in scene units
+CAMERA_DISTANCE = 1.9
+
+# plotly.js partial bundle with only the 3D traces
+PLOTLYJS_CDN = 'https://cdn.plot.ly/plotly-gl3d-{version}.min.js'
+
+DASHES = {'--': 'dash', 'dashed': 'dash', ':': 'dot', 'dotted': 'dot',
+          '-.': 'dashdot', 'dashdot': 'dashdot'}
+
+
+# ============================================================================
+# Shared geometry
+# ============================================================================
+
+def _rounded(array):
+    return np.round(np.asarray(array, dtype=float), PRECISION).tolist()
+
+
+def shared_geometry():
+    """
+    Decimated sphere mesh and equator, keyed by the names scenes refer to.
+
+    Returns:
+        {'sphere': Mesh3d x/y/z/i/j/k, 'equator': Scatter3d x/y/z}
+    """
+    from bloch_sphere import sphere_triangles, unit_circle
+
+    vertices, faces = sphere_triangles(MESH_LONGITUDES, MESH_LATITUDES)
+    circle = unit_circle(EQUATOR_POINTS)
+    return {
+        'sphere': {'x': _rounded(vertices[:, 0]), 'y': _rounded(vertices[:, 1]),
+                   'z': _rounded(vertices[:, 2]), 'i': faces[:, 0].tolist(),
+                   'j': faces[:, 1].tolist(), 'k': faces[:, 2].tolist()},
+        'equator': {'x': _rounded(circle[:, 0]), 'y': _rounded(circle[:, 1]),
+                    'z': _rounded(circle[:, 2])},
+    }
+
+
+@functools.lru_cache(maxsize=1)
+def geometry_json():
+    """``shared_geometry()`` as the compact JSON written to ``GEOMETRY_PATH``."""
+    return json.dumps(shared_geometry(), separators=(',', ':'))
+
+
+def resolve_geometry(scene, geometry=None):
+    """Copy of a scene with the shared geometry filled into the traces that name it."""
+    geometry = geometry or shared_geometry()
+    data = [dict(trace, **geometry[trace['meta']['geometry']])
+            if isinstance(trace.get('meta'), dict) and 'geometry' in trace['meta'] else trace
+            for trace in scene['data']]
+    return {'data': data, 'layout': scene['layout']}
+
+
+# ============================================================================
+# Matplotlib 3D axes -> Plotly
+# ============================================================================
+
+def _label(text, bold=False):
+    """Matplotlib text as Plotly rich text."""
+    text = text.replace('\n', '<br>')
+    return f'<b>{text}</b>' if bold else text
+
+
+def _is_bold(text):
+    return text.get_fontweight() in ('bold', 'heavy', 'black', 700, 800, 900)
+
+
+def _rgb(rgba):
+    r, g, b = (int(round(255 * c)) for c in rgba[:3])
+    return f'rgb({r},{g},{b})'
+
+
+def _legend(artist, seen):
+    """Legend fields for a labelled artist, shown once per label across panels."""
+    label = artist.get_label()
+    if not label or label.startswith('_'):
+        return {'showlegend': False}
+    first = label not in seen
+    seen.add(label)
+    return {'name': label, 'legendgroup': label, 'showlegend': first}
+
+
+def _line_traces(ax, scene, seen):
+    from matplotlib import colors as mcolors
+    from matplotlib.collections import PathCollection
+    from mpl_toolkits.mplot3d import art3d
+
+    from bloch_sphere import EQUATOR_GID, SURFACE_GID
+
+    traces = []
+    for artist in ax.collections:
+        if artist.get_gid() == SURFACE_GID:
+            faces = artist.get_facecolor()
+            # The face lit head-on carries the unshaded surface colour
+            base = faces[np.argmax(faces[:, :3].sum(axis=1))]
+            traces.append({'type': 'mesh3d', 'scene': scene, 'meta': {'geometry': 'sphere'},
+                           'color': _rgb(base), 'opacity': artist.get_alpha() or base[3],
+                           'hoverinfo': 'skip', 'showlegend': False})
+        elif isinstance(artist, art3d.Line3DCollection):
+            segments = artist._segments3d
+            colors = mcolors.to_rgba_array(artist.get_color())
+            colors = np.broadcast_to(colors, (len(segments), 4)) if len(colors) == 1 else colors
+            dashed = artist.get_linestyle()[0][1] is not None
+            legend = _legend(artist, seen)
+            for color in np.unique(colors, axis=0):
+                points = [np.vstack([segment, [[np.nan] * 3]])
+                          for segment, c in zip(segments, colors) if np.array_equal(c, color)]
+                xyz = np.vstack(points)[:-1]
+                traces.append(dict({
+                    'type': 'scatter3d', 'scene': scene, 'mode': 'lines',
+                    'x': _rounded(xyz[:, 0]), 'y': _rounded(xyz[:, 1]), 'z': _rounded(xyz[:, 2]),
+                    'line': {'color': _rgb(color), 'width': float(artist.get_linewidth()[0]),
+                             'dash': 'dash' if dashed else 'solid'},
+                    'opacity': float(color[3]), 'hoverinfo': 'skip'}, **legend))
+                legend = dict(legend, showlegend=False)
+        elif isinstance(artist, art3d.Path3DCollection):
+            x, y, z = (np.asarray(values, dtype=float) for values in artist._offsets3d)
+            # Skip the depth shading Path3DCollection applies once drawn
+            color = PathCollection.get_facecolor(artist)[0]
+            traces.append(dict({
+                'type': 'scatter3d', 'scene': scene, 'mode': 'markers',
+                'x': _rounded(x), 'y': _rounded(y), 'z': _rounded(z),
+                'marker': {'color': _rgb(color), 'opacity': float(color[3]),
+                           'size': round(float(np.sqrt(artist.get_sizes()[0])), 1)},
+                'hoverinfo': 'skip'}, **_legend(artist, seen)))
+
+    for line in ax.lines:
+        color = mcolors.to_rgba(line.get_color(), line.get_alpha())
+        trace = {'type': 'scatter3d', 'scene': scene, 'mode': 'lines',
+                 'line': {'color': _rgb(color), 'width': float(line.get_linewidth()),
+                          'dash': DASHES.get(line.get_linestyle(), 'solid')},
+                 'opacity': float(color[3]), 'hoverinfo': 'skip'}
+        if line.get_gid() == EQUATOR_GID:
+            trace['meta'] = {'geometry': 'equator'}
+        else:
+            x, y, z = line.get_data_3d()
+            trace.update(x=_rounded(x), y=_rounded(y), z=_rounded(z))
+        traces.append(dict(trace, **_legend(line, seen)))
+    return traces
+
+
+def _text_traces(ax, scene):
+    """One text trace per distinct (colour, size, weight)."""
+    from matplotlib import colors as mcolors
+
+    groups = {}
+    for text in ax.texts:
+        if not text.get_visible() or not text.get_text():
+            continue
+        key = (_rgb(mcolors.to_rgba(text.get_color())), float(text.get_fontsize()),
+               _is_bold(text))
+        groups.setdefault(key, []).append(text)
+    traces = []
+    for (color, size, bold), texts in groups.items():
+        xyz = np.array([text.get_position_3d() for text in texts], dtype=float)
+        labels = [text.get_text() for text in texts]
+        traces.append({
+            'type': 'scatter3d', 'scene': scene, 'mode': 'text',
+            'x': _rounded(xyz[:, 0]), 'y': _rounded(xyz[:, 1]), 'z': _rounded(xyz[:, 2]),
+            'text': [_label(label, bold) for label in labels],
+            'textfont': {'color': color, 'size': size},
+            'hoverinfo': 'skip', 'showlegend': False})
+    return traces
+
+
+def _camera(ax):
+    elev, azim = np.radians(ax.elev), np.radians(ax.azim)
+    eye = CAMERA_DISTANCE * np.array([np.cos(elev) * np.cos(azim),
+                                      np.cos(elev) * np.sin(azim), np.sin(elev)])
+    return {'eye': dict(zip('xyz', _rounded(eye))), 'up': {'x': 0, 'y': 0, 'z': 1}}
+
+
+def to_plotly(fig):
+    """
+    Plotly scene for every 3D panel of a Matplotlib figure.
+
+    Args:
+        fig: Figure from a ``build_*`` function; 2D axes are skipped
+
+    Returns:
+        ``plotly.graph_objects.Figure`` whose sphere and equator traces name
+        their shared geometry (see ``resolve_geometry``)
+    """
+    import plotly.graph_objects as go
+    from mpl_toolkits.mplot3d import Axes3D
+    from plotly.offline import get_plotlyjs_version
+
+    width, height = fig.get_size_inches()
+    data = []
+    annotations = []
+    seen = set()
+    layout = {}
+    panels = [ax for ax in fig.axes if isinstance(ax, Axes3D)]
+    for index, ax in enumerate(panels, start=1):
+        name = 'scene' if index == 1 else f'scene{index}'
+        data += _line_traces(ax, name, seen) + _text_traces(ax, name)
+
+        box = ax.get_position()
+        visible = getattr(ax, '_axis3don', True)
+        axes = {}
+        for axis, limits, label in zip('xyz', (ax.get_xlim3d(), ax.get_ylim3d(), ax.get_zlim3d()),
+                                       (ax.get_xlabel(), ax.get_ylabel(), ax.get_zlabel())):
+            axes[f'{axis}axis'] = {'range': _rounded(limits), 'visible': visible,
+                                   'title': {'text': label}, 'showspikes': False}
+        layout[name] = dict(axes, domain={'x': _rounded([box.x0, box.x1]),
+                                          'y': _rounded([box.y0, box.y1])},
+                            aspectmode='cube', camera=_camera(ax))
+        title = ax.get_title()
+        if title:
+            annotations.append({
+                'text': _label(title, _is_bold(ax.title)), 'showarrow': False,
+                'x': round((box.x0 + box.x1) / 2, PRECISION), 'y': round(box.y1, PRECISION),
+                'xref': 'paper', 'yref': 'paper',
+                'xanchor': 'center', 'yanchor': 'bottom',
+                'font': {'size': float(ax.title.get_fontsize())}})
+
+    suptitle = fig.get_suptitle()
+    layout.update(
+        annotations=annotations,
+        showlegend=any(trace.get('showlegend') for trace in data),
+        legend={'x': 0, 'y': 0, 'yanchor': 'bottom'},
+        margin={'l': 0, 'r': 0, 'b': 0, 't': 50 if suptitle else 20},
+        paper_bgcolor='white',
+        meta={'aspect': round(float(width / height), 3),
+              'plotlyjs': PLOTLYJS_CDN.format(version=get_plotlyjs_version())},
+    )
+    if suptitle:
+        layout['title'] = {'text': _label(suptitle, _is_bold(fig._suptitle)),
+                           'x': 0.5, 'xanchor': 'center'}
+    return go.Figure(data=data, layout=layout)
+
+
+def scene_json(fig):
+    """Compact JSON of ``to_plotly(fig)``, without Plotly's default template."""
+    from plotly.utils import PlotlyJSONEncoder
+
+    scene = to_plotly(fig).to_plotly_json()
+    scene['layout'].pop('template', None)
+    return json.dumps({'data': scene['data'], 'layout': scene['layout']},
+                      cls=PlotlyJSONEncoder, separators=(',', ':'), ensure_ascii=False)
+
+
+# ============================================================================
+# Export
+# ============================================================================
+
+def _write(path, text):
+    """Write through the output store, so the file is linked to every destination."""
+    from illustration_store import commit, staging_path
+
+    staged = staging_path(path)
+    try:
+        with open(staged, 'w', encoding='utf-8') as f:
+            f.write(text)
+            f.write('\n')
+    except BaseException:
+        os.remove(staged)
+        raise
+    return commit(staged, path)
+
+
+def builder(module, func_name):
+    """The ``build_*`` function behind a registered ``generate_*`` function."""
+    return getattr(module, 'build_' + func_name[len('generate_'):])
+
+
+def scene_path(output_path):
+    """Interactive scene written next to a figure's PNG."""
+    from illustration_registry import SCENE_SUFFIX
+
+    return os.path.splitext(str(output_path))[0] + SCENE_SUFFIX
+
+
+def write_geometry():
+    """Write the shared geometry, unless the file on disk already holds it."""
+    from illustration_store import keep
+
+    text = geometry_json() + '\n'
+    if os.path.exists(GEOMETRY_PATH):
+        with open(GEOMETRY_PATH, encoding='utf-8') as f:
+            if f.read() == text:
+                keep(GEOMETRY_PATH)
+                return
+    _write(GEOMETRY_PATH, geometry_json())
+
+
+def export_scene(fig, output_path):
+    """
+    Write a figure's scene plus the shared geometry.
+
+    Args:
+        fig: The Figure the PNG was saved from
+        output_path: The figure's PNG path; the scene goes next to it
+
+    Returns:
+        Path of the scene
+    """
+    path = scene_path(output_path)
+    _write(path, scene_json(fig))
+    write_geometry()
+    return path
+
+
+def mark_interactive(html, page_url, outputs):
+    """
+    Point images of interactive figures in a rendered page at their scenes.
+
+    Args:
+        html: Page HTML (MkDocs ``on_page_content``)
+        page_url: The page's URL, for the geometry's relative URL
+        outputs: File names of the interactive figures' PNGs
+
+    Returns:
+        HTML with ``data-plotly-scene`` and ``data-plotly-geometry`` (read by
+        bloch-interactive.js) and ``loading="lazy"`` on those images
+    """
+    from mkdocs.utils import get_relative_url
+
+    geometry = get_relative_url(GEOMETRY_URL, page_url)
+
+    def mark(match):
+        src = match[1]
+        if posixpath.basename(src) not in outputs:
+            return match[0]
+        attributes = (f' data-plotly-scene="{scene_path(src)}"'
+                      f' data-plotly-geometry="{geometry}" loading="lazy"')
+        return match[0][:4] + attributes + match[0][4:]
+
+    return IMG_TAG.sub(mark, html)
+
+
+def main(argv=None):
+    from illustration_registry import discover_figures
+
+    parser = argparse.ArgumentParser(description='Export the interactive Bloch sphere scenes.')
+    parser.add_argument('--only', action='append', metavar='FIGURE',
+                        help='export only this figure (repeatable)')
+    parser.add_argument('--html', metavar='DIR',
+                        help='also write standalone HTML pages (geometry inlined) to DIR')
+    args = parser.parse_args(argv)
+
+    specs = [spec for spec in discover_figures() if spec.interactive]
+    if args.only:
+        wanted = {name if name.startswith('generate_') else f'generate_{name}'
+                  for name in args.only}
+        specs = [spec for spec in specs if spec.name in wanted]
+
+    print("🧊 Exporting interactive Bloch spheres...")
+    for spec in specs:
+        module = importlib.import_module(spec.module)
+        output_path = os.path.join(PROJECT_ROOT, spec.output_path)
+        path = export_scene(builder(module, spec.name)(), output_path)
+        png = f'PNG {os.path.getsize(output_path) / 1024:.0f} KB' \
+            if os.path.exists(output_path) else 'no PNG'
+        print(f"   ✅ {os.path.relpath(path, PROJECT_ROOT)}: "
+              f"{os.path.getsize(path) / 1024:.1f} KB ({png})")
+        if args.html:
+            import plotly.graph_objects as go
+
+            with open(path, encoding='utf-8') as f:
+                scene = resolve_geometry(json.load(f))
+            os.makedirs(args.html, exist_ok=True)
+            html_path = os.path.join(args.html, os.path.splitext(spec.output)[0] + '.html')
+            go.Figure(scene).write_html(html_path, include_plotlyjs='cdn')
+            print(f"      🌐 {html_path}")
+    print(f"📦 Shared geometry: {os.path.relpath(GEOMETRY_PATH, PROJECT_ROOT)} "
+          f"({os.path.getsize(GEOMETRY_PATH) / 1024:.1f} KB)")
+    return 0
+
+
+if __name__ == '__main__':
+    if SCRIPT_DIR not in sys.path:
+        sys.path.insert(0, SCRIPT_DIR)
+    sys.exit(main())
@@ -0,0 +1,388 @@
+"""
+Shared Bloch sphere renderer for the illustration generators.
+
+The sphere surface is the expensive part of every Bloch sphere panel: a
+100x100 ``np.outer`` mesh turned into thousands of shaded polygons. This
+module computes that geometry once per resolution and caches it, together
+with the shaded face colours, so each additional panel only pays for
+adding a prebuilt collection to its axes.
+
+Draft renders (see figure_output.py) choose the mesh per panel from the
+pixel size it will be saved at instead: about one facet per
+``PIXELS_PER_FACET`` pixels, and a wireframe below ``WIREFRAME_PIXELS``.
+Only the surface changes; vectors, labels and the layout are the same as
+in the final render.
+
+Usage:
+    from bloch_sphere import BlochSphere
+
+    sphere = BlochSphere()
+    ax = fig.add_subplot(1, 3, 1, projection='3d')
+    sphere.draw(ax)
+    sphere.add_vectors(ax, [[0, 0, 1], [1, 0, 0]], colors=['blue', 'red'])
+    sphere.add_rotation_axes(ax, [[1, 0, 0]])
+"""
+
+import functools
+
+import numpy as np
+from matplotlib import colors as mcolors
+
+from figure_output import draft_dpi
+
+# plot_surface's default cap on faces per mesh direction
+MAX_FACES = 50
+
+AXIS_NAMES = ('X', 'Y', 'Z')
+UNIT_AXES = np.eye(3)
+
+# Artist ids of the shared sphere surface and equator, so exporters can
+# recognise them (see bloch_interactive.py)
+SURFACE_GID = 'bloch-sphere'
+EQUATOR_GID = 'bloch-equator'
+
+# Draft level of detail: mesh facets per pixel of panel width, the coarsest
+# mesh, and the panel width below which the surface becomes a wireframe.
+# Lines cover less than a filled surface, so the wireframe is more opaque.
+PIXELS_PER_FACET = 12
+MIN_RESOLUTION = 12
+WIREFRAME_PIXELS = 120
+WIREFRAME_ALPHA_SCALE = 3
+WIREFRAME_LINEWIDTH = 0.5
+
+
+# ============================================================================
+# Cached geometry
+# ============================================================================
+
+def _read_only(*arrays):
+    for array in arrays:
+        array.flags.writeable = False
+    return arrays if len(arrays) > 1 else arrays[0]
+
+
+@functools.lru_cache(maxsize=None)
+def sphere_mesh(resolution=100):
+    """Unit sphere mesh as (x, y, z) arrays of shape (resolution, resolution)."""
+    u = np.linspace(0, 2 * np.pi, resolution)
+    v = np.linspace(0, np.pi, resolution)
+    x = np.outer(np.cos(u), np.sin(v))
+    y = np.outer(np.sin(u), np.sin(v))
+    z = np.outer(np.ones(np.size(u)), np.cos(v))
+    return _read_only(x, y, z)
+
+
+@functools.lru_cache(maxsize=None)
+def sphere_polygons(resolution=100):
+    """
+    Quadrilateral faces of the sphere surface, shape (n_faces, 4, 3).
+
+    The mesh is strided down to at most ``MAX_FACES`` faces per direction,
+    exactly as ``Axes3D.plot_surface`` does by default.
+    """
+    x, y, z = sphere_mesh(resolution)
+    mesh = np.stack([x, y, z], axis=-1)
+    stride = int(max(np.ceil(resolution / MAX_FACES), 1))
+    # Evenly spaced, including both endpoints
+    inds = np.array(list(range(0, resolution - 1, stride)) + [resolution - 1])
+    i0, i1 = inds[:-1, None], inds[1:, None]
+    j0, j1 = inds[None, :-1], inds[None, 1:]
+    quads = np.stack([mesh[i0, j0], mesh[i0, j1], mesh[i1, j1], mesh[i1, j0]], axis=2)
+    return _read_only(quads.reshape(-1, 4, 3))
+
+
+# plot_surface's default light source
+LIGHT_SOURCE = mcolors.LightSource(azdeg=225, altdeg=19.4712)
+
+
+@functools.lru_cache(maxsize=None)
+def _shaded_facecolors(resolution, color):
+    """Lit face colours for the sphere surface (same shading as plot_surface)."""
+    polys = sphere_polygons(resolution)
+    normals = np.cross(polys[:, 0] - polys[:, 1], polys[:, 1] - polys[:, 2])
+    with np.errstate(invalid='ignore'):
+        shade = (normals / np.linalg.norm(normals, axis=1, keepdims=True)) @ LIGHT_SOURCE.direction
+    # Degenerate faces at the poles have no normal; leave them unlit
+    shade = np.nan_to_num(shade)
+    # Map the dot product from [-1, 1] onto brightness [0.3, 1]
+    brightness = 0.3 + 0.7 * (shade + 1) / 2
+    colors = np.tile(mcolors.to_rgba(color), (len(polys), 1))
+    colors[:, :3] *= brightness[:, None]
+    return _read_only(colors)
+
+
+@functools.lru_cache(maxsize=None)
+def sphere_triangles(longitudes=24, latitudes=12):
+    """
+    Decimated unit sphere as an indexed triangle mesh.
+
+    Each pole is a single vertex, so there are no degenerate faces.
+
+    Args:
+        longitudes: Vertices around each circle of latitude
+        latitudes: Bands from pole to pole
+
+    Returns:
+        (vertices, faces): shapes (2 + longitudes * (latitudes - 1), 3) and
+        (2 * longitudes * (latitudes - 1), 3), faces as vertex indices
+    """
+    u = np.linspace(0, 2 * np.pi, longitudes, endpoint=False)
+    v = np.linspace(0, np.pi, latitudes + 1)[1:-1]
+    ring = np.stack([np.outer(np.sin(v), np.cos(u)), np.outer(np.sin(v), np.sin(u)),
+                     np.outer(np.cos(v), np.ones_like(u))], axis=-1).reshape(-1, 3)
+    vertices = np.concatenate([[[0, 0, 1]], ring, [[0, 0, -1]]])
+
+    # Vertex index of (band row, longitude); rows are 0..latitudes-2
+    def index(row, col):
+        return 1 + row * longitudes + col % longitudes
+
+    col = np.arange(longitudes)
+    south = len(vertices) - 1
+    faces = [np.stack([np.zeros_like(col), index(0, col), index(0, col + 1)], axis=-1)]
+    for row in range(latitudes - 2):
+        a, b = index(row, col), index(row, col + 1)
+        c, d = index(row + 1, col), index(row + 1, col + 1)
+        faces += [np.stack([a, c, b], axis=-1), np.stack([b, c, d], axis=-1)]
+    last = latitudes - 2
+    faces.append(np.stack([index(last, col), np.full_like(col, south), index(last, col + 1)],
+                          axis=-1))
+    return _read_only(vertices, np.concatenate(faces))
+
+
+@functools.lru_cache(maxsize=None)
+def sphere_wireframe(resolution=MIN_RESOLUTION):
+    """Meridians and parallels of the sphere mesh as line segments, shape (n, resolution, 3)."""
+    mesh = np.stack(sphere_mesh(resolution), axis=-1)
+    # The last meridian repeats the first; the first and last parallels are the poles
+    meridians = mesh[:-1]
+    parallels = mesh[:, 1:-1].transpose(1, 0, 2)
+    return _read_only(np.concatenate([meridians, parallels]))
+
+
+def panel_pixels(ax, dpi):
+    """Width of an axes in pixels when its figure is saved at ``dpi``."""
+    return ax.get_position().width * ax.figure.get_figwidth() * dpi
+
+
+def level_of_detail(pixels, resolution, alpha):
+    """
+    Sphere mesh for a panel ``pixels`` wide.
+
+    Args:
+        pixels: Panel width in pixels at the output DPI
+        resolution: Full mesh resolution, the upper bound
+        alpha: Full surface alpha
+
+    Returns:
+        (resolution, alpha, wireframe)
+    """
+    if pixels < WIREFRAME_PIXELS:
+        return MIN_RESOLUTION, min(1.0, alpha * WIREFRAME_ALPHA_SCALE), True
+    return min(resolution, max(MIN_RESOLUTION, int(pixels // PIXELS_PER_FACET))), alpha, False
+
+
+@functools.lru_cache(maxsize=None)
+def unit_circle(resolution=100):
+    """Points on the unit circle in the XY plane, shape (resolution, 3)."""
+    theta = np.linspace(0, 2 * np.pi, resolution)
+    return _read_only(np.stack([np.cos(theta), np.sin(theta), np.zeros_like(theta)], axis=-1))
+
+
+def great_circle_arcs(starts, ends, radius=1.0, points=20):
+    """
+    Great-circle arcs between pairs of Bloch directions.
+
+    Args:
+        starts: Array-like of shape (n, 3) with arc start directions
+        ends: Array-like of shape (n, 3) with arc end directions
+        radius: Distance of the arc from the origin
+        points: Samples per arc
+
+    Returns:
+        Array of shape (n, points, 3)
+    """
+    starts = np.asarray(starts, dtype=float).reshape(-1, 3)
+    ends = np.asarray(ends, dtype=float).reshape(-1, 3)
+    starts = starts / np.linalg.norm(starts, axis=-1, keepdims=True)
+    ends = ends / np.linalg.norm(ends, axis=-1, keepdims=True)
+    omega = np.arccos(np.clip(np.sum(starts * ends, axis=-1), -1.0, 1.0))[:, None]
+    t = np.linspace(0, 1, points)[None, :]
+    sin_omega = np.sin(omega)
+    safe = np.where(sin_omega > 1e-9, sin_omega, 1.0)
+    w0 = np.where(sin_omega > 1e-9, np.sin((1 - t) * omega) / safe, 1 - t)
+    w1 = np.where(sin_omega > 1e-9, np.sin(t * omega) / safe, t)
+    return radius * (w0[..., None] * starts[:, None, :] + w1[..., None] * ends[:, None, :])
+
+
+# ============================================================================
+# Renderer
+# ============================================================================
+
+class BlochSphere:
+    """
+    Draws Bloch sphere backgrounds and batches of vectors onto 3D axes.
+
+    One instance holds the styling; ``draw`` can be called on any number of
+    axes and reuses the cached mesh and face colours every time.
+    """
+
+    def __init__(self, resolution=100, surface_color='lightblue', surface_alpha=0.1,
+                 axis_extent=1.2, axis_style=None, label_offset=1.3, label_style=None,
+                 label_colors=None, equator_style=None, frame=False):
+        """
+        Args:
+            resolution: Mesh points per direction (100 and 50 are used in the docs)
+            surface_color: Colour of the sphere surface
+            surface_alpha: Transparency of the sphere surface
+            axis_extent: Half-length of the X/Y/Z axis lines
+            axis_style: Line kwargs for the axis lines
+            label_offset: Distance of the X/Y/Z labels from the origin
+            label_style: Text kwargs for the axis labels (None to omit labels)
+            label_colors: Optional (x, y, z) colours for the axis labels
+            equator_style: Line kwargs for the equator (None to omit it)
+            frame: Keep the matplotlib 3D frame and panes visible
+        """
+        self.resolution = resolution
+        self.surface_color = surface_color
+        self.surface_alpha = surface_alpha
+        self.axis_extent = axis_extent
+        self.axis_style = {'color': 'k', 'alpha': 0.3, 'linewidth': 1, **(axis_style or {})}
+        self.label_offset = label_offset
+        self.label_style = {'fontsize': 10} if label_style is None else label_style
+        self.label_colors = label_colors
+        self.equator_style = equator_style
+        self.frame = frame
+
+    def draw(self, ax, title=None, equator_style=None, **title_kwargs):
+        """
+        Draw the sphere surface, axes, labels and equator onto ``ax``.
+
+        In a draft render the surface's mesh follows ``level_of_detail``.
+
+        Args:
+            ax: A 3D axes (``projection='3d'``)
+            title: Optional panel title
+            equator_style: Overrides the instance equator style for this panel
+
+        Returns:
+            The axes, for chaining
+        """
+        from mpl_toolkits.mplot3d import art3d
+
+        resolution, alpha, wireframe = self.resolution, self.surface_alpha, False
+        dpi = draft_dpi()
+        if dpi is not None:
+            resolution, alpha, wireframe = level_of_detail(panel_pixels(ax, dpi),
+                                                           self.resolution, self.surface_alpha)
+        if wireframe:
+            ax.add_collection3d(art3d.Line3DCollection(
+                sphere_wireframe(resolution), colors=self.surface_color,
+                linewidths=WIREFRAME_LINEWIDTH, alpha=alpha))
+        else:
+            surface = art3d.Poly3DCollection(
+                sphere_polygons(resolution),
+                facecolors=_shaded_facecolors(resolution, self.surface_color),
+                edgecolors='none', alpha=alpha)
+            surface.set_gid(SURFACE_GID)
+            ax.add_collection3d(surface)
+
+        extent = self.axis_extent
+        segments = np.zeros((3, 2, 3))
+        segments[:, 0] = -extent * UNIT_AXES
+        segments[:, 1] = extent * UNIT_AXES
+        ax.add_collection3d(art3d.Line3DCollection(segments, **self.axis_style))
+
+        if self.label_style:
+            for idx, name in enumerate(AXIS_NAMES):
+                position = self.label_offset * UNIT_AXES[idx]
+                style = dict(self.label_style)
+                if self.label_colors:
+                    style['color'] = self.label_colors[idx]
+                ax.text(*position, name, **style)
+
+        equator = equator_style or self.equator_style
+        if equator:
+            circle = unit_circle()
+            line, = ax.plot(circle[:, 0], circle[:, 1], circle[:, 2], **equator)
+            line.set_gid(EQUATOR_GID)
+
+        limit = [-extent, extent]
+        ax.set_xlim(limit)
+        ax.set_ylim(limit)
+        ax.set_zlim(limit)
+        ax.set_box_aspect([1, 1, 1])
+        if title:
+            ax.set_title(title, **title_kwargs)
+        if not self.frame:
+            ax.axis('off')
+        return ax
+
+    def add_vectors(self, ax, vectors, colors='red', linewidth=3, labels=None,
+                    arrow_length_ratio=0.15, alpha=None):
+        """
+        Draw state vectors from the origin.
+
+        Unlabelled vectors are drawn as a single quiver collection; labelled
+        vectors get one artist each so they show up in a legend.
+
+        Args:
+            ax: A 3D axes
+            vectors: Bloch coordinates, shape (3,) or (n, 3)
+            colors: One colour or a list of n colours
+            linewidth: Arrow line width
+            labels: Optional list of n legend labels
+            arrow_length_ratio: Arrow head size relative to the vector
+            alpha: Optional transparency
+        """
+        vectors = np.asarray(vectors, dtype=float).reshape(-1, 3)
+        if isinstance(colors, str):
+            colors = [colors] * len(vectors)
+        if labels is not None:
+            return [ax.quiver(0, 0, 0, *vector, color=color, label=label, alpha=alpha,
+                              arrow_length_ratio=arrow_length_ratio, linewidth=linewidth)
+                    for vector, color, label in zip(vectors, colors, labels)]
+        origin = np.zeros(len(vectors))
+        # quiver draws shafts, left heads and right heads as separate segments
+        return ax.quiver(origin, origin, origin, vectors[:, 0], vectors[:, 1], vectors[:, 2],
+                         colors=list(colors) * 3, alpha=alpha,
+                         arrow_length_ratio=arrow_length_ratio, linewidth=linewidth)
+
+    def add_rotation_axes(self, ax, axes, length=1.5, label='Rotation axis', **style):
+        """
+        Draw dashed rotation axes from the origin.
+
+        Args:
+            ax: A 3D axes
+            axes: Rotation axis directions, shape (3,) or (n, 3)
+            length: Length of each drawn axis
+            label: Legend label (applied to the first axis only)
+        """
+        style = {'color': 'g', 'linestyle': '--', 'linewidth': 2, 'alpha': 0.7, **style}
+        axes = np.asarray(axes, dtype=float).reshape(-1, 3)
+        axes = length * axes / np.linalg.norm(axes, axis=-1, keepdims=True)
+        lines = []
+        for idx, axis in enumerate(axes):
+            lines += ax.plot([0, axis[0]], [0, axis[1]], [0, axis[2]],
+                             label=label if idx == 0 else None, **style)
+        return lines
+
+    def add_arcs(self, ax, starts, ends, radius=1.0, points=20, **style):
+        """
+        Draw great-circle arcs between pairs of Bloch directions.
+
+        Args:
+            ax: A 3D axes
+            starts: Arc start directions, shape (3,) or (n, 3)
+            ends: Arc end directions, shape (3,) or (n, 3)
+            radius: Distance of the arcs from the origin
+            points: Samples per arc
+        """
+        from mpl_toolkits.mplot3d import art3d
+
+        arcs = great_circle_arcs(starts, ends, radius=radius, points=points)
+        style = {'linewidth': 2, **style}
+        if 'linestyle' not in style and 'linestyles' not in style:
+            style['linestyle'] = '--'
+        collection = art3d.Line3DCollection(arcs, **style)
+        ax.add_collection3d(collection)
+        return collection
@@ -0,0 +1,529 @@
+#!/usr/bin/env python3
+"""
+Build the illustrations the docs need, in parallel.
+
+Reads the figure registry (``@figure`` declarations, see
+illustration_registry.py) from:
+- scripts/generate_phase1_illustrations.py
+- scripts/generate_qubit_visualizations.py
+
+checks it against the image references in docs/, and renders every figure
+a page needs in a process pool. Figures no page references are reported
+as orphans and not rendered. A failing figure is reported and the build
+carries on with the rest; the exit status is non-zero if any figure failed.
+
+Figures whose inputs are unchanged since the last build are skipped (see
+illustration_cache.py); pass --force to re-render everything.
+
+Every output is written once into a content-addressed store and linked
+into each directory that serves it (see illustration_store.py), so the
+phase 1 figures land in 01-foundations/ and docs/ from one render.
+
+Each rendered PNG is then encoded into responsive variants (optimized
+PNG and WebP at several widths, see image_variants.py) by a
+thread pool inside the same worker, so there is one render per figure.
+Variants left from an earlier build that the current --widths and
+--encoding no longer produce are deleted (with --no-variants, all of
+them), so pages only list the current set. A figure whose ``@figure`` declares a ``budget`` fails the build if its
+master PNG or any of its variants is larger.
+
+--memory-ceiling caps the memory each figure may use while saving (see
+figure_output.py): canvases are reused across figures, the tight-bbox
+pass no longer allocates a full-resolution canvas, and figures that would
+not fit are rendered and written in bands. Useful with many workers on a
+small machine.
+
+--trace writes a Chrome/Perfetto trace of where each figure's time went
+(simulation, circuit drawing, 3D sphere, tight_layout, savefig/PNG
+encoding; see illustration_trace.py); --profile-dir adds a cProfile dump
+per figure.
+
+Figures declared with ``interactive=True`` also get a Plotly scene of
+their 3D Bloch spheres next to the PNG, which the site loads instead of
+the image (see bloch_interactive.py).
+
+--draft renders previews for iterating on a layout: lower DPI, sphere
+meshes sized to the preview, no variants or interactive scenes, written
+to .illustrations-draft/ without touching the docs or the build cache
+(see figure_output.py). Layout and framing match the release render.
+
+PNGs are written byte-reproducibly (see figure_output.py), and after each
+build docs/illustrations-manifest.json lists the SHA-256 of every docs
+image and interactive scene, so publishing only transfers what changed (see
+publish_illustrations.py).
+
+Each figure declares its heavy imports with ``@requires`` (see
+illustration_registry.py). --import-report measures them per figure in a
+fresh interpreter; --import-budget-ms fails when a figure's cold start
+exceeds the budget, which keeps startup regressions out of CI.
+
+Requirements:
+- matplotlib
+- numpy
+- qiskit (for the circuit and simulation figures)
+- qiskit-aer, cirq, pennylane or amazon-braket-sdk (optional, with --engine; see
+  benchmark_simulators.py for which is fastest here)
+- pillow (with WebP support, for the variants)
+- plotly (for the interactive scenes)
+
+Usage:
+    python scripts/build_illustrations.py
+    python scripts/build_illustrations.py --jobs 4
+    python scripts/build_illustrations.py --only bloch_sphere_basic --only bell_state_circuit
+    python scripts/build_illustrations.py --page foundations/the-qubit.md
+    python scripts/build_illustrations.py --list
+    python scripts/build_illustrations.py --force
+    python scripts/build_illustrations.py --engine aer --only superposition_evolution
+    python scripts/build_illustrations.py --widths 800 1600 --encoding webp
+    python scripts/build_illustrations.py --no-variants
+    python scripts/build_illustrations.py --jobs 8 --memory-ceiling 64
+    python scripts/build_illustrations.py --force --trace build-trace.json --profile-dir profiles/
+    python scripts/build_illustrations.py --import-report --import-budget-ms 2000
+    python scripts/build_illustrations.py --draft --only bloch_sphere_annotated
+"""
+
+import argparse
+import contextlib
+import importlib
+import io
+import os
+import sys
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import illustration_store
+import illustration_trace
+from bloch_interactive import export_scene
+from figure_output import (DEFAULT_DRAFT_DPI, DRAFT_DIR, DRAFT_ENV, MEMORY_ENV, deterministic,
+                           draft_dpi, saved_figure)
+from illustration_cache import BuildCache, figure_cache_key, library_versions
+from image_variants import (ENCODINGS, WEBP_QUALITY, WIDTHS, encode_variants, over_budget,
+                            variant_files, variant_path)
+from illustration_registry import (discover_figures, import_requirements,
+                                   measure_cold_start, plan_build)
+from publish_illustrations import MANIFEST_NAME, build_manifest, write_manifest
+from statevector_sim import DEFAULT_ENGINE, ENGINE_ENV, ENGINES
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.dirname(SCRIPT_DIR)
+
+
+# ============================================================================
+# Figure selection
+# ============================================================================
+
+def select_figures(figures, only):
+    """Filter figures by name; accepts ``bloch_sphere_basic`` or ``generate_bloch_sphere_basic``."""
+    if not only:
+        return figures
+    wanted = {name if name.startswith('generate_') else f'generate_{name}' for name in only}
+    unknown = wanted - {spec.name for spec in figures}
+    if unknown:
+        raise SystemExit(f"❌ Unknown figure(s): {', '.join(sorted(unknown))}")
+    return [spec for spec in figures if spec.name in wanted]
+
+
+# ============================================================================
+# Worker side
+# ============================================================================
+
+# Generator scripts imported in this worker
+_loaded_modules = {}
+
+
+def _init_worker():
+    """Prepare a worker: headless backend, project-root cwd, scripts importable."""
+    os.environ.setdefault('MPLBACKEND', 'Agg')
+    # Output paths are absolute, but keep any relative path a figure opens stable
+    os.chdir(PROJECT_ROOT)
+    if SCRIPT_DIR not in sys.path:
+        sys.path.insert(0, SCRIPT_DIR)
+
+
+def _load_module(module_name):
+    """
+    Import a generator script once per worker.
+
+    Scripts leave rcParams alone at import; each figure's builder applies
+    its script's style while it runs (see figure_api.py), so figures from
+    both scripts can share a worker.
+    """
+    if module_name not in _loaded_modules:
+        _loaded_modules[module_name] = importlib.import_module(module_name)
+    return _loaded_modules[module_name]
+
+
+def _span(enabled, name, category):
+    """A trace span when tracing, otherwise a no-op context."""
+    if enabled:
+        return illustration_trace.span(name, category)
+    return contextlib.nullcontext()
+
+
+def _profile(profile_dir, module_name, func_name):
+    if profile_dir:
+        return illustration_trace.profile(
+            os.path.join(profile_dir, f'{module_name}.{func_name}.prof'))
+    return contextlib.nullcontext()
+
+
+def _remove_stale_variants(output_path, encoded):
+    """Delete the figure's variants, in every destination, that this render did not encode."""
+    current = {os.path.basename(variant.path) for variant in encoded}
+    for dest in illustration_store.destinations(output_path):
+        for path in variant_files(dest):
+            if os.path.basename(path) not in current:
+                os.remove(path)
+
+
+def render_figure(module_name, func_name, output_path=None, variants=None, trace=False,
+                  profile_dir=None, interactive=False):
+    """
+    Render one figure in the current process.
+
+    Args:
+        module_name: Generator script module name
+        func_name: ``generate_*`` function to call
+        output_path: Path of the PNG the function writes (needed for variants)
+        variants: Optional (widths, encodings) to encode from the rendered PNG;
+            the figure's other variants on disk are deleted
+        trace: Record phase spans (see illustration_trace.py)
+        profile_dir: Optional directory for a cProfile dump of the figure
+        interactive: Also write the figure's Plotly scene, converted from the
+            Figure it saved (see bloch_interactive.py)
+
+    Returns:
+        Dict with the figure name, worker pid, success flag, elapsed seconds
+        (total and spent encoding), the milliseconds spent importing its
+        declared modules, the encoded ``Variant`` list, every file written
+        (relative to the project root, including the store's links to other
+        destinations), recorded trace spans, captured output and, on
+        failure, the formatted traceback.
+    """
+    output = io.StringIO()
+    start = time.perf_counter()
+    illustration_store.collect()
+    imports = {}
+    encoded = []
+    encode_seconds = 0.0
+    error = None
+    try:
+        with contextlib.redirect_stdout(output):
+            if trace:
+                # Before the generator script binds names from statevector_sim
+                illustration_trace.instrument()
+            with _span(trace, f'import {module_name}', 'import'):
+                module = _load_module(module_name)
+            func = getattr(module, func_name)
+            with _span(trace, 'import requirements', 'import'):
+                imports = import_requirements(func)
+            if trace:
+                # Picks up Qiskit once the figure's requirements imported it
+                illustration_trace.instrument()
+            with _span(trace, func_name, 'figure'):
+                with _profile(profile_dir, module_name, func_name):
+                    func()
+            if interactive:
+                with _span(trace, 'interactive scene', 'output'):
+                    fig = saved_figure(output_path)
+                    if fig is None:
+                        raise RuntimeError(f'{func_name} did not save {output_path}')
+                    export_scene(fig, output_path)
+        if variants:
+            encode_start = time.perf_counter()
+            widths, encodings = variants
+            with _span(trace, 'encode variants', 'output'):
+                staged = illustration_store.staging_dir()
+                for variant in encode_variants(output_path, widths=widths, encodings=encodings,
+                                               directory=staged):
+                    path = variant_path(output_path, variant.width, variant.encoding)
+                    illustration_store.commit(variant.path, path)
+                    encoded.append(variant._replace(path=path))
+                os.rmdir(staged)
+            encode_seconds = time.perf_counter() - encode_start
+        if output_path and draft_dpi() is None:
+            _remove_stale_variants(output_path, encoded)
+    except Exception:
+        error = traceback.format_exc()
+    return {
+        'module': module_name,
+        'figure': func_name,
+        'pid': os.getpid(),
+        'ok': error is None,
+        'seconds': time.perf_counter() - start,
+        'encode_seconds': encode_seconds,
+        'imports': imports,
+        'variants': encoded,
+        'outputs': illustration_store.collect(),
+        'trace': illustration_trace.collect() if trace else [],
+        'output': output.getvalue(),
+        'error': error,
+    }
+
+
+# ============================================================================
+# Build driver
+# ============================================================================
+
+def build_settings(variants=None):
+    """
+    Build settings that change a figure's outputs, for its cache key.
+
+    The engine decides how sampled histograms come out, the memory ceiling
+    and deterministic mode how figures are cropped and encoded, draft mode
+    where they are written, and the variant settings which extra files a
+    figure owns.
+    """
+    return {
+        'engine': os.environ.get(ENGINE_ENV, DEFAULT_ENGINE),
+        'draft': draft_dpi(),
+        'deterministic': deterministic(),
+        'memory_ceiling': os.environ.get(MEMORY_ENV),
+        'variants': variants and {'widths': variants[0], 'encodings': variants[1],
+                                  'webp_quality': WEBP_QUALITY},
+    }
+
+
+def build(figures, jobs=None, verbose=False, variants=None, trace=False, profile_dir=None):
+    """
+    Render figures in a process pool and report each result as it finishes.
+
+    Args:
+        figures: ``FigureSpec`` list to render
+        jobs: Worker processes (default: CPU count)
+        verbose: Show imports, variants and each generator's own output
+        variants: Optional (widths, encodings) to encode after each render
+        trace: Record phase spans in the workers
+        profile_dir: Optional directory for per-figure cProfile dumps
+
+    Returns:
+        List of result dicts (see ``render_figure``) in completion order.
+    """
+    results = []
+    jobs = max(1, min(jobs or os.cpu_count() or 1, len(figures)))
+    print(f"🎨 Building {len(figures)} illustration(s) with {jobs} worker(s)...")
+    print("=" * 60)
+
+    with ProcessPoolExecutor(max_workers=jobs, initializer=_init_worker) as pool:
+        futures = [pool.submit(render_figure, spec.module, spec.name,
+                               os.path.join(PROJECT_ROOT, spec.output_path), variants,
+                               trace, profile_dir, spec.interactive)
+                   for spec in figures]
+        for future in as_completed(futures):
+            result = future.result()
+            results.append(result)
+            status = '✅' if result['ok'] else '❌'
+            print(f"{status} {result['figure']:<40} {result['seconds']:6.2f}s")
+            if verbose:
+                for name, ms in result['imports'].items():
+                    print(f"     import {name}: {ms:.1f} ms")
+                if result['variants']:
+                    total = sum(variant.bytes for variant in result['variants'])
+                    print(f"     {len(result['variants'])} variants, {total / 1024:.0f} KB, "
+                          f"encoded in {result['encode_seconds']:.2f}s")
+                if result['output'].strip():
+                    print(result['output'].rstrip())
+            if not result['ok']:
+                print(result['error'].rstrip())
+    return results
+
+
+def build_drafts(figures, jobs=None, verbose=False):
+    """
+    Render draft previews of ``figures`` (``QC101_DRAFT`` must be set).
+
+    Drafts are always rendered and never recorded in the build cache or
+    the manifest, since they do not replace any published output.
+
+    Returns:
+        Exit status
+    """
+    start = time.perf_counter()
+    results = build([spec._replace(interactive=False) for spec in figures],
+                    jobs=jobs, verbose=verbose)
+    failed = [result['figure'] for result in results if not result['ok']]
+
+    print("\n" + "=" * 60)
+    print(f"📝 Drafted {len(results) - len(failed)}/{len(results)} illustration(s) at "
+          f"{draft_dpi():g} DPI in {time.perf_counter() - start:.1f}s")
+    print(f"📁 Previews in {os.path.relpath(DRAFT_DIR, PROJECT_ROOT)}/")
+    if failed:
+        print(f"❌ Failed: {', '.join(failed)}")
+        return 1
+    return 0
+
+
+def import_report(figures, budget_ms=None):
+    """
+    Print cold-start import times per figure and module.
+
+    Each figure is measured in a fresh interpreter, one at a time, so the
+    numbers are not skewed by shared module caches or parallel workers.
+    A module an earlier import already loaded is marked as such rather
+    than shown as free: mpl_toolkits.mplot3d, for one, comes with
+    matplotlib.figure, which registers the '3d' projection.
+
+    Returns:
+        List of figure names whose total exceeds ``budget_ms``.
+    """
+    over_budget = []
+    print("⏱️  Cold-start import times (ms)")
+    print("=" * 60)
+    for spec in figures:
+        timings = measure_cold_start(spec.module, spec.name)
+        total = sum(timings.values())
+        status = '❌' if budget_ms is not None and total > budget_ms else '✅'
+        print(f"{status} {spec.name:<40} {total:8.1f}")
+        for name, ms in timings.items():
+            # timed_import reports exactly 0 for modules already in sys.modules
+            note = '  (loaded by an earlier import)' if ms == 0.0 else ''
+            print(f"     {name:<38} {ms:8.1f}{note}")
+        if status == '❌':
+            over_budget.append(spec.name)
+    return over_budget
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Build illustrations in parallel.')
+    parser.add_argument('-j', '--jobs', type=int, default=None,
+                        help='number of worker processes (default: CPU count)')
+    parser.add_argument('--only', action='append', metavar='FIGURE',
+                        help='build only this figure (repeatable)')
+    parser.add_argument('--page', action='append', metavar='PAGE',
+                        help='build only figures this docs page needs, e.g. '
+                             'foundations/the-qubit.md (repeatable)')
+    parser.add_argument('--list', action='store_true',
+                        help='list registered figures with their outputs and pages, then exit')
+    parser.add_argument('--force', action='store_true',
+                        help='re-render figures even if their cache key is unchanged')
+    parser.add_argument('--engine', choices=sorted(ENGINES), default=None,
+                        help=f'simulation engine for sampled figures (default: {DEFAULT_ENGINE})')
+    parser.add_argument('--widths', type=int, nargs='+', default=list(WIDTHS), metavar='PX',
+                        help=f"variant widths in pixels (default: {' '.join(map(str, WIDTHS))})")
+    parser.add_argument('--encoding', action='append', choices=ENCODINGS, dest='encodings',
+                        help='variant encoding (repeatable, default: all)')
+    parser.add_argument('--no-variants', action='store_true',
+                        help='write only the master PNGs')
+    parser.add_argument('--memory-ceiling', type=float, metavar='MB',
+                        help='per-figure memory ceiling for saving; larger figures are '
+                             'rendered in bands')
+    parser.add_argument('--trace', metavar='PATH',
+                        help='write a Chrome/Perfetto trace of per-phase spans to PATH')
+    parser.add_argument('--profile-dir', metavar='DIR',
+                        help='write a cProfile dump per figure into DIR')
+    parser.add_argument('--import-report', action='store_true',
+                        help='report cold-start import time per figure and module, then exit')
+    parser.add_argument('--import-budget-ms', type=float, default=None,
+                        help='with --import-report, fail if a figure imports for longer than this')
+    parser.add_argument('--draft', nargs='?', type=float, const=DEFAULT_DRAFT_DPI, metavar='DPI',
+                        help=f'render quick previews into {os.path.basename(DRAFT_DIR)}/ at DPI '
+                             f'(default: {DEFAULT_DRAFT_DPI}), bypassing the cache')
+    parser.add_argument('-v', '--verbose', action='store_true',
+                        help="show each generator's own output")
+    args = parser.parse_args(argv)
+
+    # Inherited by the worker processes
+    if args.engine:
+        os.environ[ENGINE_ENV] = args.engine
+    if args.memory_ceiling:
+        os.environ[MEMORY_ENV] = str(args.memory_ceiling)
+    if args.draft:
+        os.environ[DRAFT_ENV] = str(args.draft)
+
+    specs = discover_figures()
+    selected = select_figures(specs, args.only)
+    if args.list:
+        for spec in selected:
+            print(f"{spec.id}")
+            print(f"     output: {spec.output_path}")
+            print(f"     pages:  {', '.join(spec.pages) or '(none)'}")
+        return 0
+
+    try:
+        plan = plan_build(specs, pages=args.page)
+    except ValueError as e:
+        print(f"❌ {e}")
+        return 2
+    for spec in plan.orphans:
+        print(f"⚠️  Orphaned figure (no page references {spec.output}), not rendering: {spec.id}")
+    for page, image in plan.undeclared:
+        print(f"⚠️  {page} embeds illustrations/{image} but no figure declares that page")
+    figures = [spec for spec in plan.figures if spec in selected]
+
+    if args.import_report:
+        too_slow = import_report(figures, budget_ms=args.import_budget_ms)
+        if too_slow:
+            print(f"\n❌ Over the {args.import_budget_ms:.0f} ms import budget: "
+                  f"{', '.join(too_slow)}")
+            return 1
+        return 0
+
+    if args.draft:
+        return build_drafts(figures, jobs=args.jobs, verbose=args.verbose)
+
+    cache = BuildCache()
+    versions = library_versions()
+    variants = None
+    if not args.no_variants:
+        variants = (tuple(args.widths), tuple(args.encodings or ENCODINGS))
+    settings = build_settings(variants)
+    keys = {spec.id: figure_cache_key(spec.module, spec.name, versions=versions,
+                                      settings=settings)
+            for spec in figures}
+    stale = figures
+    if not args.force:
+        stale = [spec for spec in figures if not cache.is_fresh(spec.id, keys[spec.id])]
+    skipped = len(figures) - len(stale)
+    if skipped:
+        print(f"⏭️  {skipped} illustration(s) up to date, skipping")
+    if not stale:
+        print("✅ Nothing to build.")
+        return 0
+
+    start = time.perf_counter()
+    trace = bool(args.trace)
+    profile_dir = args.profile_dir and os.path.abspath(args.profile_dir)
+    with _span(trace, 'build', 'build'):
+        results = build(stale, jobs=args.jobs, verbose=args.verbose, variants=variants,
+                        trace=trace, profile_dir=profile_dir)
+    if trace:
+        events = illustration_trace.collect()
+        process_names = {os.getpid(): 'build'}
+        for result in results:
+            events += result['trace']
+            process_names.setdefault(result['pid'], f"worker {len(process_names)}")
+        illustration_trace.write_trace(args.trace, events, process_names)
+        print(f"🧭 Trace written to {args.trace} (open in https://ui.perfetto.dev)")
+    failed = [result['figure'] for result in results if not result['ok']]
+
+    specs_by_name = {spec.name: spec for spec in stale}
+    for result in results:
+        if not result['ok']:
+            continue
+        spec = specs_by_name[result['figure']]
+        too_big = over_budget(os.path.join(PROJECT_ROOT, spec.output_path),
+                              result['variants'], spec.budget)
+        for path, size in too_big:
+            print(f"❌ {spec.name}: {os.path.relpath(path, PROJECT_ROOT)} is "
+                  f"{size / 1024:.0f} KB, over its {spec.budget} budget")
+        if too_big:
+            failed.append(spec.name)
+            continue
+        cache.record(spec.id, keys[spec.id], result['outputs'])
+    cache.save()
+    if len(failed) < len(results) and write_manifest(build_manifest()):
+        print(f"🧾 Updated docs/{MANIFEST_NAME}; publish with scripts/publish_illustrations.py")
+
+    print("\n" + "=" * 60)
+    print(f"Built {len(results) - len(failed)}/{len(results)} illustration(s) "
+          f"in {time.perf_counter() - start:.1f}s ({skipped} cached)")
+    if failed:
+        print(f"❌ Failed: {', '.join(failed)}")
+        return 1
+    print("✅ All illustrations built successfully!")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
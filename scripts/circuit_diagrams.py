@@ -0,0 +1,415 @@
+#!/usr/bin/env python3
+"""
+Circuit diagrams, rendered in batches and cached.
+
+Qiskit's matplotlib drawer is slow to start: the first ``draw('mpl')`` in a
+process imports pyplot and Qiskit's drawing modules and loads fonts, and
+every call reads the Qiskit user config and the style's JSON file again.
+The chapters on gates, circuit identities and algorithms need many
+diagrams, so this module draws them the cheap way:
+
+- ``drawer(style)`` is one ``CircuitDrawer`` per style and process. It
+  resolves the style once and draws a throwaway circuit the first time
+  it is used, so the next circuits only pay for their own artists.
+- ``render_diagrams`` takes any number of ``CircuitDiagram`` at once.
+  Diagrams already in the cache are linked into place without starting
+  Qiskit. The rest go to a process pool whose workers warm their drawers
+  when they start, and identical diagrams in a batch are rendered once.
+- Each rendered PNG is kept in ``.circuit-diagrams/``, keyed by a SHA-256
+  over the circuit as drawn (instructions, labels, registers and global
+  phase), the drawing options, the DPI, the installed Qiskit and
+  Matplotlib versions and the source of the drawing code. A hit
+  refreshes the entry's mtime; when the cache outgrows its limit
+  (``QC101_DIAGRAM_CACHE_MB``, default 64) the least recently used
+  diagrams are removed, as in simulation_cache.py, and a diagram too
+  large for the limit is not kept.
+  ``QC101_DIAGRAM_CACHE=0`` turns the cache off.
+
+Diagrams are sized the way Qiskit sizes its own figures, so fonts keep
+Qiskit's default scale whatever the circuit's width (``scale`` enlarges
+the whole drawing). Outputs go through the output store (see
+illustration_store.py) like every other figure, and in draft mode (see
+figure_output.py) they are rendered as previews without the cache.
+
+Figures that combine a circuit with other artists (the Bell state
+figure) draw onto their own axes with ``drawer(style).draw``. No
+registered figure uses ``render_diagrams`` yet: it is there for the
+diagram-heavy chapters, and ``--output`` renders the teaching circuits
+with it.
+
+Requirements:
+- matplotlib
+- qiskit
+
+Usage:
+    python scripts/circuit_diagrams.py --output /tmp/diagrams
+    python scripts/circuit_diagrams.py --output /tmp/diagrams --ghz 2 4 8 16 --jobs 4
+    python scripts/circuit_diagrams.py            # cache entries and size
+    python scripts/circuit_diagrams.py --evict    # enforce the size limit now
+    python scripts/circuit_diagrams.py --clear
+"""
+
+import argparse
+import contextlib
+import functools
+import hashlib
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+
+from figure_api import new_figure, styled
+from simulation_cache import (MAX_ENTRY_SHARE, _package_version, _source_digest,
+                              circuit_fingerprint, evict_least_recent, scan_entries)
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.dirname(SCRIPT_DIR)
+
+CACHE_ENV = 'QC101_DIAGRAM_CACHE'
+CACHE_SIZE_ENV = 'QC101_DIAGRAM_CACHE_MB'
+CACHE_DIR = os.path.join(PROJECT_ROOT, '.circuit-diagrams')
+DEFAULT_CACHE_MB = 64
+CACHE_VERSION = 1
+
+DEFAULT_STYLE = 'iqp'
+
+# Standard figure settings, as for the generator scripts
+STYLE = {
+    'figure.dpi': 300,
+    'savefig.dpi': 300,
+    'savefig.bbox': 'tight',
+    'savefig.facecolor': 'white',
+}
+SAVE_KWARGS = {'dpi': 300, 'bbox_inches': 'tight', 'facecolor': 'white'}
+
+# Qiskit scales fonts and line widths on an axes of ours by the axes width
+# over (drawing units * 0.8361111**2); at this many inches per unit the
+# scale is 1, as in the figures Qiskit sizes itself
+INCHES_PER_UNIT = 0.8361111 ** 2
+
+# This project's modules whose source is part of every diagram's key
+SOURCES = ('circuit_diagrams', 'figure_api', 'figure_output')
+
+
+class CircuitDiagram(namedtuple('CircuitDiagram', ['output', 'circuit', 'style', 'fold', 'scale'],
+                                defaults=(DEFAULT_STYLE, False, 1.0))):
+    """
+    A diagram to render: output file name, QuantumCircuit, Qiskit style
+    name, fold width (False for one row) and scale.
+    """
+
+    __slots__ = ()
+
+
+# ============================================================================
+# Drawer
+# ============================================================================
+
+class CircuitDrawer:
+    """
+    Qiskit's matplotlib drawer with its style resolved once.
+
+    Args:
+        style: Qiskit style name, e.g. 'iqp' or 'clifford'
+    """
+
+    def __init__(self, style=DEFAULT_STYLE):
+        from qiskit.visualization.circuit.qcstyle import MPLDefaultStyle, MPLStyleDict
+        from qiskit.visualization.style import load_style
+
+        resolved, _ = load_style(style, style_dict=MPLStyleDict, default_style=MPLDefaultStyle(),
+                                 user_config_opt='circuit_mpl_style',
+                                 user_config_path_opt='circuit_mpl_style_path')
+        # Every setting of the style on top of Qiskit's default one, which
+        # Qiskit has in memory: no file is read per drawing
+        self.style = dict(resolved, name=MPLDefaultStyle.DEFAULT_STYLE_NAME)
+        self.warm = False
+
+    def draw(self, circuit, ax, fold=False):
+        """
+        Draw ``circuit`` onto ``ax``.
+
+        Without an axes of its own Qiskit would create a pyplot figure.
+        """
+        if not self.warm:
+            self.warm_up()
+        circuit.draw('mpl', style=dict(self.style), fold=fold, ax=ax)
+
+    def warm_up(self):
+        """Draw and rasterize a one-qubit circuit, loading what the first drawing needs."""
+        from qiskit import QuantumCircuit
+
+        self.warm = True
+        qc = QuantumCircuit(1, 1)
+        qc.h(0)
+        qc.measure(0, 0)
+        fig = new_figure(figsize=(1, 1), dpi=10)
+        self.draw(qc, fig.add_subplot())
+        fig.canvas.draw()
+
+
+@functools.lru_cache(maxsize=None)
+def drawer(style=DEFAULT_STYLE):
+    """This process's ``CircuitDrawer`` for ``style``."""
+    return CircuitDrawer(style)
+
+
+def _extent(diagram):
+    """Width and height of a diagram in Qiskit's drawing units."""
+    fig = new_figure()
+    ax = fig.add_axes((0, 0, 1, 1))
+    drawer(diagram.style).draw(diagram.circuit, ax, fold=diagram.fold)
+    (left, right), (bottom, top) = ax.get_xlim(), ax.get_ylim()
+    return right - left, top - bottom
+
+
+@styled(STYLE)
+def build_diagram(diagram):
+    """
+    A circuit diagram on its own figure, sized like Qiskit's.
+
+    The drawing's extent depends on Qiskit's layout, so the circuit is laid
+    out once on a scratch figure and then drawn on one of the right size.
+    """
+    width, height = _extent(diagram)
+    inches = INCHES_PER_UNIT * diagram.scale
+    fig = new_figure(figsize=(width * inches, height * inches))
+    drawer(diagram.style).draw(diagram.circuit, fig.add_axes((0, 0, 1, 1)), fold=diagram.fold)
+    return fig
+
+
+# ============================================================================
+# Cache
+# ============================================================================
+
+def diagram_key(diagram):
+    """
+    Cache key of a diagram: everything its pixels depend on.
+
+    The circuit is taken from ``simulation_cache.circuit_fingerprint`` plus
+    what is drawn but not simulated: register names and gate labels.
+    """
+    circuit = diagram.circuit
+    payload = json.dumps({
+        'version': CACHE_VERSION,
+        'circuit': circuit_fingerprint(circuit),
+        'registers': [[register.name, register.size]
+                      for register in list(circuit.qregs) + list(circuit.cregs)],
+        'labels': [getattr(instruction.operation, 'label', None) for instruction in circuit.data],
+        'style': diagram.style,
+        'fold': diagram.fold,
+        'scale': diagram.scale,
+        'savefig': SAVE_KWARGS,
+        'packages': {name: _package_version(name) for name in ('matplotlib', 'qiskit')},
+        'source': _source_digest(SOURCES),
+    }, sort_keys=True)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def cache_enabled():
+    """Whether diagrams are cached: not in draft mode or with ``QC101_DIAGRAM_CACHE=0``."""
+    from figure_output import draft_dpi
+
+    return os.environ.get(CACHE_ENV, '1') != '0' and draft_dpi() is None
+
+
+def cache_limit():
+    """Size limit of the cache in bytes (``QC101_DIAGRAM_CACHE_MB``)."""
+    return int(float(os.environ.get(CACHE_SIZE_ENV, DEFAULT_CACHE_MB)) * 1024 * 1024)
+
+
+def cache_path(key):
+    return os.path.join(CACHE_DIR, f'{key}.png')
+
+
+def link_cached(key, output_path):
+    """
+    Put the cached diagram ``key`` at ``output_path`` through the output store.
+
+    Returns:
+        False on a cache miss
+    """
+    from illustration_store import commit, staging_path
+
+    staged = staging_path(output_path)
+    try:
+        shutil.copyfile(cache_path(key), staged)
+    except FileNotFoundError:
+        os.remove(staged)
+        return False
+    # Mark the entry as recently used
+    with contextlib.suppress(FileNotFoundError):
+        os.utime(cache_path(key))
+    commit(staged, output_path)
+    return True
+
+
+def _store(key, output_path):
+    """Copy a rendered diagram into the cache, atomically; evicts if over the limit."""
+    if os.path.getsize(output_path) > cache_limit() * MAX_ENTRY_SHARE:
+        return
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(suffix='.tmp', dir=CACHE_DIR)
+    os.close(fd)
+    try:
+        shutil.copyfile(output_path, tmp)
+        os.replace(tmp, cache_path(key))
+    except BaseException:
+        with contextlib.suppress(FileNotFoundError):
+            os.remove(tmp)
+        raise
+    entries = cache_entries()
+    if sum(size for _, size, _ in entries) > cache_limit():
+        evict_least_recent(entries, cache_limit())
+
+
+def cache_entries():
+    """(mtime, size, path) of every cached diagram."""
+    return scan_entries(CACHE_DIR, '.png')
+
+
+def evict_cache():
+    """
+    Remove least recently used diagrams until the cache is well under its limit.
+
+    Returns:
+        Number of diagrams removed
+    """
+    return evict_least_recent(cache_entries(), cache_limit())
+
+
+# ============================================================================
+# Batch rendering
+# ============================================================================
+
+def render_diagram(diagram, output_path, key=None):
+    """
+    Render one diagram to ``output_path`` and cache it under ``key``.
+
+    Args:
+        diagram: CircuitDiagram
+        output_path: Where the PNG goes
+        key: Cache key (see ``diagram_key``), or None not to cache it
+    """
+    from figure_output import save_figure
+
+    save_figure(output_path, build_diagram(diagram), **SAVE_KWARGS)
+    if key is not None:
+        _store(key, output_path)
+    return output_path
+
+
+def _init_worker(styles):
+    """Prepare a worker: headless backend, scripts importable, drawers warm."""
+    os.environ.setdefault('MPLBACKEND', 'Agg')
+    if SCRIPT_DIR not in sys.path:
+        sys.path.insert(0, SCRIPT_DIR)
+    for style in styles:
+        drawer(style).warm_up()
+
+
+def render_diagrams(diagrams, output_dir, jobs=None):
+    """
+    Render many circuit diagrams, reusing cached ones.
+
+    Args:
+        diagrams: CircuitDiagram list; ``output`` is relative to ``output_dir``
+        output_dir: Directory the diagrams are written to
+        jobs: Worker processes (default: one per CPU, at most one per diagram
+            to render)
+
+    Returns:
+        Dict mapping each output path to 'cached' or 'rendered'
+    """
+    caching = cache_enabled()
+    # Results in the order of ``diagrams``
+    results = {os.path.join(output_dir, diagram.output): None for diagram in diagrams}
+    pending = {}
+    for diagram in diagrams:
+        path = os.path.join(output_dir, diagram.output)
+        key = diagram_key(diagram) if caching else path
+        if caching and link_cached(key, path):
+            results[path] = 'cached'
+        else:
+            # Identical diagrams in one batch are rendered once
+            pending.setdefault(key, (diagram, []))[1].append(path)
+
+    if not pending:
+        return results
+
+    styles = sorted({diagram.style for diagram, _ in pending.values()})
+    workers = min(jobs or os.cpu_count() or 1, len(pending))
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(styles,)) as pool:
+        futures = {key: pool.submit(render_diagram, diagram, paths[0],
+                                    key if caching else None)
+                   for key, (diagram, paths) in pending.items()}
+    for key, (diagram, paths) in pending.items():
+        futures[key].result()
+        results[paths[0]] = 'rendered'
+        for path in paths[1:]:
+            if caching:
+                link_cached(key, path)
+            else:
+                render_diagram(diagram, path)
+            results[path] = 'rendered'
+    return results
+
+
+def teaching_diagrams(ghz_sizes=(3,)):
+    """Diagrams of the teaching circuits (see simulator_backends.py)."""
+    from simulator_backends import TEACHING_CIRCUITS
+
+    diagrams = []
+    for name, factory in TEACHING_CIRCUITS.items():
+        if name == 'ghz':
+            diagrams += [CircuitDiagram(f'ghz-{n}-circuit.png', factory(n)) for n in ghz_sizes]
+        else:
+            diagrams.append(CircuitDiagram(f'{name}-circuit.png', factory()))
+    return diagrams
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Render circuit diagrams or manage their cache.')
+    parser.add_argument('--output', metavar='DIR',
+                        help='render the teaching circuits into this directory')
+    parser.add_argument('--ghz', type=int, nargs='+', default=[3], metavar='N',
+                        help='GHZ chain sizes to draw (default: 3)')
+    parser.add_argument('--jobs', type=int, help='worker processes (default: one per CPU)')
+    parser.add_argument('--evict', action='store_true', help='enforce the size limit now')
+    parser.add_argument('--clear', action='store_true', help='remove every cached diagram')
+    args = parser.parse_args(argv)
+
+    if args.clear:
+        removed = 0
+        for _, _, path in cache_entries():
+            with contextlib.suppress(FileNotFoundError):
+                os.remove(path)
+                removed += 1
+        print(f"🧹 Removed {removed} cached diagram(s) from {CACHE_DIR}")
+    elif args.evict:
+        print(f"🧹 Evicted {evict_cache()} least recently used diagram(s)")
+    if args.output:
+        diagrams = teaching_diagrams(args.ghz)
+        start = time.perf_counter()
+        results = render_diagrams(diagrams, args.output, jobs=args.jobs)
+        for path, status in results.items():
+            print(f"   {'♻️ ' if status == 'cached' else '✅'} {path}")
+        cached = sum(status == 'cached' for status in results.values())
+        print(f"🔌 {len(results)} diagram(s) in {time.perf_counter() - start:.1f}s "
+              f"({cached} from the cache)")
+    entries = cache_entries()
+    print(f"📦 {len(entries)} cached diagram(s), "
+          f"{sum(size for _, size, _ in entries) / 1024:.1f} KB "
+          f"of {cache_limit() / 2**20:.0f} MB in {CACHE_DIR}")
+    return 0
+
+
+if __name__ == '__main__':
+    if SCRIPT_DIR not in sys.path:
+        sys.path.insert(0, SCRIPT_DIR)
+    sys.exit(main())
@@ -0,0 +1,194 @@
+"""
+Render the illustrations the docs reference as part of ``mkdocs build`` and
+``mkdocs serve``.
+
+Wired into MkDocs through mkdocs_hooks.py (listed under ``hooks:`` in
+mkdocs.yml). On every (re)build ``DocsIllustrations.refresh``:
+
+1. plans the build from the pages' image references, so only figures a
+   page actually embeds are considered (see illustration_registry.py)
+2. skips figures whose cache key is unchanged (see illustration_cache.py)
+3. submits the rest to a background process pool, which also encodes
+   their responsive variants (see image_variants.py)
+
+Figures written outside docs/ (the phase 1 script writes to
+01-foundations/illustrations/) are linked next to each page that embeds
+them by the output store as they are saved (see illustration_store.py),
+so the site never serves a stale copy.
+
+``mkdocs build`` waits for the pool before static files are copied.
+``mkdocs serve`` does not wait: the rebuild finishes with the current
+images, and when a render lands in docs/ the file watcher triggers
+another rebuild that picks it up. Editing a generator script only
+re-renders the figures whose key it changed; the pool is restarted so
+workers import the new code.
+
+Images of interactive figures are marked in each rendered page
+(``on_page_content``) so docs/assets/javascripts/bloch-interactive.js can
+replace them with their 3D scene (see bloch_interactive.py), and every
+image with responsive variants is served through ``srcset`` (see
+image_variants.py). The variants are site files once they exist, so
+``mkdocs build`` waits for the renders before it marks the pages.
+
+The hooks need the full rendering stack (``pip install -r
+requirements.txt``, as the deploy workflow does). Variants, scenes and
+the build cache are not committed, so a fresh checkout such as the
+deploy job renders every referenced figure on its first build.
+
+The instance lives in this (normally imported) module so it survives the
+config reloads ``mkdocs serve`` does on every rebuild.
+"""
+
+import glob
+import logging
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
+from bloch_interactive import GEOMETRY_URL, scene_path
+from build_illustrations import _init_worker, build_settings, render_figure
+from illustration_cache import BuildCache, figure_cache_key, library_versions
+from illustration_registry import discover_figures, plan_build
+from image_variants import ENCODINGS, WIDTHS, find_variants
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.dirname(SCRIPT_DIR)
+
+log = logging.getLogger('mkdocs.hooks.illustrations')
+
+# Variants the pages serve; the defaults of build_illustrations.py, so both
+# builds share cache keys
+VARIANTS = (WIDTHS, ENCODINGS)
+
+
+class DocsIllustrations:
+    """Keeps the docs' illustrations current using a background worker pool."""
+
+    def __init__(self, jobs=None):
+        self.jobs = jobs
+        self.pool = None
+        self.scripts_fingerprint = None
+        self.cache = BuildCache()
+        self.lock = threading.Condition()
+        self.pending = {}  # figure id -> (cache key, future)
+        self.interactive_outputs = set()  # PNG names the pages swap for a 3D scene
+        self.figures = []  # FigureSpec of every figure the pages reference
+
+    @staticmethod
+    def _fingerprint():
+        return sorted((path, os.path.getmtime(path))
+                      for path in glob.glob(os.path.join(SCRIPT_DIR, '*.py')))
+
+    def _ensure_pool(self):
+        """Start the pool, or restart it when scripts changed so workers re-import them."""
+        fingerprint = self._fingerprint()
+        if self.pool is not None and fingerprint != self.scripts_fingerprint:
+            self.pool.shutdown(wait=False, cancel_futures=True)
+            self.pool = None
+        if self.pool is None:
+            self.pool = ProcessPoolExecutor(max_workers=self.jobs, initializer=_init_worker)
+            self.scripts_fingerprint = fingerprint
+        return self.pool
+
+    def refresh(self):
+        """
+        Submit every referenced figure whose inputs changed.
+
+        Returns:
+            ``site_paths()``
+        """
+        specs = discover_figures()
+        plan = plan_build(specs)
+        self.figures = plan.figures
+        self.interactive_outputs = {spec.output for spec in plan.figures if spec.interactive}
+        for spec in plan.orphans:
+            log.info(f'Illustration {spec.id} is not referenced by any page; not rendering')
+
+        versions = library_versions()
+        settings = build_settings(VARIANTS)
+        for spec in plan.figures:
+            key = figure_cache_key(spec.module, spec.name, versions=versions, settings=settings)
+            with self.lock:
+                fresh = self.cache.is_fresh(spec.id, key)
+                submitted = self.pending.get(spec.id, (None,))[0] == key
+            if fresh or submitted:
+                continue
+            log.info(f'Rendering illustration {spec.output} in the background')
+            future = self._ensure_pool().submit(
+                render_figure, spec.module, spec.name,
+                os.path.join(PROJECT_ROOT, spec.output_path), VARIANTS,
+                interactive=spec.interactive)
+            future.add_done_callback(lambda done, spec=spec, key=key: self._finish(spec, key, done))
+            with self.lock:
+                self.pending[spec.id] = (key, future)
+
+        return self.site_paths()
+
+    def site_paths(self):
+        """
+        Docs paths (relative to docs/) of every referenced figure, its
+        interactive scene, the scenes' shared geometry and the figure's
+        variants rendered so far.
+        """
+        paths = set()
+        for spec in self.figures:
+            for path in spec.destinations:
+                if path.startswith('docs' + os.sep):
+                    paths.add(os.path.relpath(path, 'docs'))
+                    if spec.interactive:
+                        paths.add(os.path.relpath(scene_path(path), 'docs'))
+                    for variant in find_variants(os.path.join(PROJECT_ROOT, path)):
+                        paths.add(os.path.relpath(variant.path,
+                                                  os.path.join(PROJECT_ROOT, 'docs')))
+        if self.interactive_outputs:
+            paths.add(GEOMETRY_URL)
+        return sorted(paths)
+
+    def _finish(self, spec, key, future):
+        """Done-callback: publish the render, then mark the figure as no longer pending."""
+        try:
+            self._publish(spec, key, future)
+        finally:
+            with self.lock:
+                if self.pending.get(spec.id, (None, None))[1] is future:
+                    del self.pending[spec.id]
+                self.lock.notify_all()
+
+    def _publish(self, spec, key, future):
+        """Record a finished render (already linked next to its pages) in the cache."""
+        if future.cancelled():
+            return
+        try:
+            result = future.result()
+        except Exception as e:
+            log.warning(f'Rendering illustration {spec.output} failed: {e}')
+            return
+        if not result['ok']:
+            log.warning(f"Rendering illustration {spec.output} failed:\n{result['error']}")
+            return
+
+        with self.lock:
+            self.cache.record(spec.id, key, result['outputs'])
+            self.cache.save()
+        log.info(f"Rendered illustration {spec.output} in {result['seconds']:.1f}s")
+
+    def wait(self):
+        """Block until every submitted render is published (for ``mkdocs build``)."""
+        with self.lock:
+            self.lock.wait_for(lambda: not self.pending)
+
+    def close(self):
+        if self.pool is not None:
+            self.pool.shutdown(wait=True, cancel_futures=True)
+            self.pool = None
+
+
+_instance = None
+
+
+def docs_illustrations():
+    """The process-wide ``DocsIllustrations``, created on first use."""
+    global _instance
+    if _instance is None:
+        _instance = DocsIllustrations()
+    return _instance
@@ -0,0 +1,126 @@
+"""
+Pyplot-free figure construction with scoped styles, safe to use from threads.
+
+Every registered figure has a ``build_*`` function that creates its own
+``Figure`` with ``new_figure`` and returns it; the ``generate_*``
+function the registry calls only saves what the builder returns. Builders
+never go through pyplot's figure manager or its "current figure", and no
+script changes rcParams at import: each script's style is applied around
+its builders with ``styled``:
+
+    @styled('seaborn-v0_8-darkgrid', {'font.size': 10})
+    def build_example():
+        fig = new_figure(figsize=(6, 4))
+        ax = fig.subplots()
+        ...
+        return fig
+
+rcParams are one process-wide dict, and Matplotlib reads it both while
+artists are created and while a figure is drawn (tick density depends on
+the tick label size, for one). So ``styled`` applies the style on top of
+Matplotlib's defaults, not whatever the process has set, and holds
+``STYLE_LOCK`` while the builder runs. It also remembers the style for the
+figure, and ``save_figure`` (see figure_output.py) draws the figure under
+``figure_style(fig)``, the same style and lock. A figure therefore renders
+identically whatever style its caller has active, and any number of
+threads can build and save figures at once, e.g. from a notebook or a
+long-lived server:
+
+    import generate_qubit_visualizations as qubit
+    from figure_api import render_concurrently
+
+    render_concurrently([qubit.generate_bloch_sphere_annotated,
+                         qubit.generate_measurement_sweep], jobs=2)
+
+This makes threads safe, not faster: Agg holds the GIL while it
+rasterizes, so figures still take turns. Only the file writes overlap.
+build_illustrations.py uses processes to spread figures over cores.
+"""
+
+import contextlib
+import functools
+import threading
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+
+# Held while a style is applied; re-entrant so a builder may call another
+STYLE_LOCK = threading.RLock()
+
+# Styles each built figure was built under, for drawing it later
+_figure_styles = weakref.WeakKeyDictionary()
+
+
+def new_figure(**figure_kwargs):
+    """
+    A Figure on its own Agg canvas, not registered with pyplot.
+
+    Args:
+        **figure_kwargs: As for ``matplotlib.figure.Figure`` (figsize, dpi, ...)
+    """
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.figure import Figure
+
+    fig = Figure(**figure_kwargs)
+    FigureCanvasAgg(fig)
+    return fig
+
+
+@contextlib.contextmanager
+def style_scope(*styles):
+    """
+    Apply ``styles`` on top of Matplotlib's default style, holding ``STYLE_LOCK``.
+
+    Args:
+        *styles: Style names, files or rcParams dicts, applied in order
+    """
+    import matplotlib.style
+
+    with STYLE_LOCK, matplotlib.style.context(('default',) + styles):
+        yield
+
+
+def figure_style(fig):
+    """
+    Context to draw or save ``fig`` in: the style it was built under.
+
+    Figures not built by a ``styled`` function are drawn under the current
+    rcParams, still holding ``STYLE_LOCK``.
+    """
+    styles = _figure_styles.get(fig)
+    return STYLE_LOCK if styles is None else style_scope(*styles)
+
+
+def styled(*styles):
+    """
+    Decorator: run a figure builder under ``styles`` (see ``style_scope``).
+
+    The returned figure remembers the styles for ``figure_style``.
+    """
+    def decorator(build):
+        @functools.wraps(build)
+        def wrapper(*args, **kwargs):
+            with style_scope(*styles):
+                fig = build(*args, **kwargs)
+            _figure_styles[fig] = styles
+            return fig
+        wrapper.styles = styles
+        return wrapper
+    return decorator
+
+
+def render_concurrently(generators, jobs=None):
+    """
+    Run figure functions on a thread pool.
+
+    Args:
+        generators: Callables taking no arguments, e.g. ``generate_*``
+            functions of the generator scripts
+        jobs: Worker threads (default: ThreadPoolExecutor's default)
+
+    Returns:
+        Each callable's return value, in order; the first exception raised
+        is re-raised once every call has finished
+    """
+    with ThreadPoolExecutor(max_workers=jobs) as pool:
+        futures = [pool.submit(generate) for generate in generators]
+    return [future.result() for future in futures]
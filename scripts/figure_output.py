@@ -0,0 +1,374 @@
+"""
+Saving rendered figures reproducibly, optionally within a memory ceiling.
+
+The generators save the figure their builder returns through
+``save_figure``, with the arguments they would give ``Figure.savefig``:
+
+    save_figure(filename, fig, dpi=300, bbox_inches='tight', facecolor='white')
+
+By default that is ``fig.savefig(...)`` with the reproducible PNG settings
+described below. With a memory ceiling (``QC101_RENDER_MEMORY_MB``, or
+``--memory-ceiling`` on the build) saving changes in three ways:
+
+- The tight bounding box is measured with a 1x1 pixel renderer instead
+  of a full-resolution one (text metrics only depend on the DPI), so the
+  canvas is only allocated at the final, cropped size.
+- Agg renderers are kept in a small per-thread pool and reused by later
+  figures of the same pixel size, up to the ceiling.
+- A figure whose canvas would not fit under the ceiling is rendered in
+  horizontal strips that are filtered, compressed and written to the PNG
+  one at a time, so memory is bounded by the strip size, not the figure.
+
+PNGs are saved byte-reproducibly by default: Matplotlib's 'Software'
+version stamp is dropped and the encoder settings are pinned, so a
+rebuild writes identical bytes unless the pixels changed (sampling is
+seeded, see statevector_sim.py). Set ``QC101_DETERMINISTIC=0`` to keep
+Matplotlib's default metadata.
+
+Draft mode (``QC101_DRAFT=1``, or ``QC101_DRAFT=<dpi>``; ``--draft`` on the
+build) is for iterating on a layout. Figures are saved at 72 DPI (or the
+given DPI) into ``.illustrations-draft/``, mirroring their release paths,
+and never into the docs. Bloch sphere panels get a mesh sized to the
+draft's pixels (see bloch_sphere.py). The tight crop is measured at the
+release DPI with a 1x1 pixel renderer, and the figure itself is built
+exactly as for release, so a draft has the same layout and framing as the
+final PNG at a fraction of the pixels.
+
+Usage:
+    QC101_RENDER_MEMORY_MB=64 python scripts/build_illustrations.py --force
+    python scripts/build_illustrations.py --memory-ceiling 64 --jobs 8
+    QC101_DRAFT=1 python scripts/generate_qubit_visualizations.py
+"""
+
+import io
+import os
+import struct
+import threading
+import zlib
+from collections import OrderedDict
+
+MEMORY_ENV = 'QC101_RENDER_MEMORY_MB'
+DETERMINISTIC_ENV = 'QC101_DETERMINISTIC'
+DRAFT_ENV = 'QC101_DRAFT'
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.dirname(SCRIPT_DIR)
+
+# Draft renders: default DPI and the scratch directory they are written to
+DEFAULT_DRAFT_DPI = 72
+DRAFT_DIR = os.path.join(PROJECT_ROOT, '.illustrations-draft')
+
+# Pinned PNG encoder settings (zlib level, no optimize pass), also used by
+# the banded writer
+PNG_COMPRESS_LEVEL = 6
+PNG_PIL_KWARGS = {'compress_level': PNG_COMPRESS_LEVEL, 'optimize': False}
+
+# An RGBA canvas is held twice while saving: the renderer and the copy
+# handed to the PNG encoder
+CANVAS_COPIES = 2
+
+
+def deterministic():
+    """True unless ``QC101_DETERMINISTIC`` is set to 0."""
+    return os.environ.get(DETERMINISTIC_ENV, '1') != '0'
+
+
+def output_kwargs(filename, savefig_kwargs):
+    """
+    savefig arguments with reproducible PNG output (no version stamp,
+    pinned encoder) unless the caller chose otherwise.
+    """
+    if not deterministic() or not str(filename).lower().endswith('.png'):
+        return savefig_kwargs
+    kwargs = dict(savefig_kwargs)
+    kwargs.setdefault('metadata', {'Software': None})
+    kwargs.setdefault('pil_kwargs', dict(PNG_PIL_KWARGS))
+    return kwargs
+
+
+def draft_dpi():
+    """DPI of draft renders from ``QC101_DRAFT``, or None for a release render."""
+    value = os.environ.get(DRAFT_ENV, '')
+    if value in ('', '0'):
+        return None
+    return DEFAULT_DRAFT_DPI if value == '1' else float(value)
+
+
+def draft_path(filename):
+    """Where the draft of an output goes: its path under ``DRAFT_DIR``."""
+    rel_path = os.path.relpath(os.path.abspath(filename), PROJECT_ROOT)
+    if rel_path.startswith(os.pardir):
+        rel_path = os.path.basename(filename)
+    return os.path.join(DRAFT_DIR, rel_path)
+
+
+def memory_ceiling():
+    """Per-figure memory ceiling in bytes from ``QC101_RENDER_MEMORY_MB``, or None."""
+    value = os.environ.get(MEMORY_ENV)
+    return int(float(value) * 1024 * 1024) if value else None
+
+
+# ============================================================================
+# Canvas reuse
+# ============================================================================
+
+class RendererPool:
+    """
+    Agg renderers kept for reuse, keyed by pixel size and DPI.
+
+    Renderers are evicted least recently used first once their buffers add
+    up to more than ``capacity`` bytes.
+    """
+
+    def __init__(self, capacity=0):
+        self.capacity = capacity
+        self.renderers = OrderedDict()
+
+    def acquire(self, width, height, dpi):
+        from matplotlib.backends.backend_agg import RendererAgg
+
+        key = (int(width), int(height), dpi)
+        renderer = self.renderers.pop(key, None)
+        if renderer is None:
+            renderer = RendererAgg(width, height, dpi)
+        self.renderers[key] = renderer
+        while self.renderers and self.size() > self.capacity:
+            self.renderers.popitem(last=False)
+        return renderer
+
+    def size(self):
+        return sum(width * height * 4 for width, height, _ in self.renderers)
+
+
+# One pool per thread, so figures saved concurrently never share a renderer
+_pools = threading.local()
+
+# The last figure each thread saved, as (absolute path, Figure)
+_saved = threading.local()
+
+
+def renderer_pool():
+    """This thread's ``RendererPool``."""
+    if not hasattr(_pools, 'pool'):
+        _pools.pool = RendererPool()
+    return _pools.pool
+
+
+def _pooled_canvas_class():
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+    class PooledCanvasAgg(FigureCanvasAgg):
+        """Agg canvas that takes its renderer from the thread's pool."""
+
+        def get_renderer(self):
+            width, height = self.figure.bbox.size
+            key = (width, height, self.figure.dpi)
+            if self._lastKey != key:
+                self.renderer = renderer_pool().acquire(width, height, self.figure.dpi)
+                self._lastKey = key
+            return self.renderer
+
+    return PooledCanvasAgg
+
+
+# ============================================================================
+# Streamed PNG output
+# ============================================================================
+
+class StreamingPNGWriter:
+    """
+    Writes an RGBA PNG a band of rows at a time.
+
+    Rows are 'Up'-filtered against the previous row (which carries over
+    between bands) and fed through one zlib stream, so only the current
+    band is ever in memory.
+    """
+
+    def __init__(self, path, width, height, dpi=None):
+        self.file = open(path, 'wb')
+        self.width = width
+        self.compressor = zlib.compressobj(PNG_COMPRESS_LEVEL)
+        self.previous = None
+        self.file.write(b'\x89PNG\r\n\x1a\n')
+        self._chunk(b'IHDR', struct.pack('>IIBBBBB', width, height, 8, 6, 0, 0, 0))
+        if dpi:
+            pixels_per_meter = round(dpi / 0.0254)
+            self._chunk(b'pHYs', struct.pack('>IIB', pixels_per_meter, pixels_per_meter, 1))
+
+    def _chunk(self, kind, data):
+        self.file.write(struct.pack('>I', len(data)) + kind + data
+                        + struct.pack('>I', zlib.crc32(kind + data)))
+
+    def write_rows(self, rows):
+        """Append rows given as a uint8 array of shape (n, width, 4)."""
+        import numpy as np
+
+        rows = rows.reshape(len(rows), self.width * 4)
+        previous = np.vstack([self.previous if self.previous is not None
+                              else np.zeros((1, self.width * 4), np.uint8), rows[:-1]])
+        filtered = np.empty((len(rows), self.width * 4 + 1), np.uint8)
+        filtered[:, 0] = 2  # Up filter
+        filtered[:, 1:] = rows - previous  # wraps modulo 256
+        self.previous = rows[-1:].copy()
+        data = self.compressor.compress(filtered.tobytes())
+        if data:
+            self._chunk(b'IDAT', data)
+
+    def close(self):
+        self._chunk(b'IDAT', self.compressor.flush())
+        self._chunk(b'IEND', b'')
+        self.file.close()
+
+
+# ============================================================================
+# Saving
+# ============================================================================
+
+def tight_bbox_inches(fig, dpi, pad_inches=0.1):
+    """
+    Tight bounding box of a figure in inches when saved at ``dpi``.
+
+    Does what ``bbox_inches='tight'`` does before the real render (a layout
+    pass with drawing disabled, then ``get_tightbbox``) but with a 1x1
+    pixel renderer instead of a full-size canvas.
+    """
+    from matplotlib.backends.backend_agg import RendererAgg
+
+    figure_dpi = fig.dpi
+    fig.dpi = dpi
+    try:
+        renderer = RendererAgg(1, 1, dpi)
+        with renderer._draw_disabled():
+            fig.draw(renderer)
+        bbox = fig.get_tightbbox(renderer)
+    finally:
+        fig.dpi = figure_dpi
+    return bbox.padded(pad_inches)
+
+
+def _save_tiled(fig, filename, bbox, dpi, band_rows, **kwargs):
+    """
+    Render ``bbox`` (inches) in horizontal bands and stream them into a PNG.
+
+    Matplotlib truncates the canvas to whole pixels and anchors the drawing
+    at the bottom edge, so bands are placed by their distance from the
+    bottom and given half a pixel of slack that the truncation drops.
+    """
+    import numpy as np
+    from matplotlib.transforms import Bbox
+
+    width = int(bbox.width * dpi)
+    height = int(bbox.height * dpi)
+    writer = StreamingPNGWriter(filename, width, height, dpi=dpi)
+    try:
+        for top in range(0, height, band_rows):
+            rows = min(band_rows, height - top)
+            band = Bbox.from_bounds(bbox.x0, bbox.y0 + (height - top - rows) / dpi,
+                                    bbox.width, (rows + 0.5) / dpi)
+            buffer = io.BytesIO()
+            fig.savefig(buffer, format='rgba', dpi=dpi, bbox_inches=band, **kwargs)
+            pixels = np.frombuffer(buffer.getbuffer(), np.uint8).reshape(-1, width, 4)
+            writer.write_rows(pixels[:rows])
+    finally:
+        writer.close()
+
+
+def save_figure(filename, fig=None, **savefig_kwargs):
+    """
+    Save a figure reproducibly, honouring the memory ceiling when one is set.
+
+    The file is written once into the output store and linked to every
+    place the figure is served from (see illustration_store.py). The figure
+    is drawn under the style it was built with (see figure_api.py). In
+    draft mode it goes to ``draft_path(filename)`` instead.
+
+    Args:
+        filename: Output path
+        fig: Figure to save, e.g. from a ``build_*`` function (default: the
+            current pyplot figure)
+        **savefig_kwargs: As for ``Figure.savefig`` (dpi, bbox_inches, facecolor, ...)
+    """
+    from figure_api import figure_style
+    from illustration_store import commit, staging_path
+
+    if fig is None:
+        import matplotlib.pyplot as plt
+        fig = plt.gcf()
+
+    dpi = draft_dpi()
+    if dpi is not None:
+        path = draft_path(filename)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with figure_style(fig):
+            _save_draft(fig, path, savefig_kwargs, dpi)
+        print(f"   📝 Draft: {os.path.relpath(path, PROJECT_ROOT)}")
+        return
+
+    staged = staging_path(filename)
+    try:
+        with figure_style(fig):
+            _save(fig, staged, savefig_kwargs)
+    except BaseException:
+        os.remove(staged)
+        raise
+    commit(staged, filename)
+    _saved.figure = (os.path.abspath(filename), fig)
+
+
+def saved_figure(filename):
+    """
+    The Figure this thread last saved to ``filename``, or None.
+
+    Lets the build export more from a figure (an interactive scene, see
+    bloch_interactive.py) without building it a second time.
+    """
+    path, fig = getattr(_saved, 'figure', (None, None))
+    return fig if path == os.path.abspath(filename) else None
+
+
+def _savefig_geometry(fig, kwargs):
+    """Pop the DPI, bbox and padding savefig would use from ``kwargs``."""
+    import matplotlib
+
+    dpi = kwargs.pop('dpi', None) or matplotlib.rcParams['savefig.dpi']
+    if dpi == 'figure':
+        dpi = fig.dpi
+    bbox = kwargs.pop('bbox_inches', matplotlib.rcParams['savefig.bbox'])
+    pad_inches = kwargs.pop('pad_inches', matplotlib.rcParams['savefig.pad_inches'])
+    return dpi, bbox, pad_inches
+
+
+def _save_draft(fig, filename, savefig_kwargs, dpi):
+    """Save at the draft ``dpi``, cropped to the release render's tight bbox."""
+    kwargs = dict(savefig_kwargs)
+    release_dpi, bbox, pad_inches = _savefig_geometry(fig, kwargs)
+    if bbox == 'tight':
+        bbox = tight_bbox_inches(fig, release_dpi, pad_inches)
+    fig.savefig(filename, dpi=dpi, bbox_inches=bbox, **output_kwargs(filename, kwargs))
+
+
+def _save(fig, filename, savefig_kwargs):
+    from matplotlib.transforms import Bbox
+
+    ceiling = memory_ceiling()
+    if ceiling is None:
+        fig.savefig(filename, **output_kwargs(filename, savefig_kwargs))
+        return
+
+    kwargs = dict(savefig_kwargs)
+    dpi, bbox, pad_inches = _savefig_geometry(fig, kwargs)
+
+    renderer_pool().capacity = ceiling
+    _pooled_canvas_class()(fig)  # attaches itself as fig.canvas
+    if bbox == 'tight':
+        bbox = tight_bbox_inches(fig, dpi, pad_inches)
+    elif bbox is None:
+        bbox = Bbox.from_bounds(0, 0, *fig.get_size_inches())
+
+    row_bytes = int(bbox.width * dpi) * 4
+    fits = CANVAS_COPIES * row_bytes * int(bbox.height * dpi) <= ceiling
+    if fits or not str(filename).lower().endswith('.png'):
+        fig.savefig(filename, dpi=dpi, bbox_inches=bbox, **output_kwargs(filename, kwargs))
+    else:
+        band_rows = max(1, ceiling // (CANVAS_COPIES * row_bytes))
+        _save_tiled(fig, filename, bbox, dpi, band_rows, **kwargs)
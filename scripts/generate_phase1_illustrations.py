@@ -9,32 +9,51 @@ Creates 4 critical Qiskit-based visualizations:
 4. Superposition State Evolution
 
 Requirements:
-- qiskit
 - matplotlib
 - numpy
+- qiskit (imported only by the figures that declare it)
+- qiskit-aer, cirq, pennylane or amazon-braket-sdk (optional, with
+  QC101_SIM_ENGINE=aer/cirq/pennylane/braket, see simulator_backends.py)
+
+Each figure is built by a ``build_*`` function that returns its own
+Figure under the script's style (see figure_api.py), so the builders can
+run concurrently in one process.
 
 Usage:
     python scripts/generate_phase1_illustrations.py
 """
 
-import numpy as np
-import matplotlib.pyplot as plt
-from matplotlib import patches
-from qiskit import QuantumCircuit
-from qiskit_aer import AerSimulator
-from qiskit.visualization import plot_bloch_vector, plot_histogram
-from qiskit.quantum_info import Statevector
+import os
+
+from bloch_sphere import BlochSphere
+from circuit_diagrams import drawer
+from figure_api import new_figure, styled
+from figure_output import save_figure
+from illustration_registry import figure, requires
+from simulator_backends import bell_circuit, superposition_circuit
+from statevector_sim import bloch_vectors, run_counts
 import warnings
 warnings.filterwarnings('ignore')
 
-# Output directory
-OUTPUT_DIR = "01-foundations/illustrations"
+# Output directory, resolved from the project root so the script runs from any cwd
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.dirname(SCRIPT_DIR)
+OUTPUT_DIR = os.path.join(PROJECT_ROOT, '01-foundations', 'illustrations')
+
+# Standard figure settings, applied around each build
+STYLE = {
+    'figure.dpi': 300,
+    'savefig.dpi': 300,
+    'savefig.bbox': 'tight',
+    'savefig.facecolor': 'white',
+}
+SAVE_KWARGS = {'dpi': 300, 'bbox_inches': 'tight', 'facecolor': 'white'}
+
+# Sized so Qiskit keeps its default font scale for the two-gate Bell circuit
+BELL_CIRCUIT_FIGSIZE = (3.1, 2.2)
 
-# Standard figure settings
-plt.rcParams['figure.dpi'] = 300
-plt.rcParams['savefig.dpi'] = 300
-plt.rcParams['savefig.bbox'] = 'tight'
-plt.rcParams['savefig.facecolor'] = 'white'
+# Shared Bloch sphere styling; the mesh is computed once and reused per panel
+BLOCH_SPHERE = BlochSphere()
 
 print("🎨 Generating Phase 1 Critical Illustrations...")
 print("=" * 60)
@@ -44,79 +63,49 @@ print("=" * 60)
 # Illustration 1: Basic Bloch Sphere with Common States
 # ============================================================================
 
-def generate_bloch_sphere_basic():
-    """Generate Bloch sphere showing 6 common qubit states."""
-    print("\n1️⃣  Creating: Basic Bloch Sphere with Common States...")
-
-    fig = plt.figure(figsize=(12, 10))
-
-    # Define the 6 common states
-    states = {
-        '|0⟩': [0, 0, 1],      # North pole
-        '|1⟩': [0, 0, -1],     # South pole
-        '|+⟩': [1, 0, 0],      # +X axis
-        '|-⟩': [-1, 0, 0],     # -X axis
-        '|↻⟩': [0, 1, 0],      # +Y axis
-        '|↺⟩': [0, -1, 0],     # -Y axis
-    }
-
-    # Create 2x3 subplot grid
-    positions = [
-        (0, 0, 1),  # |0⟩
-        (0, 0, -1), # |1⟩
-        (1, 0, 0),  # |+⟩
-        (-1, 0, 0), # |-⟩
-        (0, 1, 0),  # |↻⟩
-        (0, -1, 0), # |↺⟩
+@styled(STYLE)
+def build_bloch_sphere_basic():
+    """Bloch spheres of the 6 common qubit states."""
+    fig = new_figure(figsize=(12, 10))
+
+    # Gate sequences preparing the 6 common states from |0⟩
+    preparations = [
+        [],             # |0⟩: North pole
+        ['x'],          # |1⟩: South pole
+        ['h'],          # |+⟩: +X axis
+        ['x', 'h'],     # |-⟩: -X axis
+        ['h', 's'],     # |↻⟩: +Y axis
+        ['h', 'sdg'],   # |↺⟩: -Y axis
     ]
+    positions = bloch_vectors(preparations)
 
     labels = ['|0⟩ (North)', '|1⟩ (South)', '|+⟩ (X+)', '|−⟩ (X−)',
               '|↻⟩ (Y+)', '|↺⟩ (Y−)']
 
+    equator = {'color': 'b', 'linestyle': '--', 'alpha': 0.3, 'linewidth': 1}
+
     for idx, (label, vector) in enumerate(zip(labels, positions)):
         ax = fig.add_subplot(2, 3, idx + 1, projection='3d')
+        BLOCH_SPHERE.draw(ax, title=label, equator_style=equator,
+                          fontsize=12, fontweight='bold')
+        BLOCH_SPHERE.add_vectors(ax, vector, colors='red')
 
-        # Plot Bloch sphere
-        u = np.linspace(0, 2 * np.pi, 100)
-        v = np.linspace(0, np.pi, 100)
-        x = np.outer(np.cos(u), np.sin(v))
-        y = np.outer(np.sin(u), np.sin(v))
-        z = np.outer(np.ones(np.size(u)), np.cos(v))
-
-        ax.plot_surface(x, y, z, alpha=0.1, color='lightblue')
-
-        # Plot axes
-        ax.plot([0, 0], [0, 0], [-1.2, 1.2], 'k-', alpha=0.3, linewidth=1)
-        ax.plot([-1.2, 1.2], [0, 0], [0, 0], 'k-', alpha=0.3, linewidth=1)
-        ax.plot([0, 0], [-1.2, 1.2], [0, 0], 'k-', alpha=0.3, linewidth=1)
-
-        # Label axes
-        ax.text(0, 0, 1.3, 'Z', fontsize=10)
-        ax.text(1.3, 0, 0, 'X', fontsize=10)
-        ax.text(0, 1.3, 0, 'Y', fontsize=10)
-
-        # Plot state vector
-        ax.quiver(0, 0, 0, vector[0], vector[1], vector[2],
-                 color='red', arrow_length_ratio=0.15, linewidth=3)
-
-        # Plot equator
-        theta = np.linspace(0, 2*np.pi, 100)
-        ax.plot(np.cos(theta), np.sin(theta), 0, 'b--', alpha=0.3, linewidth=1)
-
-        ax.set_xlim([-1.2, 1.2])
-        ax.set_ylim([-1.2, 1.2])
-        ax.set_zlim([-1.2, 1.2])
-        ax.set_box_aspect([1,1,1])
-        ax.set_title(label, fontsize=12, fontweight='bold')
-        ax.axis('off')
-
-    plt.suptitle('Common Qubit States on the Bloch Sphere',
+    fig.suptitle('Common Qubit States on the Bloch Sphere',
                  fontsize=16, fontweight='bold', y=0.98)
 
-    plt.tight_layout()
+    fig.tight_layout()
+    return fig
+
+
+@figure('bloch-sphere-basic.png', pages=['foundations/the-qubit.md'], budget='600KB',
+        interactive=True)
+@requires('mpl_toolkits.mplot3d')
+def generate_bloch_sphere_basic():
+    """Generate Bloch sphere showing 6 common qubit states."""
+    print("\n1️⃣  Creating: Basic Bloch Sphere with Common States...")
+
     filename = f"{OUTPUT_DIR}/bloch-sphere-basic.png"
-    plt.savefig(filename, dpi=300, bbox_inches='tight', facecolor='white')
-    plt.close()
+    save_figure(filename, build_bloch_sphere_basic(), **SAVE_KWARGS)
 
     print(f"   ✅ Saved: {filename}")
 
@@ -125,17 +114,16 @@ def generate_bloch_sphere_basic():
 # Illustration 2: Bell State Creation Circuit
 # ============================================================================
 
-def generate_bell_state_circuit():
-    """Generate circuit showing Bell state creation with H + CNOT."""
-    print("\n2️⃣  Creating: Bell State Creation Circuit...")
+@styled(STYLE)
+def build_bell_state_circuit():
+    """Bell state creation circuit (H + CNOT) with the state after each step."""
+    # The course's Bell circuit, as run on every simulator backend
+    qc = bell_circuit(measure=False)
 
-    # Create circuit
-    qc = QuantumCircuit(2)
-    qc.h(0)
-    qc.cx(0, 1)
-
-    # Draw circuit
-    fig = qc.draw('mpl', style='iqp', fold=False)
+    # Draw circuit onto our own axes with this process's warm drawer
+    # (see circuit_diagrams.py)
+    fig = new_figure(figsize=BELL_CIRCUIT_FIGSIZE)
+    drawer('iqp').draw(qc, fig.add_subplot())
 
     # Add title
     fig.suptitle('Bell State Creation: |Φ⁺⟩ = (|00⟩ + |11⟩)/√2',
@@ -145,10 +133,17 @@ def generate_bell_state_circuit():
     fig.text(0.5, 0.02,
              'Start: |00⟩  →  After H: (|00⟩ + |10⟩)/√2  →  After CNOT: (|00⟩ + |11⟩)/√2',
              ha='center', fontsize=10, style='italic')
+    return fig
+
+
+@figure('bell-state-circuit.png', pages=['foundations/entanglement.md'])
+@requires('qiskit', 'qiskit.visualization')
+def generate_bell_state_circuit():
+    """Generate circuit showing Bell state creation with H + CNOT."""
+    print("\n2️⃣  Creating: Bell State Creation Circuit...")
 
     filename = f"{OUTPUT_DIR}/bell-state-circuit.png"
-    plt.savefig(filename, dpi=300, bbox_inches='tight', facecolor='white')
-    plt.close()
+    save_figure(filename, build_bell_state_circuit(), **SAVE_KWARGS)
 
     print(f"   ✅ Saved: {filename}")
 
@@ -157,78 +152,52 @@ def generate_bell_state_circuit():
 # Illustration 3: Single Qubit Gates on Bloch Sphere
 # ============================================================================
 
-def generate_gates_bloch_sphere():
-    """Show X, Y, Z gate effects as rotations on Bloch sphere."""
-    print("\n3️⃣  Creating: Single Qubit Gates on Bloch Sphere...")
-
-    fig = plt.figure(figsize=(15, 5))
+@styled(STYLE)
+def build_gates_bloch_sphere():
+    """X, Y and Z gates as rotations on the Bloch sphere."""
+    fig = new_figure(figsize=(15, 5))
 
     gates = ['X', 'Y', 'Z']
-    initial_state = [0, 0, 1]  # |0⟩ state
 
-    # Define final states after each gate
-    final_states = {
-        'X': [0, 0, -1],   # X|0⟩ = |1⟩
-        'Y': [0, 0, -1],   # Y|0⟩ = i|1⟩ (approximately |1⟩ on Bloch)
-        'Z': [0, 0, 1],    # Z|0⟩ = |0⟩ (no change)
+    # Initial |0⟩ and the state after each gate, computed in one batch
+    initial_state, *finals = bloch_vectors([[]] + [[gate.lower()] for gate in gates])
+    final_states = dict(zip(gates, finals))
+
+    rotation_axes = {
+        'X': [1, 0, 0],
+        'Y': [0, 1, 0],
+        'Z': [0, 0, 1],
     }
 
     for idx, gate in enumerate(gates):
         ax = fig.add_subplot(1, 3, idx + 1, projection='3d')
+        BLOCH_SPHERE.draw(ax, title=f'{gate} Gate (π rotation around {gate}-axis)',
+                          fontsize=12, fontweight='bold')
 
-        # Plot Bloch sphere
-        u = np.linspace(0, 2 * np.pi, 100)
-        v = np.linspace(0, np.pi, 100)
-        x = np.outer(np.cos(u), np.sin(v))
-        y = np.outer(np.sin(u), np.sin(v))
-        z = np.outer(np.ones(np.size(u)), np.cos(v))
-
-        ax.plot_surface(x, y, z, alpha=0.1, color='lightblue')
-
-        # Plot axes
-        ax.plot([0, 0], [0, 0], [-1.2, 1.2], 'k-', alpha=0.3, linewidth=1)
-        ax.plot([-1.2, 1.2], [0, 0], [0, 0], 'k-', alpha=0.3, linewidth=1)
-        ax.plot([0, 0], [-1.2, 1.2], [0, 0], 'k-', alpha=0.3, linewidth=1)
-
-        # Label axes
-        ax.text(0, 0, 1.3, 'Z', fontsize=10)
-        ax.text(1.3, 0, 0, 'X', fontsize=10)
-        ax.text(0, 1.3, 0, 'Y', fontsize=10)
-
-        # Plot initial state
-        ax.quiver(0, 0, 0, initial_state[0], initial_state[1], initial_state[2],
-                 color='blue', arrow_length_ratio=0.15, linewidth=2,
-                 label='Initial |0⟩')
-
-        # Plot final state
-        final = final_states[gate]
-        ax.quiver(0, 0, 0, final[0], final[1], final[2],
-                 color='red', arrow_length_ratio=0.15, linewidth=3,
-                 label=f'After {gate}')
+        # Plot initial and final state
+        BLOCH_SPHERE.add_vectors(ax, initial_state, colors='blue', linewidth=2,
+                                 labels=['Initial |0⟩'])
+        BLOCH_SPHERE.add_vectors(ax, final_states[gate], colors='red',
+                                 labels=[f'After {gate}'])
 
         # Plot rotation axis
-        if gate == 'X':
-            ax.plot([0, 1.5], [0, 0], [0, 0], 'g--', linewidth=2, alpha=0.7, label='Rotation axis')
-        elif gate == 'Y':
-            ax.plot([0, 0], [0, 1.5], [0, 0], 'g--', linewidth=2, alpha=0.7, label='Rotation axis')
-        elif gate == 'Z':
-            ax.plot([0, 0], [0, 0], [0, 1.5], 'g--', linewidth=2, alpha=0.7, label='Rotation axis')
-
-        ax.set_xlim([-1.2, 1.2])
-        ax.set_ylim([-1.2, 1.2])
-        ax.set_zlim([-1.2, 1.2])
-        ax.set_box_aspect([1,1,1])
-        ax.set_title(f'{gate} Gate (π rotation around {gate}-axis)',
-                    fontsize=12, fontweight='bold')
+        BLOCH_SPHERE.add_rotation_axes(ax, rotation_axes[gate])
+
         ax.legend(loc='upper left', fontsize=8)
-        ax.axis('off')
 
-    plt.suptitle('Pauli Gates as Rotations on the Bloch Sphere',
+    fig.suptitle('Pauli Gates as Rotations on the Bloch Sphere',
                  fontsize=16, fontweight='bold', y=0.95)
+    return fig
+
+
+@figure('gates-bloch-sphere.png', pages=['foundations/the-qubit.md'], interactive=True)
+@requires('mpl_toolkits.mplot3d')
+def generate_gates_bloch_sphere():
+    """Show X, Y, Z gate effects as rotations on Bloch sphere."""
+    print("\n3️⃣  Creating: Single Qubit Gates on Bloch Sphere...")
 
     filename = f"{OUTPUT_DIR}/gates-bloch-sphere.png"
-    plt.savefig(filename, dpi=300, bbox_inches='tight', facecolor='white')
-    plt.close()
+    save_figure(filename, build_gates_bloch_sphere(), **SAVE_KWARGS)
 
     print(f"   ✅ Saved: {filename}")
 
@@ -237,74 +206,32 @@ def generate_gates_bloch_sphere():
 # Illustration 4: Superposition State Evolution
 # ============================================================================
 
-def generate_superposition_evolution():
-    """Show |0⟩ → H → |+⟩ with Bloch sphere and measurement histogram."""
-    print("\n4️⃣  Creating: Superposition State Evolution...")
+@styled(STYLE)
+def build_superposition_evolution():
+    """|0⟩ → H → |+⟩ on the Bloch sphere, with a measurement histogram."""
+    fig = new_figure(figsize=(15, 5))
+
+    title_style = {'fontsize': 12, 'fontweight': 'bold'}
 
-    fig = plt.figure(figsize=(15, 5))
+    state_0, state_plus = bloch_vectors([[], ['h']])
 
     # Left: Initial state |0⟩
     ax1 = fig.add_subplot(1, 3, 1, projection='3d')
-    state_0 = [0, 0, 1]
-
-    u = np.linspace(0, 2 * np.pi, 100)
-    v = np.linspace(0, np.pi, 100)
-    x = np.outer(np.cos(u), np.sin(v))
-    y = np.outer(np.sin(u), np.sin(v))
-    z = np.outer(np.ones(np.size(u)), np.cos(v))
-
-    ax1.plot_surface(x, y, z, alpha=0.1, color='lightblue')
-    ax1.plot([0, 0], [0, 0], [-1.2, 1.2], 'k-', alpha=0.3)
-    ax1.plot([-1.2, 1.2], [0, 0], [0, 0], 'k-', alpha=0.3)
-    ax1.plot([0, 0], [-1.2, 1.2], [0, 0], 'k-', alpha=0.3)
-    ax1.quiver(0, 0, 0, state_0[0], state_0[1], state_0[2],
-              color='blue', arrow_length_ratio=0.15, linewidth=3)
-    ax1.text(0, 0, 1.3, 'Z', fontsize=10)
-    ax1.text(1.3, 0, 0, 'X', fontsize=10)
-    ax1.text(0, 1.3, 0, 'Y', fontsize=10)
-    ax1.set_xlim([-1.2, 1.2])
-    ax1.set_ylim([-1.2, 1.2])
-    ax1.set_zlim([-1.2, 1.2])
-    ax1.set_box_aspect([1,1,1])
-    ax1.set_title('Initial State: |0⟩', fontsize=12, fontweight='bold')
-    ax1.axis('off')
-
-    # Middle: After H gate |+⟩
+    BLOCH_SPHERE.draw(ax1, title='Initial State: |0⟩', **title_style)
+    BLOCH_SPHERE.add_vectors(ax1, state_0, colors='blue')
+
+    # Middle: After H gate |+⟩ (highlighting the equator)
     ax2 = fig.add_subplot(1, 3, 2, projection='3d')
-    state_plus = [1, 0, 0]  # |+⟩ on equator, X-axis
-
-    ax2.plot_surface(x, y, z, alpha=0.1, color='lightblue')
-    ax2.plot([0, 0], [0, 0], [-1.2, 1.2], 'k-', alpha=0.3)
-    ax2.plot([-1.2, 1.2], [0, 0], [0, 0], 'k-', alpha=0.3)
-    ax2.plot([0, 0], [-1.2, 1.2], [0, 0], 'k-', alpha=0.3)
-    ax2.quiver(0, 0, 0, state_plus[0], state_plus[1], state_plus[2],
-              color='red', arrow_length_ratio=0.15, linewidth=3)
-
-    # Highlight equator
-    theta = np.linspace(0, 2*np.pi, 100)
-    ax2.plot(np.cos(theta), np.sin(theta), 0, 'r--', alpha=0.5, linewidth=2)
-
-    ax2.text(0, 0, 1.3, 'Z', fontsize=10)
-    ax2.text(1.3, 0, 0, 'X', fontsize=10)
-    ax2.text(0, 1.3, 0, 'Y', fontsize=10)
-    ax2.set_xlim([-1.2, 1.2])
-    ax2.set_ylim([-1.2, 1.2])
-    ax2.set_zlim([-1.2, 1.2])
-    ax2.set_box_aspect([1,1,1])
-    ax2.set_title('After H Gate: |+⟩ = (|0⟩+|1⟩)/√2', fontsize=12, fontweight='bold')
-    ax2.axis('off')
+    equator = {'color': 'r', 'linestyle': '--', 'alpha': 0.5, 'linewidth': 2}
+    BLOCH_SPHERE.draw(ax2, title='After H Gate: |+⟩ = (|0⟩+|1⟩)/√2',
+                      equator_style=equator, **title_style)
+    BLOCH_SPHERE.add_vectors(ax2, state_plus, colors='red')
 
     # Right: Measurement histogram
     ax3 = fig.add_subplot(1, 3, 3)
 
-    # Create and run circuit
-    qc = QuantumCircuit(1, 1)
-    qc.h(0)
-    qc.measure(0, 0)
-
-    backend = AerSimulator()
-    job = backend.run(qc, shots=1000)
-    counts = job.result().get_counts()
+    # Seeded sampling on the NumPy engine (or any other with --engine)
+    counts = run_counts(superposition_circuit(), shots=1000)
 
     # Plot histogram
     states = ['0', '1']
@@ -325,12 +252,19 @@ def generate_superposition_evolution():
                 f'{value}\n(~50%)',
                 ha='center', va='bottom', fontsize=10, fontweight='bold')
 
-    plt.suptitle('Creating Superposition with Hadamard Gate',
+    fig.suptitle('Creating Superposition with Hadamard Gate',
                  fontsize=16, fontweight='bold', y=0.98)
+    return fig
+
+
+@figure('superposition-evolution.png', pages=['foundations/quantum-mechanics-basics.md'])
+@requires('mpl_toolkits.mplot3d', 'qiskit')
+def generate_superposition_evolution():
+    """Show |0⟩ → H → |+⟩ with Bloch sphere and measurement histogram."""
+    print("\n4️⃣  Creating: Superposition State Evolution...")
 
     filename = f"{OUTPUT_DIR}/superposition-evolution.png"
-    plt.savefig(filename, dpi=300, bbox_inches='tight', facecolor='white')
-    plt.close()
+    save_figure(filename, build_superposition_evolution(), **SAVE_KWARGS)
 
     print(f"   ✅ Saved: {filename}")
 
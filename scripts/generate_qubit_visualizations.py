@@ -10,23 +10,35 @@ This script creates code-driven illustrations for:
 5. Superposition concept
 6. Measurement collapse
 7. Multi-qubit state space growth
+8. Parameter-sweep galleries for measurement and phase gates
+
+Each figure is built by a ``build_*`` function that returns its own
+Figure under the seaborn style (see figure_api.py), so the builders can
+run concurrently in one process.
 """
 
 import numpy as np
-import matplotlib.pyplot as plt
-from matplotlib.patches import FancyArrowPatch, Circle, FancyBboxPatch
-from mpl_toolkits.mplot3d import proj3d, Axes3D
-from qiskit import QuantumCircuit
-from qiskit.quantum_info import Statevector
-from qiskit.visualization import plot_bloch_multivector, plot_state_qsphere
+from matplotlib.cm import ScalarMappable
+from matplotlib.colors import Normalize
+from matplotlib.patches import FancyBboxPatch, Patch
+from bloch_sphere import BlochSphere
+from figure_api import new_figure, styled
+from figure_output import save_figure
+from illustration_registry import figure, requires
+from statevector_scaling import AMPLITUDE_BYTES, bytes_per_amplitude, load_scaling, qubit_limit
+from statevector_sim import parameter_sweep
+from sweep_gallery import SmallMultiples, phase_colors
 import warnings
 warnings.filterwarnings('ignore')
 
-# Set style for professional appearance
-plt.style.use('seaborn-v0_8-darkgrid')
-plt.rcParams['figure.facecolor'] = 'white'
-plt.rcParams['font.size'] = 10
-plt.rcParams['font.family'] = 'sans-serif'
+# Style for professional appearance, applied around each build
+STYLE_SHEET = 'seaborn-v0_8-darkgrid'
+STYLE = {
+    'figure.facecolor': 'white',
+    'font.size': 10,
+    'font.family': 'sans-serif',
+}
+SAVE_KWARGS = {'dpi': 300, 'bbox_inches': 'tight', 'facecolor': 'white'}
 
 import os
 
@@ -35,9 +47,11 @@ SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
 PROJECT_ROOT = os.path.dirname(SCRIPT_DIR)
 OUTPUT_DIR = os.path.join(PROJECT_ROOT, 'docs', 'foundations', 'illustrations') + '/'
 
-def generate_classical_vs_quantum_bit():
-    """Generate side-by-side comparison of classical bit and quantum bit."""
-    fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(14, 6))
+@styled(STYLE_SHEET, STYLE)
+def build_classical_vs_quantum_bit():
+    """Side-by-side comparison of a classical bit and a quantum bit."""
+    fig = new_figure(figsize=(14, 6))
+    ax1, ax2 = fig.subplots(1, 2)
 
     # Classical Bit
     ax1.set_xlim(-1, 5)
@@ -89,34 +103,30 @@ def generate_classical_vs_quantum_bit():
              fontsize=12, ha='center', style='italic',
              bbox=dict(boxstyle='round', facecolor='lightcyan', alpha=0.8))
 
-    plt.tight_layout()
-    plt.savefig(f'{OUTPUT_DIR}classical-vs-quantum-bit.png', dpi=300, bbox_inches='tight')
-    plt.close()
-    print("✓ Generated classical-vs-quantum-bit.png")
+    fig.tight_layout()
+    return fig
 
 
-def generate_bloch_sphere_annotated():
-    """Generate detailed annotated Bloch sphere showing geometry."""
-    fig = plt.figure(figsize=(12, 10))
-    ax = fig.add_subplot(111, projection='3d')
+@figure('classical-vs-quantum-bit.png', pages=['foundations/the-qubit.md'])
+def generate_classical_vs_quantum_bit():
+    """Generate side-by-side comparison of classical bit and quantum bit."""
+    fig = build_classical_vs_quantum_bit()
+    save_figure(f'{OUTPUT_DIR}classical-vs-quantum-bit.png', fig, **SAVE_KWARGS)
+    print("✓ Generated classical-vs-quantum-bit.png")
 
-    # Draw sphere
-    u = np.linspace(0, 2 * np.pi, 50)
-    v = np.linspace(0, np.pi, 50)
-    x = np.outer(np.cos(u), np.sin(v))
-    y = np.outer(np.sin(u), np.sin(v))
-    z = np.outer(np.ones(np.size(u)), np.cos(v))
-    ax.plot_surface(x, y, z, color='lightblue', alpha=0.2, edgecolor='none')
 
-    # Draw axes
-    ax.plot([-1.3, 1.3], [0, 0], [0, 0], 'k-', linewidth=2, alpha=0.6)
-    ax.plot([0, 0], [-1.3, 1.3], [0, 0], 'k-', linewidth=2, alpha=0.6)
-    ax.plot([0, 0], [0, 0], [-1.3, 1.3], 'k-', linewidth=2, alpha=0.6)
+@styled(STYLE_SHEET, STYLE)
+def build_bloch_sphere_annotated():
+    """Annotated Bloch sphere showing its geometry."""
+    fig = new_figure(figsize=(12, 10))
+    ax = fig.add_subplot(111, projection='3d')
 
-    # Label axes
-    ax.text(1.5, 0, 0, 'X', fontsize=16, fontweight='bold', color='red')
-    ax.text(0, 1.5, 0, 'Y', fontsize=16, fontweight='bold', color='green')
-    ax.text(0, 0, 1.5, 'Z', fontsize=16, fontweight='bold', color='blue')
+    # Draw sphere, axes and coloured axis labels
+    sphere = BlochSphere(resolution=50, surface_alpha=0.2, axis_extent=1.3,
+                         axis_style={'alpha': 0.6, 'linewidth': 2}, label_offset=1.5,
+                         label_style={'fontsize': 16, 'fontweight': 'bold'},
+                         label_colors=('red', 'green', 'blue'), frame=True)
+    sphere.draw(ax)
 
     # Mark poles
     ax.scatter([0], [0], [1], color='blue', s=200, marker='o', edgecolors='darkblue', linewidths=2)
@@ -142,32 +152,22 @@ def generate_bloch_sphere_annotated():
     state_y = np.sin(theta) * np.sin(phi)
     state_z = np.cos(theta)
 
-    ax.quiver(0, 0, 0, state_x, state_y, state_z,
-              arrow_length_ratio=0.15, color='darkgreen', linewidth=3, alpha=0.9)
+    sphere.add_vectors(ax, [state_x, state_y, state_z], colors='darkgreen', alpha=0.9)
     ax.text(state_x*1.2, state_y*1.2, state_z*1.2, '|ψ⟩',
             fontsize=14, fontweight='bold', color='darkgreen')
 
-    # Add angles
-    arc_theta = np.linspace(0, theta, 20)
-    arc_x = 0.3 * np.sin(arc_theta) * np.cos(phi)
-    arc_y = 0.3 * np.sin(arc_theta) * np.sin(phi)
-    arc_z = 0.3 * np.cos(arc_theta)
-    ax.plot(arc_x, arc_y, arc_z, 'g--', linewidth=2, alpha=0.7)
+    # Add angles: θ from the Z axis, φ from the X axis in the XY plane
+    sphere.add_arcs(ax, [[0, 0, 1], [1, 0, 0]],
+                    [[state_x, state_y, state_z], [np.cos(phi), np.sin(phi), 0]],
+                    radius=0.3, colors=['g', 'm'], alpha=0.7)
     ax.text(0.15, 0.1, 0.35, 'θ', fontsize=12, color='darkgreen', fontweight='bold')
+    ax.text(0.2, 0.15, 0, 'φ', fontsize=12, color='magenta', fontweight='bold')
 
     # Projection on XY plane
     ax.plot([state_x, state_x], [state_y, state_y], [0, state_z],
             'g--', linewidth=1, alpha=0.5)
     ax.plot([0, state_x], [0, state_y], [0, 0], 'g--', linewidth=2, alpha=0.7)
 
-    # Phi angle
-    arc_phi = np.linspace(0, phi, 20)
-    arc_phi_x = 0.3 * np.cos(arc_phi)
-    arc_phi_y = 0.3 * np.sin(arc_phi)
-    arc_phi_z = np.zeros_like(arc_phi)
-    ax.plot(arc_phi_x, arc_phi_y, arc_phi_z, 'm--', linewidth=2, alpha=0.7)
-    ax.text(0.2, 0.15, 0, 'φ', fontsize=12, color='magenta', fontweight='bold')
-
     ax.set_xlabel('X', fontsize=12, fontweight='bold')
     ax.set_ylabel('Y', fontsize=12, fontweight='bold')
     ax.set_zlabel('Z', fontsize=12, fontweight='bold')
@@ -177,15 +177,25 @@ def generate_bloch_sphere_annotated():
     ax.set_box_aspect([1,1,1])
     ax.view_init(elev=20, azim=45)
 
-    plt.tight_layout()
-    plt.savefig(f'{OUTPUT_DIR}bloch-sphere-annotated.png', dpi=300, bbox_inches='tight')
-    plt.close()
+    fig.tight_layout()
+    return fig
+
+
+@figure('bloch-sphere-annotated.png', pages=['foundations/the-qubit.md'], budget='800KB',
+        interactive=True)
+@requires('mpl_toolkits.mplot3d')
+def generate_bloch_sphere_annotated():
+    """Generate detailed annotated Bloch sphere showing geometry."""
+    fig = build_bloch_sphere_annotated()
+    save_figure(f'{OUTPUT_DIR}bloch-sphere-annotated.png', fig, **SAVE_KWARGS)
     print("✓ Generated bloch-sphere-annotated.png")
 
 
-def generate_state_vector_visualization():
-    """Generate visualization of qubit state vector with amplitude bars."""
-    fig, axes = plt.subplots(1, 3, figsize=(16, 5))
+@styled(STYLE_SHEET, STYLE)
+def build_state_vector_visualization():
+    """Amplitude bars of three qubit state vectors."""
+    fig = new_figure(figsize=(16, 5))
+    axes = fig.subplots(1, 3)
 
     # Three different states
     states = [
@@ -220,16 +230,24 @@ def generate_state_vector_visualization():
                ha='center', transform=ax.transAxes, fontsize=10,
                bbox=dict(boxstyle='round', facecolor='lightyellow', alpha=0.8))
 
-    plt.suptitle('Qubit State Vector Representation', fontsize=16, fontweight='bold', y=1.02)
-    plt.tight_layout()
-    plt.savefig(f'{OUTPUT_DIR}state-vector-visualization.png', dpi=300, bbox_inches='tight')
-    plt.close()
+    fig.suptitle('Qubit State Vector Representation', fontsize=16, fontweight='bold', y=1.02)
+    fig.tight_layout()
+    return fig
+
+
+@figure('state-vector-visualization.png', pages=['foundations/the-qubit.md'])
+def generate_state_vector_visualization():
+    """Generate visualization of qubit state vector with amplitude bars."""
+    fig = build_state_vector_visualization()
+    save_figure(f'{OUTPUT_DIR}state-vector-visualization.png', fig, **SAVE_KWARGS)
     print("✓ Generated state-vector-visualization.png")
 
 
-def generate_measurement_collapse():
-    """Generate visualization showing measurement collapse."""
-    fig, axes = plt.subplots(1, 3, figsize=(16, 5))
+@styled(STYLE_SHEET, STYLE)
+def build_measurement_collapse():
+    """Superposition collapsing to |1⟩ on measurement."""
+    fig = new_figure(figsize=(16, 5))
+    axes = fig.subplots(1, 3)
 
     # Before measurement
     ax1 = axes[0]
@@ -274,17 +292,81 @@ def generate_measurement_collapse():
             transform=ax3.transAxes, fontsize=11, style='italic', color='#E63946',
             bbox=dict(boxstyle='round', facecolor='#FFE5E5', alpha=0.8))
 
-    plt.suptitle('Quantum Measurement: Collapse of Superposition',
+    fig.suptitle('Quantum Measurement: Collapse of Superposition',
                  fontsize=16, fontweight='bold', y=1.02)
-    plt.tight_layout()
-    plt.savefig(f'{OUTPUT_DIR}measurement-collapse.png', dpi=300, bbox_inches='tight')
-    plt.close()
+    fig.tight_layout()
+    return fig
+
+
+@figure('measurement-collapse.png', pages=['foundations/the-qubit.md'])
+def generate_measurement_collapse():
+    """Generate visualization showing measurement collapse."""
+    fig = build_measurement_collapse()
+    save_figure(f'{OUTPUT_DIR}measurement-collapse.png', fig, **SAVE_KWARGS)
     print("✓ Generated measurement-collapse.png")
 
 
-def generate_multi_qubit_growth():
-    """Generate visualization showing exponential growth of state space."""
-    fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(15, 6))
+# Memory walls drawn on the measured scaling panel (bytes, label)
+MEMORY_WALLS = [
+    (2**40, '1 TB server'),
+    (2**50, '1 PB (largest supercomputers)'),
+]
+
+
+def plot_measured_scaling(ax, scaling, max_qubits=50):
+    """
+    Plot measured statevector memory per engine, extrapolated to ``max_qubits``.
+
+    Args:
+        ax: Axes to draw on
+        scaling: Results loaded with ``statevector_scaling.load_scaling``
+        max_qubits: Right edge of the extrapolation
+    """
+    colors = ['#E63946', '#457B9D', '#2D6A4F', '#F4A261']
+    qubits = np.arange(1, max_qubits + 1)
+
+    ax.plot(qubits, AMPLITUDE_BYTES * 2.0**qubits, color='gray', linewidth=1.5,
+            label='Bare state: 16 bytes × 2ⁿ')
+
+    best = None
+    for color, (engine, points) in zip(colors, scaling['engines'].items()):
+        measured = [p for p in points if p['peak_bytes'] > 0]
+        if not measured:
+            continue
+        per_amplitude = bytes_per_amplitude(points)
+        largest = measured[-1]
+        ax.scatter([p['qubits'] for p in measured], [p['peak_bytes'] for p in measured],
+                   color=color, s=25, zorder=3,
+                   label=f"{engine}: {largest['seconds']:.1f} s at {largest['qubits']} qubits")
+        tail = qubits[qubits >= largest['qubits']]
+        ax.plot(tail, per_amplitude * 2.0**tail, color=color, linestyle='--', linewidth=1.5)
+        best = per_amplitude if best is None else min(best, per_amplitude)
+
+    walls = [(scaling['machine']['ram_bytes'], 'This machine')] + MEMORY_WALLS
+    for wall, label in walls:
+        ax.axhline(wall, color='black', linestyle=':', linewidth=1, alpha=0.6)
+        limit = qubit_limit(wall, best or AMPLITUDE_BYTES)
+        ax.text(1.5, wall * 1.6, f'{label}: ≤ {limit} qubits', fontsize=9, fontweight='bold')
+
+    ax.set_yscale('log', base=2)
+    ticks = [2**10, 2**20, 2**30, 2**40, 2**50, 2**60]
+    ax.set_yticks(ticks)
+    ax.set_yticklabels(['1 KB', '1 MB', '1 GB', '1 TB', '1 PB', '1 EB'])
+    ax.set_ylim(2**10, 2**62)
+    ax.set_xlim(0, max_qubits + 1)
+    ax.set_xlabel('Number of Qubits', fontsize=13, fontweight='bold')
+    ax.set_ylabel('Peak Memory', fontsize=13, fontweight='bold')
+    ax.set_title('Simulating n Qubits: Measured Memory (dashed: extrapolated)',
+                 fontsize=14, fontweight='bold')
+    ax.legend(loc='lower right', fontsize=9)
+    ax.grid(alpha=0.3)
+
+
+@styled(STYLE_SHEET, STYLE)
+def build_multi_qubit_growth():
+    """Exponential growth of the state space, and its measured memory cost."""
+    fig = new_figure(figsize=(15, 6))
+    ax1, ax2 = fig.subplots(1, 2)
 
     # Bar chart showing state space growth
     n_qubits = np.arange(1, 11)
@@ -305,58 +387,73 @@ def generate_multi_qubit_growth():
             ax1.text(n, states, f'{states}', ha='center', va='bottom',
                     fontsize=9, fontweight='bold')
 
-    # Comparison table
-    ax2.axis('off')
-    ax2.set_xlim(0, 10)
-    ax2.set_ylim(0, 10)
-
-    table_data = [
-        ['Qubits', 'Classical\nBits Needed', 'States', 'Quantum\nAdvantage'],
-        ['1', '2', '2', '2×'],
-        ['2', '4', '4', '2×'],
-        ['3', '8', '8', '2.67×'],
-        ['5', '32', '32', '6.4×'],
-        ['10', '1,024', '1,024', '102×'],
-        ['20', '1,048,576', '1,048,576', '52,429×'],
-        ['50', '≈10¹⁵', '≈10¹⁵', '≈10¹³×'],
-    ]
-
-    table = ax2.table(cellText=table_data, cellLoc='center', loc='center',
-                     bbox=[0, 0, 1, 1])
-    table.auto_set_font_size(False)
-    table.set_fontsize(10)
-    table.scale(1, 2)
-
-    # Style header row
-    for i in range(4):
-        cell = table[(0, i)]
-        cell.set_facecolor('#1D3557')
-        cell.set_text_props(weight='bold', color='white')
-
-    # Style data rows
-    for i in range(1, 8):
-        for j in range(4):
-            cell = table[(i, j)]
-            if i % 2 == 0:
-                cell.set_facecolor('#F1FAEE')
-            else:
-                cell.set_facecolor('white')
-            if j == 3:  # Highlight advantage column
-                cell.set_facecolor('#E5F5E0')
-                cell.set_text_props(weight='bold', color='#2D6A4F')
-
-    ax2.set_title('Classical vs Quantum State Representation',
-                 fontsize=14, fontweight='bold', pad=20)
-
-    plt.tight_layout()
-    plt.savefig(f'{OUTPUT_DIR}multi-qubit-growth.png', dpi=300, bbox_inches='tight')
-    plt.close()
+    # Measured cost on this machine when statevector_scaling.py has been run,
+    # otherwise the static comparison table
+    scaling = load_scaling()
+    if scaling:
+        plot_measured_scaling(ax2, scaling)
+    else:
+        # Comparison table
+        ax2.axis('off')
+        ax2.set_xlim(0, 10)
+        ax2.set_ylim(0, 10)
+
+        table_data = [
+            ['Qubits', 'Classical\nBits Needed', 'States', 'Quantum\nAdvantage'],
+            ['1', '2', '2', '2×'],
+            ['2', '4', '4', '2×'],
+            ['3', '8', '8', '2.67×'],
+            ['5', '32', '32', '6.4×'],
+            ['10', '1,024', '1,024', '102×'],
+            ['20', '1,048,576', '1,048,576', '52,429×'],
+            ['50', '≈10¹⁵', '≈10¹⁵', '≈10¹³×'],
+        ]
+
+        table = ax2.table(cellText=table_data, cellLoc='center', loc='center',
+                         bbox=[0, 0, 1, 1])
+        table.auto_set_font_size(False)
+        table.set_fontsize(10)
+        table.scale(1, 2)
+
+        # Style header row
+        for i in range(4):
+            cell = table[(0, i)]
+            cell.set_facecolor('#1D3557')
+            cell.set_text_props(weight='bold', color='white')
+
+        # Style data rows
+        for i in range(1, 8):
+            for j in range(4):
+                cell = table[(i, j)]
+                if i % 2 == 0:
+                    cell.set_facecolor('#F1FAEE')
+                else:
+                    cell.set_facecolor('white')
+                if j == 3:  # Highlight advantage column
+                    cell.set_facecolor('#E5F5E0')
+                    cell.set_text_props(weight='bold', color='#2D6A4F')
+
+        ax2.set_title('Classical vs Quantum State Representation',
+                     fontsize=14, fontweight='bold', pad=20)
+
+    fig.tight_layout()
+    return fig
+
+
+@figure('multi-qubit-growth.png', pages=['foundations/the-qubit.md'],
+        inputs=['data/statevector-scaling.json'])
+def generate_multi_qubit_growth():
+    """Generate visualization showing exponential growth of state space."""
+    fig = build_multi_qubit_growth()
+    save_figure(f'{OUTPUT_DIR}multi-qubit-growth.png', fig, **SAVE_KWARGS)
     print("✓ Generated multi-qubit-growth.png")
 
 
-def generate_gate_transformation_sequence():
-    """Generate step-by-step gate transformation visualization."""
-    fig, axes = plt.subplots(1, 4, figsize=(18, 5))
+@styled(STYLE_SHEET, STYLE)
+def build_gate_transformation_sequence():
+    """Amplitudes after each gate of |0⟩ → H → Z → H."""
+    fig = new_figure(figsize=(18, 5))
+    axes = fig.subplots(1, 4)
 
     gates_sequence = [
         ('|0⟩\nInitial', [1, 0], '#2E86AB'),
@@ -392,14 +489,118 @@ def generate_gate_transformation_sequence():
                        xycoords=('axes fraction', 'axes fraction'),
                        arrowprops=dict(arrowstyle='->', lw=2, color='gray'))
 
-    plt.suptitle('Gate Transformation Sequence: |0⟩ → H → Z → H → |1⟩',
+    fig.suptitle('Gate Transformation Sequence: |0⟩ → H → Z → H → |1⟩',
                  fontsize=16, fontweight='bold', y=1.02)
-    plt.tight_layout()
-    plt.savefig(f'{OUTPUT_DIR}gate-transformation-sequence.png', dpi=300, bbox_inches='tight')
-    plt.close()
+    fig.tight_layout()
+    return fig
+
+
+@figure('gate-transformation-sequence.png', pages=['foundations/the-qubit.md'])
+def generate_gate_transformation_sequence():
+    """Generate step-by-step gate transformation visualization."""
+    fig = build_gate_transformation_sequence()
+    save_figure(f'{OUTPUT_DIR}gate-transformation-sequence.png', fig, **SAVE_KWARGS)
     print("✓ Generated gate-transformation-sequence.png")
 
 
+# Bar colours for outcomes |0⟩ and |1⟩ in the sweep galleries
+OUTCOME_COLORS = ['#2E86AB', '#E63946']
+SWEEP_SHOTS = 1000
+# Cyclic colour map for amplitude phases, light at phase 0
+PHASE_CMAP = 'twilight_shifted'
+
+
+def _outcome_legend(fig):
+    fig.legend(handles=[Patch(facecolor=color, edgecolor='black', label=label)
+                        for color, label in zip(OUTCOME_COLORS, ['|0⟩', '|1⟩'])],
+               loc='upper right', ncol=2, fontsize=11, frameon=False)
+
+
+@styled(STYLE_SHEET, STYLE)
+def build_measurement_sweep():
+    """RY(θ)|0⟩ over 240 angles: amplitudes, Born-rule probabilities and samples."""
+    rows, columns = 12, 20
+    thetas = np.linspace(0, 2 * np.pi, rows * columns, endpoint=False).reshape(rows, columns)
+    sweep = parameter_sweep([('ry', thetas)], shots=SWEEP_SHOTS)
+    step = np.degrees(thetas[0, 1] - thetas[0, 0])
+
+    fig = new_figure(figsize=(14, 17))
+    axes = fig.subplots(3, 1)
+    panels = [
+        (sweep.states.real, (-1, 1), 'Amplitudes α and β (real for RY rotations)'),
+        (sweep.probabilities, (0, 1), 'Born Rule: P(0) = |α|², P(1) = |β|²'),
+        (sweep.counts / sweep.shots, (0, 1), f'Sampled: {SWEEP_SHOTS} Shots per Angle'),
+    ]
+    for ax, (values, ylim, title) in zip(axes, panels):
+        panel = SmallMultiples(ax, sweep.grid_shape, ylim=ylim)
+        panel.update(values, colors=OUTCOME_COLORS)
+        panel.label_rows([f'θ = {angle:.0f}°' for angle in np.degrees(thetas[:, 0])],
+                         fontsize=9)
+        panel.label_columns([f'+{k * step:g}°' for k in range(columns)], every=4, fontsize=9)
+        ax.set_title(title, fontsize=13, fontweight='bold')
+
+    _outcome_legend(fig)
+    fig.suptitle('Measuring RY(θ)|0⟩ Across 240 Angles', fontsize=16, fontweight='bold')
+    fig.tight_layout(rect=(0, 0, 1, 0.98))
+    return fig
+
+
+@figure('measurement-sweep.png', pages=['foundations/measurement.md'])
+def generate_measurement_sweep():
+    """Gallery of RY(θ)|0⟩ over 240 angles: amplitudes, Born-rule probabilities and samples."""
+    fig = build_measurement_sweep()
+    save_figure(f'{OUTPUT_DIR}measurement-sweep.png', fig, **SAVE_KWARGS)
+    print("✓ Generated measurement-sweep.png")
+
+
+@styled(STYLE_SHEET, STYLE)
+def build_phase_gate_sweep():
+    """P(φ)RY(θ)|0⟩: the phase is invisible in the Z basis but not in the X basis."""
+    thetas = np.radians(np.arange(0, 181, 15))
+    phis = np.radians(np.arange(0, 360, 15))
+    gates = [('ry', thetas[:, None]), ('p', phis[None, :])]
+    before = parameter_sweep(gates, shots=SWEEP_SHOTS)
+    x_basis = parameter_sweep(gates + ['h'], shots=SWEEP_SHOTS)
+
+    fig = new_figure(figsize=(14, 17))
+    axes = fig.subplots(3, 1)
+    panels = [
+        (np.abs(before.states), phase_colors(before.states, PHASE_CMAP),
+         'Amplitudes |α|, |β| (colour: phase)'),
+        (before.probabilities, OUTCOME_COLORS, 'Z-Basis Probabilities: Phase Has No Effect'),
+        (x_basis.counts / x_basis.shots, OUTCOME_COLORS,
+         f'X-Basis Samples (H then measure, {SWEEP_SHOTS} shots): Phase Decides the Outcome'),
+    ]
+    for ax, (values, colors, title) in zip(axes, panels):
+        panel = SmallMultiples(ax, before.grid_shape)
+        panel.update(values, colors=colors)
+        panel.label_rows([f'θ = {angle:.0f}°' for angle in np.degrees(thetas)], fontsize=9)
+        panel.label_columns([f'φ = {angle:.0f}°' for angle in np.degrees(phis)], every=3,
+                            fontsize=9)
+        ax.set_title(title, fontsize=13, fontweight='bold')
+
+    _outcome_legend(fig)
+    fig.suptitle('Phase Gate Sweep: P(φ)·RY(θ)|0⟩ over 312 Settings',
+                 fontsize=16, fontweight='bold')
+
+    # Colour bar to the right of the amplitudes panel, outside the shared layout
+    fig.tight_layout(rect=(0, 0, 0.95, 0.98))
+    box = axes[0].get_position()
+    phase = ScalarMappable(cmap=PHASE_CMAP, norm=Normalize(-np.pi, np.pi))
+    colorbar = fig.colorbar(phase, cax=fig.add_axes([0.955, box.y0, 0.012, box.height]))
+    colorbar.set_ticks([-np.pi, 0, np.pi])
+    colorbar.set_ticklabels(['−π', '0', 'π'])
+    return fig
+
+
+@figure('phase-gate-sweep.png', pages=['foundations/the-qubit.md'])
+def generate_phase_gate_sweep():
+    """Gallery of P(φ)RY(θ)|0⟩: the phase is invisible in the Z basis but not in the X basis."""
+    fig = build_phase_gate_sweep()
+    save_figure(f'{OUTPUT_DIR}phase-gate-sweep.png', fig, **SAVE_KWARGS)
+    print("✓ Generated phase-gate-sweep.png")
+
+
 if __name__ == '__main__':
     print("Generating qubit visualizations...")
     print(f"Output directory: {OUTPUT_DIR}")
@@ -410,6 +611,8 @@ if __name__ == '__main__':
     generate_measurement_collapse()
     generate_multi_qubit_growth()
     generate_gate_transformation_sequence()
+    generate_measurement_sweep()
+    generate_phase_gate_sweep()
 
     print("\n✓ All visualizations generated successfully!")
     print(f"Files saved to: {OUTPUT_DIR}")
@@ -0,0 +1,227 @@
+"""
+Content-addressed build cache for the illustration generators.
+
+Each figure gets a cache key hashed from everything that decides what its
+PNG looks like:
+- the source of its ``generate_*`` function, including its ``@figure``
+  and ``@requires`` declarations, and of every function of the script it
+  calls, directly or not (its ``build_*`` builder, shared plot helpers)
+- the generator script's module-level setup (style, constants)
+- the source of every local helper module the script imports, directly
+  or through other helpers and including imports inside functions, plus
+  bloch_interactive.py (and what it imports) for figures with an
+  interactive scene
+- the contents of data files it declares with ``@figure(..., inputs=[...])``
+- the installed matplotlib, numpy, pillow, plotly, qiskit and qiskit-aer versions
+- build settings that change the output (e.g. the simulation engine)
+
+The keys are recorded in a manifest beside ``docs/foundations/illustrations/``
+together with a SHA-256 of each output, so a figure is only re-rendered when
+one of its inputs changed or its output went missing or was edited by hand.
+"""
+
+import ast
+import hashlib
+import json
+import os
+from importlib import metadata
+
+from illustration_registry import GENERATOR_SCRIPTS, _decorator_args
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.dirname(SCRIPT_DIR)
+
+MANIFEST_PATH = os.path.join(PROJECT_ROOT, 'docs', 'foundations', '.illustrations-cache.json')
+MANIFEST_VERSION = 1
+
+# Libraries whose version changes how a figure renders
+KEY_LIBRARIES = ['matplotlib', 'numpy', 'pillow', 'plotly', 'qiskit', 'qiskit-aer']
+
+# Helper module that writes the scenes of ``@figure(..., interactive=True)``
+SCENE_EXPORTER = 'bloch_interactive'
+
+
+def library_versions():
+    """Return installed versions of the libraries that feed the cache key."""
+    versions = {}
+    for name in KEY_LIBRARIES:
+        try:
+            versions[name] = metadata.version(name)
+        except metadata.PackageNotFoundError:
+            versions[name] = None
+    return versions
+
+
+def _parse_script(module_name):
+    path = os.path.join(SCRIPT_DIR, f'{module_name}.py')
+    with open(path, encoding='utf-8') as f:
+        source = f.read()
+    return source, ast.parse(source, filename=path)
+
+
+def _is_main_guard(node):
+    return (isinstance(node, ast.If)
+            and isinstance(node.test, ast.Compare)
+            and isinstance(node.test.left, ast.Name)
+            and node.test.left.id == '__name__')
+
+
+def _local_imports(tree):
+    """Names of sibling modules in scripts/ a module imports, anywhere in it."""
+    names = []
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            candidates = [alias.name for alias in node.names]
+        elif isinstance(node, ast.ImportFrom) and node.module and not node.level:
+            candidates = [node.module]
+        else:
+            continue
+        for name in candidates:
+            if os.path.exists(os.path.join(SCRIPT_DIR, f'{name}.py')):
+                names.append(name)
+    return names
+
+
+def _helper_modules(roots):
+    """
+    ``roots`` and every helper module they import, transitively, sorted.
+
+    Generator scripts are left out: a figure's own script is hashed per
+    function instead.
+    """
+    found = set()
+    pending = list(roots)
+    while pending:
+        name = pending.pop()
+        if name in found or name in GENERATOR_SCRIPTS:
+            continue
+        found.add(name)
+        pending += _local_imports(_parse_script(name)[1])
+    return sorted(found)
+
+
+def _used_functions(functions, name):
+    """``name`` and the script-level functions it references, transitively, sorted."""
+    used = set()
+    pending = [name]
+    while pending:
+        current = pending.pop()
+        if current in used or current not in functions:
+            continue
+        used.add(current)
+        pending += [node.id for node in ast.walk(functions[current])
+                    if isinstance(node, ast.Name)]
+    return sorted(used)
+
+
+def figure_cache_key(module_name, func_name, versions=None, settings=None):
+    """
+    Compute the cache key for one figure.
+
+    Args:
+        module_name: Generator script module name (e.g. 'generate_phase1_illustrations')
+        func_name: Name of the ``generate_*`` function in that script
+        versions: Optional precomputed ``library_versions()`` result
+        settings: Optional dict of build settings that affect the output
+
+    Returns:
+        Hex SHA-256 digest
+    """
+    source, tree = _parse_script(module_name)
+
+    functions = {}
+    preamble = []
+    for node in tree.body:
+        if isinstance(node, ast.FunctionDef):
+            functions[node.name] = node
+        elif not _is_main_guard(node):
+            preamble.append(ast.get_source_segment(source, node))
+    if func_name not in functions:
+        raise KeyError(f'{module_name}.{func_name} not found')
+
+    inputs = ()
+    interactive = False
+    declared = _decorator_args(functions[func_name], 'figure')
+    if declared:
+        args, kwargs = declared
+        inputs = args[3] if len(args) > 3 else kwargs.get('inputs', ())
+        interactive = args[4] if len(args) > 4 else kwargs.get('interactive', False)
+
+    function_source = '\n'.join(
+        '\n'.join([ast.get_source_segment(source, d) for d in node.decorator_list]
+                  + [ast.get_source_segment(source, node)])
+        for node in (functions[name] for name in _used_functions(functions, func_name)))
+
+    local_modules = _local_imports(tree)
+    if interactive:
+        local_modules.append(SCENE_EXPORTER)
+    helpers = {}
+    for helper in _helper_modules(local_modules):
+        with open(os.path.join(SCRIPT_DIR, f'{helper}.py'), encoding='utf-8') as f:
+            helpers[helper] = f.read()
+
+    data = {}
+    for rel_path in inputs:
+        path = os.path.join(PROJECT_ROOT, rel_path)
+        data[rel_path] = file_digest(path) if os.path.exists(path) else None
+
+    payload = json.dumps({
+        'function': function_source,
+        'preamble': preamble,
+        'helpers': helpers,
+        'inputs': data,
+        'versions': versions if versions is not None else library_versions(),
+        'settings': settings or {},
+    }, sort_keys=True)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def file_digest(path):
+    """SHA-256 of a file's contents."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class BuildCache:
+    """Manifest of cache keys and output digests for previously built figures."""
+
+    def __init__(self, path=MANIFEST_PATH):
+        self.path = path
+        self.entries = {}
+        if os.path.exists(path):
+            with open(path, encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get('version') == MANIFEST_VERSION:
+                self.entries = data.get('figures', {})
+
+    def is_fresh(self, figure_id, key):
+        """True if the figure was built with this key and its outputs are untouched."""
+        entry = self.entries.get(figure_id)
+        if not entry or entry.get('key') != key:
+            return False
+        for rel_path, digest in entry.get('outputs', {}).items():
+            path = os.path.join(PROJECT_ROOT, rel_path)
+            if not os.path.exists(path) or file_digest(path) != digest:
+                return False
+        return True
+
+    def record(self, figure_id, key, outputs):
+        """Record a successful build; ``outputs`` are paths relative to the project root."""
+        self.entries[figure_id] = {
+            'key': key,
+            'outputs': {rel_path: file_digest(os.path.join(PROJECT_ROOT, rel_path))
+                        for rel_path in outputs},
+        }
+
+    def save(self):
+        """Write the manifest atomically."""
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        tmp_path = f'{self.path}.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'version': MANIFEST_VERSION, 'figures': self.entries},
+                      f, indent=2, sort_keys=True)
+            f.write('\n')
+        os.replace(tmp_path, self.path)
@@ -0,0 +1,327 @@
+"""
+Figure registry for the illustration generators.
+
+Every figure is declared next to its generator function:
+
+    @figure('bloch-sphere-basic.png', pages=['foundations/the-qubit.md'], budget='600KB')
+    @requires('mpl_toolkits.mplot3d')
+    def generate_bloch_sphere_basic():
+        ...
+
+``@figure`` maps the generator to the file it writes (inside its script's
+output directory), to the docs pages that embed it and optionally to a
+byte budget for its master PNG and encoded variants and the data files it reads, with page paths
+relative to ``docs/`` as in ``mkdocs.yml``. ``interactive=True`` also
+exports the figure's 3D panels as a Plotly scene next to the PNG (see
+bloch_interactive.py). The registry is read by
+parsing the generator scripts, so the build can plan what to render
+without importing matplotlib or Qiskit.
+
+``plan_build`` checks the declarations against the image references the
+pages actually contain: figures that no existing page references are
+reported as orphans and not rendered.
+
+Heavy libraries (Qiskit, Qiskit Aer, ...) are not imported at the top of
+the generator scripts. Instead each figure declares what it needs:
+
+    @requires('mpl_toolkits.mplot3d', 'qiskit')
+    def generate_superposition_evolution():
+        ...
+        # superposition_circuit() imports QuantumCircuit when called
+        counts = run_counts(superposition_circuit(), shots=1000)
+
+so building a purely-matplotlib figure never pays for Qiskit. The build
+imports the declared modules just before calling the figure and times
+them; ``measure_cold_start`` does the same in a fresh interpreter to give
+per-module cold-start numbers for the import report.
+"""
+
+import ast
+import contextlib
+import importlib
+import io
+import json
+import os
+import re
+import subprocess
+import sys
+import time
+from collections import namedtuple
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.dirname(SCRIPT_DIR)
+DOCS_DIR = os.path.join(PROJECT_ROOT, 'docs')
+
+# Generator scripts (module names inside scripts/) that provide figures
+GENERATOR_SCRIPTS = [
+    'generate_phase1_illustrations',
+    'generate_qubit_visualizations',
+]
+
+# Where each generator script writes its figures, relative to the project root;
+# the store also links each figure next to the pages that embed it
+OUTPUT_DIRS = {
+    'generate_phase1_illustrations': os.path.join('01-foundations', 'illustrations'),
+    'generate_qubit_visualizations': os.path.join('docs', 'foundations', 'illustrations'),
+}
+
+# Interactive scene written next to an interactive figure's PNG
+SCENE_SUFFIX = '.plotly.json'
+
+# Markdown image reference: ![alt](path)
+IMAGE_PATTERN = re.compile(r'!\[[^\]]*\]\(\s*([^)\s]+)')
+
+# Imported by every generator script before any figure-specific module
+BASE_MODULES = ('numpy', 'matplotlib.figure', 'matplotlib.backends.backend_agg')
+
+
+# ============================================================================
+# Declarations
+# ============================================================================
+
+class FigureSpec(namedtuple('FigureSpec', ['module', 'name', 'output', 'pages', 'requires',
+                                           'budget', 'inputs', 'interactive'])):
+    """
+    A registered figure: generator, output file, consuming pages, imports,
+    byte budget, data files it reads and whether it has an interactive scene.
+    """
+
+    __slots__ = ()
+
+    @property
+    def id(self):
+        """Stable identifier used in build manifests."""
+        return f'{self.module}.{self.name}'
+
+    @property
+    def output_path(self):
+        """Output path relative to the project root."""
+        return os.path.join(OUTPUT_DIRS[self.module], self.output)
+
+    @property
+    def destinations(self):
+        """
+        Every path (relative to the project root) the figure is served from:
+        its output path plus ``illustrations/`` next to each consuming page.
+        """
+        docs_paths = {os.path.join('docs', os.path.dirname(page), 'illustrations', self.output)
+                      for page in self.pages}
+        return [self.output_path] + sorted(docs_paths - {self.output_path})
+
+    @property
+    def scene_output(self):
+        """File name of the interactive scene, or None."""
+        return os.path.splitext(self.output)[0] + SCENE_SUFFIX if self.interactive else None
+
+
+def figure(output, pages=(), budget=None, inputs=(), interactive=False):
+    """
+    Register a generator function as a figure.
+
+    Args:
+        output: File name the generator writes inside its script's output directory
+        pages: Docs pages (relative to docs/) that embed the figure
+        budget: Optional maximum size of the master PNG and of each encoded
+            variant, in bytes or as a string such as '250KB' (see image_variants.py)
+        inputs: Data files (relative to the project root) the figure reads;
+            their contents are part of its cache key
+        interactive: Also export the figure's 3D panels as a Plotly scene,
+            from its ``build_*`` function
+    """
+    def decorator(func):
+        func.output = output
+        func.pages = tuple(pages)
+        func.budget = budget
+        func.inputs = tuple(inputs)
+        func.interactive = interactive
+        return func
+    return decorator
+
+
+def requires(*modules):
+    """
+    Declare the modules a figure needs beyond numpy and matplotlib.
+
+    Args:
+        *modules: Importable module names, e.g. 'qiskit', 'qiskit_aer'
+    """
+    def decorator(func):
+        func.requires = tuple(modules)
+        return func
+    return decorator
+
+
+def _decorator_args(node, name):
+    """Literal positional and keyword arguments of ``@name(...)`` on a function node."""
+    for decorator in node.decorator_list:
+        if (isinstance(decorator, ast.Call) and isinstance(decorator.func, ast.Name)
+                and decorator.func.id == name):
+            args = [ast.literal_eval(arg) for arg in decorator.args]
+            kwargs = {kw.arg: ast.literal_eval(kw.value) for kw in decorator.keywords}
+            return args, kwargs
+    return None
+
+
+def discover_figures(scripts=GENERATOR_SCRIPTS):
+    """
+    Read the registry from the generator scripts without importing them.
+
+    Every ``generate_*`` function must carry a ``@figure`` declaration.
+
+    Returns:
+        List of ``FigureSpec`` in source order.
+    """
+    specs = []
+    for module_name in scripts:
+        path = os.path.join(SCRIPT_DIR, f'{module_name}.py')
+        with open(path, encoding='utf-8') as f:
+            tree = ast.parse(f.read(), filename=path)
+        for node in tree.body:
+            if not (isinstance(node, ast.FunctionDef) and node.name.startswith('generate_')):
+                continue
+            declared = _decorator_args(node, 'figure')
+            if declared is None:
+                raise ValueError(f'{module_name}.{node.name} has no @figure declaration')
+            args, kwargs = declared
+            output = args[0] if args else kwargs['output']
+            pages = tuple(args[1] if len(args) > 1 else kwargs.get('pages', ()))
+            budget = args[2] if len(args) > 2 else kwargs.get('budget')
+            inputs = tuple(args[3] if len(args) > 3 else kwargs.get('inputs', ()))
+            interactive = bool(args[4] if len(args) > 4 else kwargs.get('interactive', False))
+            modules = _decorator_args(node, 'requires')
+            specs.append(FigureSpec(module_name, node.name, output, pages,
+                                    tuple(modules[0]) if modules else (), budget, inputs,
+                                    interactive))
+    return specs
+
+
+def figure_requirements(func):
+    """Modules declared for a figure with ``@requires`` (empty if none)."""
+    return getattr(func, 'requires', ())
+
+
+def timed_import(module_name):
+    """
+    Import a module and return how long it took in milliseconds.
+
+    Modules that are already loaded cost (and report) 0 ms.
+    """
+    if module_name in sys.modules:
+        return 0.0
+    start = time.perf_counter()
+    importlib.import_module(module_name)
+    return (time.perf_counter() - start) * 1000
+
+
+def import_requirements(func):
+    """Import a figure's declared modules; returns {module: milliseconds}."""
+    return {name: timed_import(name) for name in figure_requirements(func)}
+
+
+def _probe(script_module, func_name):
+    """Run inside a fresh interpreter: time every import a figure needs."""
+    timings = {}
+    with contextlib.redirect_stdout(io.StringIO()):
+        for name in BASE_MODULES:
+            timings[name] = timed_import(name)
+        start = time.perf_counter()
+        module = importlib.import_module(script_module)
+        timings[script_module] = (time.perf_counter() - start) * 1000
+        timings.update(import_requirements(getattr(module, func_name)))
+    print(json.dumps(timings))
+
+
+def measure_cold_start(script_module, func_name):
+    """
+    Measure import cost for one figure in a fresh Python process.
+
+    Returns:
+        Dict mapping module name to cold import time in milliseconds, in
+        import order. The generator script's own entry covers whatever it
+        imports at module level beyond ``BASE_MODULES``.
+    """
+    code = (f'import sys; sys.path.insert(0, {SCRIPT_DIR!r}); '
+            f'from illustration_registry import _probe; '
+            f'_probe({script_module!r}, {func_name!r})')
+    env = dict(os.environ, MPLBACKEND='Agg')
+    result = subprocess.run([sys.executable, '-c', code], capture_output=True,
+                            text=True, check=True, env=env)
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+# ============================================================================
+# Pages and build planning
+# ============================================================================
+
+def page_references(page):
+    """
+    File names of the generated illustrations a docs page embeds.
+
+    Only images inside an ``illustrations/`` directory count; logos and
+    other hand-made assets are not generated figures.
+    """
+    path = os.path.join(DOCS_DIR, page)
+    if not os.path.exists(path):
+        return set()
+    with open(path, encoding='utf-8') as f:
+        targets = IMAGE_PATTERN.findall(f.read())
+    return {os.path.basename(target) for target in targets
+            if os.path.basename(os.path.dirname(target)) == 'illustrations'}
+
+
+def docs_pages():
+    """All markdown pages under docs/, relative to docs/."""
+    pages = []
+    for root, _, files in os.walk(DOCS_DIR):
+        for name in files:
+            if name.endswith('.md'):
+                pages.append(os.path.relpath(os.path.join(root, name), DOCS_DIR))
+    return sorted(pages)
+
+
+class BuildPlan(namedtuple('BuildPlan', ['figures', 'orphans', 'undeclared'])):
+    """
+    Figures to render and problems found while planning.
+
+    figures: ``FigureSpec`` that at least one selected page needs
+    orphans: ``FigureSpec`` that no existing page references
+    undeclared: (page, image) pairs a page embeds but no figure declares
+    """
+
+    __slots__ = ()
+
+
+def plan_build(specs, pages=None):
+    """
+    Work out which figures the docs need.
+
+    Args:
+        specs: Registered figures (see ``discover_figures``)
+        pages: Optional docs pages to restrict the build to
+
+    Returns:
+        ``BuildPlan``; slower figures (those with heavy imports) come first so
+        they start as early as possible in the worker pool.
+    """
+    known_pages = set(docs_pages())
+    if pages:
+        unknown = set(pages) - known_pages
+        if unknown:
+            raise ValueError(f"Unknown page(s): {', '.join(sorted(unknown))}")
+
+    references = {page: page_references(page) for page in known_pages}
+
+    needed, orphans = [], []
+    for spec in specs:
+        consumers = [page for page in spec.pages if spec.output in references.get(page, ())]
+        if not consumers:
+            orphans.append(spec)
+        elif not pages or set(consumers) & set(pages):
+            needed.append(spec)
+
+    declared = {(page, spec.output) for spec in specs for page in spec.pages}
+    undeclared = sorted((page, image) for page, images in references.items()
+                        for image in images if (page, image) not in declared)
+
+    needed.sort(key=lambda spec: len(spec.requires), reverse=True)
+    return BuildPlan(needed, orphans, undeclared)
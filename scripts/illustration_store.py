@@ -0,0 +1,283 @@
+"""
+Content-addressed output store for the illustrations.
+
+A figure can be served from more than one directory: the phase 1 figures
+are written to ``01-foundations/illustrations/`` and embedded by docs pages
+from ``docs/foundations/illustrations/``. Rather than rendering twice or
+copying by hand, every output is written once into the store and linked
+into each of its destinations:
+
+1. ``save_figure`` (and the variant encoder) write to a staging file
+   inside the store
+2. ``commit`` names the file by its SHA-256
+   (``.illustrations-store/objects/ab/abcdef....png``)
+3. the object is linked into every destination the registry gives that
+   output: the script's output directory plus the ``illustrations/``
+   directory next to each page that embeds it (``FigureSpec.destinations``),
+   with variants going to the ``variants/`` directory of each and an
+   interactive scene (``<name>.plotly.json``) next to the PNG
+
+Links are hard links by default, so destinations are ordinary files to
+git, MkDocs and the deploy step; ``QC101_LINK_MODE=symlink`` uses relative
+symlinks instead and ``copy`` plain copies (the fallback whenever a hard
+link is not possible, e.g. across file systems). Each link replaces its
+destination atomically. Objects are read-only, and so is every hard link
+to them: a tool that writes into a destination in place fails instead of
+silently changing the object behind every other destination. An
+existing object is re-hashed before it is reused, and replaced if it no
+longer matches its name. Since PNGs are byte-reproducible (see
+figure_output.py), re-rendering an unchanged figure just relinks the same
+object. Objects nothing links to any more are removed by ``prune``.
+
+Paths come from the registry relative to the project root, so generators
+work from any working directory.
+
+Usage:
+    python scripts/illustration_store.py --prune
+"""
+
+import argparse
+import functools
+import glob
+import hashlib
+import os
+import re
+import shutil
+import sys
+import tempfile
+import threading
+import time
+
+from illustration_registry import GENERATOR_SCRIPTS, SCENE_SUFFIX, discover_figures
+from image_variants import SUFFIXES, VARIANT_DIR
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.dirname(SCRIPT_DIR)
+
+STORE_DIR = os.path.join(PROJECT_ROOT, '.illustrations-store')
+OBJECTS_DIR = os.path.join(STORE_DIR, 'objects')
+STAGING_DIR = os.path.join(STORE_DIR, 'staging')
+
+LINK_MODE_ENV = 'QC101_LINK_MODE'
+LINK_MODES = ('hardlink', 'symlink', 'copy')
+DEFAULT_LINK_MODE = 'hardlink'
+
+# Outputs shared by several figures rather than owned by one (the geometry
+# of the interactive scenes), relative to the project root
+SHARED_DIRS = [os.path.join('docs', 'assets')]
+
+# Staging files older than this are left over from crashed renders
+STALE_STAGING_SECONDS = 3600
+
+# mkstemp creates files private to the user; outputs get the usual permissions
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+FILE_MODE = 0o666 & ~_UMASK
+OBJECT_MODE = 0o444 & ~_UMASK
+
+# Destination paths (relative to the project root) committed by each thread
+_local = threading.local()
+
+
+def _committed():
+    if not hasattr(_local, 'committed'):
+        _local.committed = []
+    return _local.committed
+
+
+def link_mode():
+    """Link mode for this process (``QC101_LINK_MODE``, default 'hardlink')."""
+    mode = os.environ.get(LINK_MODE_ENV, DEFAULT_LINK_MODE)
+    if mode not in LINK_MODES:
+        raise ValueError(f"Unknown link mode '{mode}' (choose from {', '.join(LINK_MODES)})")
+    return mode
+
+
+# ============================================================================
+# Destinations
+# ============================================================================
+
+def _script_mtimes():
+    return tuple(os.path.getmtime(os.path.join(SCRIPT_DIR, f'{name}.py'))
+                 for name in GENERATOR_SCRIPTS)
+
+
+@functools.lru_cache(maxsize=4)
+def _destination_dirs(mtimes):
+    """Output directory of each figure -> its destination directories, by file name."""
+    table = {}
+    for spec in discover_figures():
+        table[spec.output_path] = [os.path.dirname(path) for path in spec.destinations]
+    return table
+
+
+def destinations(path):
+    """
+    Every path (absolute) an output should appear at, itself included.
+
+    ``path`` is a figure's output, its interactive scene or a file in its
+    output directory's ``variants/``; anything the registry does not know
+    maps to itself.
+    """
+    rel_path = os.path.relpath(os.path.abspath(path), PROJECT_ROOT)
+    directory, name = os.path.split(rel_path)
+    subdir = ''
+    if os.path.basename(directory) == VARIANT_DIR:
+        directory, subdir = os.path.split(directory)
+    suffixes = '|'.join(re.escape(suffix) for suffix in SUFFIXES.values())
+    for output_path, dirs in _destination_dirs(_script_mtimes()).items():
+        if os.path.dirname(output_path) != directory:
+            continue
+        stem = os.path.splitext(os.path.basename(output_path))[0]
+        if (name in (os.path.basename(output_path), stem + SCENE_SUFFIX) if not subdir
+                else re.fullmatch(rf'{re.escape(stem)}-\d+w({suffixes})', name)):
+            return [os.path.join(PROJECT_ROOT, d, subdir, name) for d in dirs]
+    return [os.path.abspath(path)]
+
+
+# ============================================================================
+# Store
+# ============================================================================
+
+def staging_path(path):
+    """A fresh staging file in the store with the same extension as ``path``."""
+    os.makedirs(STAGING_DIR, exist_ok=True)
+    fd, staged = tempfile.mkstemp(suffix=os.path.splitext(str(path))[1], dir=STAGING_DIR)
+    os.close(fd)
+    os.chmod(staged, FILE_MODE)
+    return staged
+
+
+def staging_dir():
+    """A fresh staging directory in the store."""
+    os.makedirs(STAGING_DIR, exist_ok=True)
+    return tempfile.mkdtemp(dir=STAGING_DIR)
+
+
+def _digest(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def object_path(digest, extension):
+    return os.path.join(OBJECTS_DIR, digest[:2], f'{digest}{extension}')
+
+
+def _link(source, dest, mode):
+    """Point ``dest`` at ``source``, replacing whatever is there atomically."""
+    os.makedirs(os.path.dirname(dest), exist_ok=True)
+    tmp = f'{dest}.tmp-{os.getpid()}-{threading.get_ident()}'
+    if os.path.lexists(tmp):
+        os.remove(tmp)
+    if mode == 'hardlink':
+        if os.path.exists(dest) and os.path.samefile(source, dest):
+            return
+        try:
+            os.link(source, tmp)
+        except OSError:
+            # Another file system, or no hard links here: fall back to a copy
+            shutil.copyfile(source, tmp)
+    elif mode == 'symlink':
+        relative = os.path.relpath(source, os.path.dirname(dest))
+        if os.path.islink(dest) and os.readlink(dest) == relative:
+            return
+        os.symlink(relative, tmp)
+    else:
+        shutil.copyfile(source, tmp)
+    os.replace(tmp, dest)
+
+
+def commit(staged, path):
+    """
+    Move a staged file into the store and link it into every destination of ``path``.
+
+    Args:
+        staged: File written by ``staging_path`` / inside ``staging_dir``
+        path: Where the generator asked for the file to go
+
+    Returns:
+        Absolute destination paths, ``path`` first
+    """
+    digest = _digest(staged)
+    target = object_path(digest, os.path.splitext(str(path))[1])
+    os.makedirs(os.path.dirname(target), exist_ok=True)
+    if os.path.exists(target) and _digest(target) == digest:
+        os.remove(staged)
+    else:
+        # New, or changed on disk since it was stored: the staged file replaces it
+        os.chmod(staged, OBJECT_MODE)
+        os.replace(staged, target)
+
+    mode = link_mode()
+    dests = destinations(path)
+    first = os.path.abspath(path)
+    dests = [first] + [dest for dest in dests if dest != first]
+    for dest in dests:
+        _link(target, dest, mode)
+    _committed().extend(os.path.relpath(dest, PROJECT_ROOT) for dest in dests)
+    return dests
+
+
+def keep(path):
+    """Count an output that is already up to date on disk as committed, without rewriting it."""
+    _committed().append(os.path.relpath(os.path.abspath(path), PROJECT_ROOT))
+
+
+def collect():
+    """Destinations this thread committed since its last call (relative to the root)."""
+    committed = list(dict.fromkeys(_committed()))
+    _committed().clear()
+    return committed
+
+
+def prune():
+    """
+    Remove store objects no destination links to, and staging files left by crashed renders.
+
+    Returns:
+        Number of objects removed
+    """
+    directories = {os.path.dirname(dest) for spec in discover_figures()
+                   for dest in spec.destinations}
+    linked = set()
+    for directory in directories | set(SHARED_DIRS):
+        for path in glob.glob(os.path.join(PROJECT_ROOT, directory, '**', '*'), recursive=True):
+            if os.path.islink(path):
+                linked.add(os.path.realpath(path))
+
+    removed = 0
+    for path in glob.glob(os.path.join(OBJECTS_DIR, '*', '*')):
+        if os.stat(path).st_nlink == 1 and os.path.realpath(path) not in linked:
+            os.remove(path)
+            removed += 1
+
+    cutoff = time.time() - STALE_STAGING_SECONDS
+    for path in glob.glob(os.path.join(STAGING_DIR, '*')):
+        if os.path.getmtime(path) < cutoff:
+            if os.path.isdir(path):
+                shutil.rmtree(path, ignore_errors=True)
+            else:
+                os.remove(path)
+    return removed
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Maintain the illustration output store.')
+    parser.add_argument('--prune', action='store_true',
+                        help='remove objects no destination links to')
+    args = parser.parse_args(argv)
+    if args.prune:
+        print(f"🧹 Removed {prune()} unreferenced object(s) from {STORE_DIR}")
+        return 0
+    for spec in discover_figures():
+        print(spec.id)
+        for dest in spec.destinations:
+            print(f"     {dest}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,159 @@
+"""
+Phase tracing for the illustration build.
+
+When tracing is on, the functions where figure time goes are wrapped so
+that every call records a span:
+
+- simulation: the NumPy statevector engine and the Aer path
+  (statevector_sim.run_counts, its engines and bloch_vectors) and
+  lookups in the simulation results cache
+- circuit:    Qiskit circuit drawing (QuantumCircuit.draw and the drawer
+              warm-up in circuit_diagrams.py)
+- 3d:         building the Bloch sphere surface, axes and labels
+- layout:     Figure.tight_layout
+- output:     savefig and PNG encoding, with the render pass
+  (Figure.draw) nested inside
+
+The build adds a span per figure and per import. Spans are collected in
+each worker and written as a Chrome trace, which loads in
+chrome://tracing and https://ui.perfetto.dev; workers show up as separate
+processes. A cProfile dump per figure can be written alongside.
+
+Nothing is wrapped until ``instrument()`` is called, so a build without
+--trace runs exactly the same code as before.
+
+Usage:
+    python scripts/build_illustrations.py --trace build-trace.json
+    python scripts/build_illustrations.py --trace build-trace.json --profile-dir profiles/
+"""
+
+import contextlib
+import cProfile
+import functools
+import importlib
+import json
+import os
+import sys
+import threading
+import time
+
+# (module, attribute path, span name, category); path components may also
+# be dict keys, for the simulation engine table
+TARGETS = [
+    ('statevector_sim', 'run_counts', 'run_counts', 'simulation'),
+    ('statevector_sim', 'ENGINES.numpy', 'numpy sampling', 'simulation'),
+    ('statevector_sim', 'ENGINES.aer', 'AerSimulator.run', 'simulation'),
+    ('statevector_sim', 'bloch_vectors', 'bloch_vectors', 'simulation'),
+    ('simulation_cache', 'SimulationCache.get', 'simulation cache lookup', 'simulation'),
+    ('qiskit', 'QuantumCircuit.draw', 'QuantumCircuit.draw', 'circuit'),
+    ('circuit_diagrams', 'CircuitDrawer.warm_up', 'circuit drawer warm-up', 'circuit'),
+    ('bloch_sphere', 'BlochSphere.draw', 'BlochSphere.draw', '3d'),
+    ('matplotlib.figure', 'Figure.tight_layout', 'tight_layout', 'layout'),
+    ('matplotlib.figure', 'Figure.savefig', 'savefig', 'output'),
+    ('matplotlib.figure', 'Figure.draw', 'Figure.draw', 'output'),
+    ('matplotlib.backends.backend_agg', 'FigureCanvasAgg.print_png', 'print_png', 'output'),
+]
+
+# Heavy modules that are never imported just to instrument them; their
+# targets are wrapped once something else has imported them
+LAZY_MODULES = ('qiskit',)
+
+_events = []
+_wrapped = set()
+
+
+def _now_us():
+    # perf_counter is CLOCK_MONOTONIC on Linux, so timestamps from
+    # different worker processes line up on one timeline
+    return time.perf_counter_ns() / 1000
+
+
+@contextlib.contextmanager
+def span(name, category='figure', **args):
+    """Record a complete ('X') trace event around the block."""
+    start = _now_us()
+    try:
+        yield
+    finally:
+        _events.append({
+            'name': name,
+            'cat': category,
+            'ph': 'X',
+            'ts': start,
+            'dur': _now_us() - start,
+            'pid': os.getpid(),
+            'tid': threading.get_ident(),
+            'args': args,
+        })
+
+
+def _traced(func, name, category):
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        with span(name, category):
+            return func(*args, **kwargs)
+    return wrapper
+
+
+def instrument():
+    """
+    Wrap every target whose module is available.
+
+    Safe to call repeatedly: targets are wrapped once, and targets in
+    ``LAZY_MODULES`` are picked up on the first call after they were
+    imported. Call it before importing the generator scripts so names they
+    import directly (``from statevector_sim import run_counts``) bind to
+    the wrapped functions.
+    """
+    for module_name, path, name, category in TARGETS:
+        if (module_name, path) in _wrapped:
+            continue
+        if module_name not in sys.modules and module_name.split('.')[0] in LAZY_MODULES:
+            continue
+        owner = importlib.import_module(module_name)
+        *parents, attribute = path.split('.')
+        for parent in parents:
+            owner = owner[parent] if isinstance(owner, dict) else getattr(owner, parent)
+        if isinstance(owner, dict):
+            owner[attribute] = _traced(owner[attribute], name, category)
+        else:
+            setattr(owner, attribute, _traced(getattr(owner, attribute), name, category))
+        _wrapped.add((module_name, path))
+
+
+def collect():
+    """Return the spans recorded in this process so far and forget them."""
+    events = list(_events)
+    _events.clear()
+    return events
+
+
+@contextlib.contextmanager
+def profile(path):
+    """Run the block under cProfile and dump the stats to ``path``."""
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        yield
+    finally:
+        profiler.disable()
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        profiler.dump_stats(path)
+
+
+def write_trace(path, events, process_names=None):
+    """
+    Write spans as a Chrome trace (JSON object format).
+
+    Args:
+        path: Output file
+        events: Spans from ``collect()``, from any number of processes
+        process_names: Optional {pid: label} shown in the trace viewer
+    """
+    metadata = [{'name': 'process_name', 'ph': 'M', 'pid': pid, 'tid': 0,
+                 'args': {'name': label}}
+                for pid, label in sorted((process_names or {}).items())]
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump({'traceEvents': metadata + sorted(events, key=lambda e: e['ts']),
+                   'displayTimeUnit': 'ms'}, f)
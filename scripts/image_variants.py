@@ -0,0 +1,284 @@
+"""
+Responsive image variants for the rendered illustrations.
+
+Every figure is rendered once, as the 300 DPI PNG its generator writes.
+That master is then encoded into lighter variants for ``srcset``:
+
+- ``png``:  optimized truecolour PNG (lossless)
+- ``webp``: lossy WebP
+
+at each of a few widths. The master is decoded once, resized once per
+width, and the encodings run on a thread pool (Pillow releases the GIL
+while encoding), so a figure costs one render however many variants it
+has. Variants are written to a ``variants/`` directory next to the
+master:
+
+    illustrations/variants/bloch-sphere-basic-960w.webp
+    illustrations/variants/bloch-sphere-basic-960w.png
+
+Each build replaces a figure's whole set: variants the current widths
+and encodings no longer produce are deleted (see ``variant_files``), so
+the docs never serve a width from an earlier build.
+
+A figure can declare a byte budget with ``@figure(..., budget='250KB')``;
+the build fails when its master or any of its variants is larger. The
+master counts because it is committed, stays the ``src`` and is shipped
+by the store and the manifest like the variants.
+
+The docs serve the variants: ``mark_responsive`` (called from
+mkdocs_hooks.py) turns each ``<img>`` of a master that has variants into a
+``<picture>`` offering the WebP widths, with the optimized PNG widths as
+the image's own ``srcset``, both sized to the content column (``SIZES``). The master stays the ``src`` for browsers
+without ``srcset`` support.
+
+Requirements:
+- pillow (with WebP support)
+"""
+
+import os
+import posixpath
+import re
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+
+# Target widths in pixels; widths at or above the master's are capped to it
+WIDTHS = (640, 1280, 1920)
+ENCODINGS = ('png', 'webp')
+
+VARIANT_DIR = 'variants'
+WEBP_QUALITY = 82
+
+SUFFIXES = {
+    'png': '.png',
+    'webp': '.webp',
+}
+
+# Variant file name: <stem>-<width>w<suffix>
+VARIANT_NAME = re.compile(r'^(?P<stem>.+)-(?P<width>\d+)w(?P<suffix>\.png|\.webp)$')
+
+# Rendered width of Material's content column, so browsers pick the variant
+# that fills it rather than assuming 100vw. Root font sizes are 20, 22 and
+# 24px from 0, 100em and 125em. From 76.25em both sidebars (12.1rem each)
+# sit in the 61rem grid and the column keeps 1.2rem margins. From 60em
+# only the table of contents is beside it, and below 60em the margins are
+# 0.8rem.
+SIZES = ('(min-width: 125em) 826px, (min-width: 100em) 757px, (min-width: 76.25em) 688px, '
+         '(min-width: 60em) calc(100vw - 282px), calc(100vw - 32px)')
+
+# <img> tag in rendered HTML, with its src
+IMG_TAG = re.compile(r'<img\b[^>]*?\bsrc="([^"]+)"[^>]*>')
+
+SIZE_PATTERN = re.compile(r'^\s*(\d+(?:\.\d+)?)\s*([KM]?B?)\s*$', re.IGNORECASE)
+SIZE_UNITS = {'': 1, 'B': 1, 'K': 1024, 'KB': 1024, 'M': 1024 ** 2, 'MB': 1024 ** 2}
+
+
+class Variant(namedtuple('Variant', ['path', 'width', 'encoding', 'bytes'])):
+    """An encoded variant: file path, pixel width, encoding name and file size."""
+
+    __slots__ = ()
+
+
+def parse_size(size):
+    """
+    Parse a byte budget.
+
+    Args:
+        size: Bytes as an int, or a string such as '250KB' or '1.5MB'
+
+    Returns:
+        Size in bytes
+    """
+    if isinstance(size, int):
+        return size
+    match = SIZE_PATTERN.match(size)
+    if not match:
+        raise ValueError(f'Invalid size: {size!r}')
+    number, unit = match.groups()
+    return int(float(number) * SIZE_UNITS[unit.upper()])
+
+
+def variant_path(output_path, width, encoding):
+    """Path of one variant of the master image at ``output_path``."""
+    directory, name = os.path.split(output_path)
+    stem = os.path.splitext(name)[0]
+    return os.path.join(directory, VARIANT_DIR, f'{stem}-{width}w{SUFFIXES[encoding]}')
+
+
+def variant_widths(master_width, widths=WIDTHS):
+    """Widths to encode for a master image, never upscaling."""
+    return sorted({min(width, master_width) for width in widths})
+
+
+def _flatten(image):
+    """Composite onto white; the figures are saved with a white facecolor anyway."""
+    from PIL import Image
+
+    if image.mode in ('RGBA', 'LA') or 'transparency' in image.info:
+        image = image.convert('RGBA')
+        background = Image.new('RGB', image.size, 'white')
+        background.paste(image, mask=image.getchannel('A'))
+        return background
+    return image.convert('RGB')
+
+
+def _encode(image, path, encoding):
+    """Write one encoding of an already-resized image and return its size in bytes."""
+    if encoding == 'png':
+        image.save(path, 'PNG', optimize=True)
+    elif encoding == 'webp':
+        image.save(path, 'WEBP', quality=WEBP_QUALITY, method=4)
+    else:
+        raise ValueError(f'Unknown encoding: {encoding!r}')
+    return os.path.getsize(path)
+
+
+def encode_variants(output_path, widths=WIDTHS, encodings=ENCODINGS, threads=None,
+                    directory=None):
+    """
+    Encode every width × encoding variant of a rendered master image.
+
+    Args:
+        output_path: Path of the master PNG
+        widths: Target widths in pixels
+        encodings: Any of 'png', 'webp'
+        threads: Encoder threads (default: one per variant, up to CPU count)
+        directory: Where to write the variants (default: ``variants/`` next
+            to the master)
+
+    Returns:
+        List of ``Variant`` ordered by width, then encoding
+    """
+    from PIL import Image
+
+    with Image.open(output_path) as master:
+        master = _flatten(master)
+    directory = directory or os.path.join(os.path.dirname(output_path), VARIANT_DIR)
+    os.makedirs(directory, exist_ok=True)
+
+    jobs = []
+    for width in variant_widths(master.width, widths):
+        height = round(master.height * width / master.width)
+        resized = master if width == master.width else master.resize(
+            (width, height), Image.Resampling.LANCZOS)
+        for encoding in encodings:
+            path = os.path.join(directory,
+                                os.path.basename(variant_path(output_path, width, encoding)))
+            jobs.append((resized, path, width, encoding))
+
+    threads = threads or min(len(jobs), os.cpu_count() or 1)
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        sizes = list(pool.map(lambda job: _encode(job[0], job[1], job[3]), jobs))
+    return [Variant(path, width, encoding, size)
+            for (_, path, width, encoding), size in zip(jobs, sizes)]
+
+
+def over_budget(output_path, variants, budget):
+    """
+    Files of a figure larger than ``budget`` (bytes or a size string such as '250KB').
+
+    Args:
+        output_path: Path of the master PNG, which is checked too
+        variants: Its encoded ``Variant`` list
+
+    Returns:
+        List of (path, bytes)
+    """
+    if budget is None:
+        return []
+    limit = parse_size(budget)
+    files = [(output_path, os.path.getsize(output_path))]
+    files += [(variant.path, variant.bytes) for variant in variants]
+    return [(path, size) for path, size in files if size > limit]
+
+
+def find_variants(output_path):
+    """
+    The variants of a master image that exist on disk.
+
+    Returns:
+        List of ``Variant`` ordered by width, then encoding (empty if none)
+    """
+    directory = os.path.join(os.path.dirname(output_path), VARIANT_DIR)
+    stem = os.path.splitext(os.path.basename(output_path))[0]
+    encodings = {suffix: encoding for encoding, suffix in SUFFIXES.items()}
+    try:
+        names = os.listdir(directory)
+    except FileNotFoundError:
+        return []
+    variants = []
+    for name in names:
+        match = VARIANT_NAME.match(name)
+        if match and match['stem'] == stem:
+            path = os.path.join(directory, name)
+            variants.append(Variant(path, int(match['width']), encodings[match['suffix']],
+                                    os.path.getsize(path)))
+    return sorted(variants, key=lambda v: (v.width, ENCODINGS.index(v.encoding)))
+
+
+def variant_files(output_path):
+    """
+    Every file in the ``variants/`` directory next to a master that belongs
+    to it, whatever its width or encoding.
+
+    Returns:
+        Sorted list of paths (empty if there are none)
+    """
+    directory = os.path.join(os.path.dirname(output_path), VARIANT_DIR)
+    stem = os.path.splitext(os.path.basename(output_path))[0]
+    own = re.compile(rf'{re.escape(stem)}-\d+w[.-]')
+    try:
+        names = os.listdir(directory)
+    except FileNotFoundError:
+        return []
+    return sorted(os.path.join(directory, name) for name in names if own.match(name))
+
+
+def srcset(variants, encoding, base=''):
+    """
+    ``srcset`` attribute value for one encoding, e.g.
+    ``variants/x-640w.webp 640w, variants/x-1280w.webp 1280w``.
+
+    Args:
+        variants: ``Variant`` list from ``encode_variants`` or ``find_variants``
+        encoding: Which encoding to list
+        base: URL of the directory holding the master, as the page refers to it
+    """
+    return ', '.join(f'{posixpath.join(base, VARIANT_DIR, os.path.basename(v.path))} {v.width}w'
+                     for v in variants if v.encoding == encoding)
+
+
+def mark_responsive(html, page_url, docs_dir, plain=()):
+    """
+    Serve the variants of every image in a rendered page that has them.
+
+    Args:
+        html: Page HTML (MkDocs ``on_page_content``)
+        page_url: The page's URL; relative image URLs are resolved against it
+        docs_dir: The docs directory, where the masters and variants are
+        plain: File names of images that get only a PNG ``srcset``, no
+            ``<picture>`` (interactive figures, whose ``<img>``
+            bloch-interactive.js replaces)
+
+    Returns:
+        HTML with a ``<picture>`` (WebP sources) around each such ``<img>``,
+        and the PNG variants as the ``<img>``'s ``srcset``; both carry
+        ``sizes`` (``SIZES``)
+    """
+    def mark(match):
+        tag, src = match[0], match[1]
+        if '://' in src or src.startswith(('/', 'data:')) or 'srcset=' in tag:
+            return tag
+        site_path = posixpath.normpath(posixpath.join(posixpath.dirname(page_url), src))
+        variants = find_variants(os.path.join(docs_dir, *site_path.split('/')))
+        base = posixpath.dirname(src)
+        png = srcset(variants, 'png', base)
+        if not png:
+            return tag
+        img = f'{tag[:4]} srcset="{png}" sizes="{SIZES}"{tag[4:]}'
+        webp = srcset(variants, 'webp', base)
+        if not webp or posixpath.basename(src) in plain:
+            return img
+        return (f'<picture><source type="image/webp" srcset="{webp}" sizes="{SIZES}">'
+                f'{img}</picture>')
+
+    return IMG_TAG.sub(mark, html)
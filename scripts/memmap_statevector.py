@@ -0,0 +1,377 @@
+#!/usr/bin/env python3
+"""
+Out-of-core statevector simulation backed by a memory-mapped file.
+
+statevector_sim.py keeps the whole state in RAM, which caps the
+foundations demos at what one machine holds (see statevector_scaling.py).
+``MemmapStatevector`` keeps the 2**n complex128 amplitudes in a file and
+only ever works on a few chunks of it at a time:
+
+- the state is split into chunks of 2**chunk_qubits contiguous amplitudes;
+  gates on qubits below ``chunk_qubits`` act inside each chunk, gates on
+  higher qubits combine the chunks 2**(q - chunk_qubits) apart
+- consecutive gates that touch the same few high qubits are applied in a
+  single pass, so a layer of single-qubit gates reads and writes the file
+  once rather than once per gate
+- probabilities and sampling stream over the chunks: one pass sums each
+  chunk's probability, a multinomial draw splits the shots between chunks,
+  and each chunk is then sampled on its own
+
+The kernel's page cache does the I/O and evicts written-back pages under
+memory pressure, so states larger than RAM work as long as the disk has
+room for 16 * 2**n bytes. Put the file on a local disk
+(``QC101_MEMMAP_DIR`` or ``--dir``; default: the temp directory).
+
+Also available as ``engine='memmap'`` in statevector_sim.run_counts.
+
+Requirements:
+- numpy
+- qiskit
+
+Usage:
+    python scripts/memmap_statevector.py --qubits 30
+    python scripts/memmap_statevector.py --qubits 34 --dir /scratch --shots 1000
+
+    state, measured = simulate_memmap(circuit)
+    with state:
+        counts = state.sample_counts(1000, qubits=[measured[0], measured[1]], seed=SEED)
+"""
+
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+from statevector_scaling import peak_rss_bytes
+from statevector_sim import _IGNORED, _operation_matrix, _walk, apply_gate
+
+# Directory for state files (default: the system temp directory)
+MEMMAP_DIR_ENV = 'QC101_MEMMAP_DIR'
+
+# 2**20 amplitudes = 16 MiB per chunk
+CHUNK_QUBITS = 20
+
+# A pass holds 2**MAX_HIGH_QUBITS chunks; consecutive gates are batched into
+# one pass while the high qubits they touch stay within this many
+MAX_HIGH_QUBITS = 2
+
+AMPLITUDE_DTYPE = np.complex128
+
+
+class MemmapStatevector:
+    """
+    An n-qubit statevector stored in a memory-mapped file, starting in |0...0⟩.
+
+    Amplitudes are in Qiskit's little-endian order: bit q of the index is
+    qubit q. Use as a context manager (or call ``close``) to remove the file.
+    """
+
+    def __init__(self, num_qubits, path=None, chunk_qubits=CHUNK_QUBITS):
+        """
+        Args:
+            num_qubits: Number of qubits
+            path: State file (default: a temporary file, deleted on close)
+            chunk_qubits: log2 of the amplitudes processed at a time
+
+        Raises:
+            RuntimeError: If the file's directory does not have room for the state
+        """
+        self.num_qubits = num_qubits
+        self.chunk_qubits = min(chunk_qubits, num_qubits)
+        self.nbytes = np.dtype(AMPLITUDE_DTYPE).itemsize * 2 ** num_qubits
+
+        self.owns_file = path is None
+        if path is None:
+            directory = os.environ.get(MEMMAP_DIR_ENV) or tempfile.gettempdir()
+            fd, path = tempfile.mkstemp(prefix=f'qc101-state-{num_qubits}q-', suffix='.bin',
+                                        dir=directory)
+            os.close(fd)
+        free = shutil.disk_usage(os.path.dirname(os.path.abspath(path))).free
+        if free < self.nbytes:
+            if self.owns_file:
+                os.remove(path)
+            raise RuntimeError(f'{num_qubits} qubits need {self.nbytes / 2**30:.1f} GiB but only '
+                               f'{free / 2**30:.1f} GiB is free for {path}')
+
+        self.path = path
+        self.amplitudes = np.memmap(path, dtype=AMPLITUDE_DTYPE, mode='w+',
+                                    shape=(2 ** num_qubits,))
+        self.amplitudes[0] = 1
+
+    @property
+    def chunk_size(self):
+        return 2 ** self.chunk_qubits
+
+    @property
+    def num_chunks(self):
+        return 2 ** (self.num_qubits - self.chunk_qubits)
+
+    def chunks(self):
+        """Yield (start index, read-only view) for each chunk in order."""
+        size = self.chunk_size
+        for start in range(0, len(self.amplitudes), size):
+            yield start, self.amplitudes[start:start + size]
+
+    # ------------------------------------------------------------------------
+    # Gates
+    # ------------------------------------------------------------------------
+
+    def _high_qubits(self, qubits):
+        return {q for q in qubits if q >= self.chunk_qubits}
+
+    def apply_gate(self, matrix, qubits):
+        """Apply one k-qubit gate (qubits in argument order, as in statevector_sim)."""
+        self.apply_gates([(matrix, qubits)])
+
+    def apply_gates(self, gates):
+        """
+        Apply a sequence of gates, batching consecutive ones into shared passes.
+
+        Args:
+            gates: Iterable of (matrix, qubits) pairs, applied in order
+        """
+        batch, high = [], set()
+        for matrix, qubits in gates:
+            gate_high = self._high_qubits(qubits)
+            if batch and len(high | gate_high) > MAX_HIGH_QUBITS:
+                self._apply_pass(batch, high)
+                batch, high = [], set()
+            batch.append((matrix, qubits))
+            high |= gate_high
+        if batch:
+            self._apply_pass(batch, high)
+
+    def _apply_pass(self, gates, high):
+        """
+        One read-modify-write pass over the file applying ``gates``.
+
+        Each step loads the 2**len(high) chunks whose indices differ only in
+        the high qubits' bits, treats them as a state of chunk_qubits +
+        len(high) qubits, applies every gate and writes the chunks back.
+        """
+        c = self.chunk_qubits
+        high = sorted(high)
+        # Chunk-index bit of each high qubit, and its qubit in the group's local state
+        chunk_bits = [1 << (q - c) for q in high]
+        local = {q: c + position for position, q in enumerate(high)}
+        mask = sum(chunk_bits)
+        offsets = [sum(bit for position, bit in enumerate(chunk_bits) if member >> position & 1)
+                   for member in range(2 ** len(high))]
+        mapped = [(matrix, [local.get(q, q) for q in qubits]) for matrix, qubits in gates]
+
+        size = self.chunk_size
+        shape = (2,) * (c + len(high))
+        group = np.empty(len(offsets) * size, dtype=AMPLITUDE_DTYPE)
+        for base in range(self.num_chunks):
+            if base & mask:
+                continue
+            for member, offset in enumerate(offsets):
+                start = (base + offset) * size
+                group[member * size:(member + 1) * size] = self.amplitudes[start:start + size]
+            tensor = group.reshape(shape)
+            for matrix, qubits in mapped:
+                tensor = apply_gate(tensor, matrix, qubits)
+            flat = tensor.reshape(-1)
+            for member, offset in enumerate(offsets):
+                start = (base + offset) * size
+                self.amplitudes[start:start + size] = flat[member * size:(member + 1) * size]
+
+    # ------------------------------------------------------------------------
+    # Streaming queries
+    # ------------------------------------------------------------------------
+
+    @staticmethod
+    def _outcomes(basis, qubits):
+        """Outcome value of each basis index: qubit ``qubits[i]`` becomes bit i."""
+        outcomes = np.zeros(len(basis), dtype=np.int64)
+        for bit, qubit in enumerate(qubits):
+            if qubit is not None:
+                outcomes |= ((basis >> qubit) & 1) << bit
+        return outcomes
+
+    def _basis(self, start):
+        return np.arange(start, start + self.chunk_size, dtype=np.int64)
+
+    def norm(self):
+        """Total probability (1 up to rounding)."""
+        return float(sum(np.vdot(chunk, chunk).real for _, chunk in self.chunks()))
+
+    def probabilities(self, qubits=None):
+        """
+        Marginal outcome probabilities over some qubits, in one pass.
+
+        Args:
+            qubits: Qubit for each output bit, least significant first; None
+                entries are always 0 (default: every qubit)
+
+        Returns:
+            Float array of length 2**len(qubits)
+        """
+        qubits = list(range(self.num_qubits)) if qubits is None else list(qubits)
+        marginal = np.zeros(2 ** len(qubits))
+        for start, chunk in self.chunks():
+            probs = np.abs(chunk) ** 2
+            marginal += np.bincount(self._outcomes(self._basis(start), qubits),
+                                    weights=probs, minlength=len(marginal))
+        return marginal
+
+    def sample_counts(self, shots, qubits=None, seed=None):
+        """
+        Sample measurement counts in two passes over the file.
+
+        Args:
+            shots: Number of shots
+            qubits: Qubit for each output bit, least significant first; None
+                entries are always 0 (default: every qubit)
+            seed: Seed for the random generator (None for fresh entropy)
+
+        Returns:
+            Dict of bitstring counts, like ``Result.get_counts()``
+        """
+        qubits = list(range(self.num_qubits)) if qubits is None else list(qubits)
+        rng = np.random.default_rng(seed)
+        weights = np.array([np.vdot(chunk, chunk).real for _, chunk in self.chunks()])
+        per_chunk = rng.multinomial(shots, weights / weights.sum())
+
+        counts = {}
+        width = len(qubits)
+        for (start, chunk), chunk_shots in zip(self.chunks(), per_chunk):
+            if not chunk_shots:
+                continue
+            probs = np.abs(chunk) ** 2
+            hits = rng.multinomial(chunk_shots, probs / probs.sum())
+            basis = np.flatnonzero(hits)
+            outcomes = self._outcomes(basis + start, qubits)
+            for outcome, count in zip(outcomes, hits[basis]):
+                key = format(int(outcome), f'0{width}b')
+                counts[key] = counts.get(key, 0) + int(count)
+        return counts
+
+    # ------------------------------------------------------------------------
+    # Lifetime
+    # ------------------------------------------------------------------------
+
+    def flush(self):
+        self.amplitudes.flush()
+
+    def close(self):
+        """Release the mapping, and delete the file if it was a temporary one."""
+        if self.amplitudes is None:
+            return
+        self.amplitudes.flush()
+        self.amplitudes = None
+        if self.owns_file and os.path.exists(self.path):
+            os.remove(self.path)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def simulate_memmap(circuit, path=None, chunk_qubits=CHUNK_QUBITS):
+    """
+    Run a circuit's unitary part out of core and collect its terminal measurements.
+
+    Returns:
+        (state, measured) where ``state`` is a MemmapStatevector (close it when
+        done) and ``measured`` maps clbit index to qubit index. The circuit's
+        ``global_phase`` is not applied: it changes no outcome, and applying
+        it would cost another pass over the file.
+
+    Raises:
+        NotImplementedError: for gates after a measurement or reset
+    """
+    measured = {}
+    gates = []
+    for operation, qubits, clbits in _walk(circuit):
+        if operation.name in _IGNORED:
+            continue
+        if operation.name == 'measure':
+            measured[clbits[0]] = qubits[0]
+            continue
+        if operation.name == 'reset' or any(q in measured.values() for q in qubits):
+            raise NotImplementedError(
+                'Only terminal measurements are supported; use the Aer engine')
+        gates.append((_operation_matrix(operation), qubits))
+
+    state = MemmapStatevector(circuit.num_qubits, path=path, chunk_qubits=chunk_qubits)
+    try:
+        state.apply_gates(gates)
+    except BaseException:
+        state.close()
+        raise
+    return state, measured
+
+
+def memmap_counts(circuit, shots=1024, seed=None):
+    """Sample counts like statevector_sim.sample_counts, with the state on disk."""
+    state, measured = simulate_memmap(circuit)
+    with state:
+        return state.sample_counts(
+            shots, qubits=[measured.get(clbit) for clbit in range(circuit.num_clbits)],
+            seed=seed)
+
+
+# ============================================================================
+# Command line demo / benchmark
+# ============================================================================
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description='Simulate the scaling benchmark circuit with the state on disk.')
+    parser.add_argument('--qubits', type=int, default=28, help='number of qubits (default: 28)')
+    parser.add_argument('--dir', default=None,
+                        help=f'directory for the state file (default: ${MEMMAP_DIR_ENV} or temp)')
+    parser.add_argument('--chunk-qubits', type=int, default=CHUNK_QUBITS,
+                        help=f'log2 of amplitudes per chunk (default: {CHUNK_QUBITS})')
+    parser.add_argument('--shots', type=int, default=1000, help='shots to sample (default: 1000)')
+    parser.add_argument('--seed', type=int, default=101, help='sampling seed')
+    parser.add_argument('--keep', action='store_true', help='keep the state file')
+    args = parser.parse_args(argv)
+
+    from statevector_scaling import scaling_circuit
+
+    path = None
+    if args.dir or args.keep:
+        directory = args.dir or os.environ.get(MEMMAP_DIR_ENV) or tempfile.gettempdir()
+        os.makedirs(directory, exist_ok=True)
+        path = os.path.join(directory, f'qc101-state-{args.qubits}q.bin')
+
+    circuit = scaling_circuit(args.qubits)
+    print(f"💽 {args.qubits} qubits: {16 * 2**args.qubits / 2**30:.2f} GiB state, "
+          f"{circuit.size()} gates, chunks of 2^{args.chunk_qubits}")
+    print("=" * 60)
+
+    try:
+        start = time.perf_counter()
+        state, _ = simulate_memmap(circuit, path=path, chunk_qubits=args.chunk_qubits)
+    except RuntimeError as e:
+        print(f"❌ {e}")
+        return 1
+    if args.keep:
+        state.owns_file = False
+    with state:
+        state.flush()
+        print(f"⚙️  Gates applied in {time.perf_counter() - start:.1f}s -> {state.path}")
+
+        start = time.perf_counter()
+        marginal = state.probabilities([0, args.qubits - 1])
+        print(f"📊 P(q0, q{args.qubits - 1}) in {time.perf_counter() - start:.1f}s: "
+              + ', '.join(f'{value:02b}: {prob:.4f}' for value, prob in enumerate(marginal)))
+
+        start = time.perf_counter()
+        counts = state.sample_counts(args.shots, qubits=[0, args.qubits - 1], seed=args.seed)
+        print(f"🎲 {args.shots} shots in {time.perf_counter() - start:.1f}s: "
+              + ', '.join(f'{key}: {counts[key]}' for key in sorted(counts)))
+    print(f"\n🧠 Peak RSS {peak_rss_bytes() / 2**20:.0f} MiB")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,92 @@
+"""
+MkDocs hooks that keep the illustrations current during ``mkdocs build``
+and ``mkdocs serve``.
+
+Enabled in mkdocs.yml:
+
+    hooks:
+      - scripts/mkdocs_hooks.py
+
+MkDocs re-executes hook files whenever it reloads the config, so all
+state lives in docs_illustrations.py; this file only forwards events.
+
+Pages serve each figure's responsive variants (``<picture>`` and
+``srcset``, see image_variants.py).
+
+Requirements:
+- everything in requirements.txt (the hooks render the figures)
+
+Usage:
+    mkdocs build       # renders stale figures, waits for them, then copies files
+    mkdocs serve       # renders in the background; pages reload when figures land
+"""
+
+import os
+import sys
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+if SCRIPT_DIR not in sys.path:
+    sys.path.insert(0, SCRIPT_DIR)
+
+from bloch_interactive import mark_interactive  # noqa: E402
+from docs_illustrations import docs_illustrations  # noqa: E402
+from image_variants import mark_responsive  # noqa: E402
+from publish_illustrations import MANIFEST_NAME, build_manifest, write_manifest  # noqa: E402
+
+_command = None
+
+
+def on_startup(command, dirty):
+    global _command
+    _command = command
+
+
+def _add_files(rel_paths, files, config):
+    from mkdocs.structure.files import File
+
+    for rel_path in rel_paths:
+        if files.get_file_from_path(rel_path) is None:
+            files.append(File(rel_path, config['docs_dir'], config['site_dir'],
+                              config['use_directory_urls']))
+
+
+def on_files(files, config):
+    """Submit stale figures and make sure every referenced figure is a site file."""
+    _add_files(docs_illustrations().refresh(), files, config)
+    return files
+
+
+def on_page_content(html, page, config, files):
+    illustrations = docs_illustrations()
+    if _command != 'serve':
+        # Pages list the variants on disk; a build marks them once rendered
+        illustrations.wait()
+    outputs = illustrations.interactive_outputs
+    html = mark_responsive(html, page.url, config['docs_dir'], plain=outputs)
+    # Interactive figures load their 3D scene in place of the image
+    return mark_interactive(html, page.url, outputs) if outputs else html
+
+
+def on_env(env, config, files):
+    # Static files are copied right after this event
+    if _command != 'serve':
+        docs_illustrations().wait()
+        # Variants rendered during this build
+        _add_files(docs_illustrations().site_paths(), files, config)
+    return env
+
+
+def on_post_build(config):
+    if _command != 'serve':
+        # The site ships the hashes of the images it serves
+        write_manifest(build_manifest(), os.path.join(config['site_dir'], MANIFEST_NAME))
+
+
+def on_serve(server, config, builder):
+    # Rebuild when a generator or helper script changes
+    server.watch(SCRIPT_DIR)
+    return server
+
+
+def on_shutdown():
+    docs_illustrations().close()
@@ -0,0 +1,184 @@
+#!/usr/bin/env python3
+"""
+Content-hash manifest of the site's illustrations, and a local stand-in
+for the deploy step that only transfers files whose hash changed.
+
+``docs/illustrations-manifest.json`` lists every image in a docs
+``illustrations/`` directory (masters and their variants), the
+interactive scenes next to them and the scenes' shared geometry in
+``docs/assets/bloch/`` (see bloch_interactive.py), each with its SHA-256
+and size, keyed by its path relative to docs/, which is also its path
+on the site. The build rewrites it after rendering. Because figures
+are saved byte-reproducibly (see figure_output.py), an image's hash only
+changes when its pixels do. ``mkdocs build`` writes the manifest into
+the site directory once the images are in place (see mkdocs_hooks.py),
+so a deployed site carries the manifest of what it serves. The copy in
+docs/ is a build output and is not committed.
+
+``publish`` compares the current manifest with the one at the
+destination and copies only new or changed files. It deletes files
+that are gone, then writes the manifest last, so an interrupted publish
+is simply run again. A real deploy step (rsync, an object-store sync, ...)
+can use ``diff_manifests`` against the live site's manifest the same way.
+
+Usage:
+    python scripts/publish_illustrations.py --manifest-only
+    python scripts/publish_illustrations.py --dest /srv/qc101-site
+    python scripts/publish_illustrations.py --dest /srv/qc101-site --dry-run
+"""
+
+import argparse
+import json
+import os
+import shutil
+import sys
+
+from illustration_cache import file_digest
+from illustration_registry import SCENE_SUFFIX
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.dirname(SCRIPT_DIR)
+DOCS_DIR = os.path.join(PROJECT_ROOT, 'docs')
+
+MANIFEST_NAME = 'illustrations-manifest.json'
+MANIFEST_PATH = os.path.join(DOCS_DIR, MANIFEST_NAME)
+MANIFEST_VERSION = 1
+
+IMAGE_EXTENSIONS = ('.png', '.webp', '.gif', '.svg')
+PUBLISHED_SUFFIXES = IMAGE_EXTENSIONS + (SCENE_SUFFIX,)
+
+# Directories (relative to docs/) published whole: the interactive scenes' geometry
+ASSET_DIRS = [os.path.join('assets', 'bloch')]
+
+
+# ============================================================================
+# Manifest
+# ============================================================================
+
+def published_paths(docs_dir=DOCS_DIR):
+    """
+    Paths (relative to ``docs_dir``) of every published illustration file.
+
+    That is each image and interactive scene in an ``illustrations/``
+    directory, plus everything in ``ASSET_DIRS``.
+    """
+    paths = []
+    for root, dirs, files in os.walk(docs_dir):
+        dirs[:] = sorted(name for name in dirs if not name.startswith('.'))
+        rel_root = os.path.relpath(root, docs_dir)
+        if any(rel_root == d or rel_root.startswith(d + os.sep) for d in ASSET_DIRS):
+            paths += [os.path.join(rel_root, name) for name in sorted(files)]
+        elif 'illustrations' in rel_root.split(os.sep):
+            paths += [os.path.join(rel_root, name) for name in sorted(files)
+                      if name.lower().endswith(PUBLISHED_SUFFIXES)]
+    return [path.replace(os.sep, '/') for path in paths]
+
+
+def build_manifest(docs_dir=DOCS_DIR):
+    """Map each published file's site path to its SHA-256 and size in bytes."""
+    manifest = {}
+    for rel_path in published_paths(docs_dir):
+        path = os.path.join(docs_dir, rel_path)
+        manifest[rel_path] = {'sha256': file_digest(path), 'bytes': os.path.getsize(path)}
+    return manifest
+
+
+def load_manifest(path=MANIFEST_PATH):
+    """The ``files`` of a saved manifest, or an empty dict if there is none."""
+    if not os.path.exists(path):
+        return {}
+    with open(path, encoding='utf-8') as f:
+        data = json.load(f)
+    return data.get('files', {}) if data.get('version') == MANIFEST_VERSION else {}
+
+
+def write_manifest(manifest, path=MANIFEST_PATH):
+    """Write a manifest atomically; returns False if it was already up to date."""
+    if os.path.exists(path) and load_manifest(path) == manifest:
+        return False
+    tmp_path = f'{path}.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump({'version': MANIFEST_VERSION, 'files': manifest}, f, indent=2, sort_keys=True)
+        f.write('\n')
+    os.replace(tmp_path, path)
+    return True
+
+
+def diff_manifests(current, published):
+    """
+    Compare two manifests.
+
+    Returns:
+        (changed, removed): site paths that are new or whose hash differs,
+        and site paths that are no longer in ``current``
+    """
+    changed = sorted(path for path, entry in current.items()
+                     if published.get(path, {}).get('sha256') != entry['sha256'])
+    removed = sorted(set(published) - set(current))
+    return changed, removed
+
+
+# ============================================================================
+# Publish stand-in
+# ============================================================================
+
+def publish(dest, docs_dir=DOCS_DIR, dry_run=False):
+    """
+    Copy changed illustrations into ``dest`` (a site root) and update its manifest.
+
+    Returns:
+        (changed, removed, bytes transferred)
+    """
+    current = build_manifest(docs_dir)
+    dest_manifest = os.path.join(dest, MANIFEST_NAME)
+    changed, removed = diff_manifests(current, load_manifest(dest_manifest))
+    transferred = sum(current[path]['bytes'] for path in changed)
+    if dry_run:
+        return changed, removed, transferred
+
+    for rel_path in changed:
+        target = os.path.join(dest, rel_path)
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        shutil.copyfile(os.path.join(docs_dir, rel_path), target)
+    for rel_path in removed:
+        target = os.path.join(dest, rel_path)
+        if os.path.exists(target):
+            os.remove(target)
+    os.makedirs(dest, exist_ok=True)
+    write_manifest(current, dest_manifest)
+    return changed, removed, transferred
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description='Write the illustrations manifest and publish changed files.')
+    parser.add_argument('--dest', help='site directory to publish into')
+    parser.add_argument('--dry-run', action='store_true',
+                        help='report what would be transferred without copying')
+    parser.add_argument('--manifest-only', action='store_true',
+                        help=f'only rewrite docs/{MANIFEST_NAME}')
+    args = parser.parse_args(argv)
+
+    manifest = build_manifest()
+    updated = write_manifest(manifest)
+    total = sum(entry['bytes'] for entry in manifest.values())
+    print(f"🧾 {len(manifest)} file(s), {total / 2**20:.1f} MB "
+          f"({'updated' if updated else 'unchanged'}: docs/{MANIFEST_NAME})")
+    if args.manifest_only:
+        return 0
+    if not args.dest:
+        parser.error('--dest is required unless --manifest-only is given')
+
+    changed, removed, transferred = publish(args.dest, dry_run=args.dry_run)
+    verb = 'Would transfer' if args.dry_run else 'Transferred'
+    for rel_path in changed:
+        print(f"   ⬆️  {rel_path}")
+    for rel_path in removed:
+        print(f"   🗑️  {rel_path}")
+    print(f"🚀 {verb} {len(changed)} of {len(manifest)} file(s), "
+          f"{transferred / 2**20:.1f} of {total / 2**20:.1f} MB; {len(removed)} removed")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
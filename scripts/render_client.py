@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Thin client for the render server (see render_server.py).
+
+Sends a render request over the server's Unix socket and prints results
+as each figure finishes. It imports nothing heavier than the standard
+library, so it starts instantly; replace
+
+    python scripts/generate_qubit_visualizations.py
+
+with
+
+    python scripts/render_client.py generate_qubit_visualizations
+
+while a server is running.
+
+Usage:
+    python scripts/render_client.py                       # every figure
+    python scripts/render_client.py generate_phase1_illustrations
+    python scripts/render_client.py --only bloch_sphere_annotated --only multi_qubit_growth
+    python scripts/render_client.py --status
+    python scripts/render_client.py --stop
+"""
+
+import argparse
+import json
+import socket
+import sys
+
+from render_server import socket_path
+
+
+def request(message, path=None):
+    """
+    Send one request to the server and yield its reply messages.
+
+    Raises:
+        ConnectionError: If no server is listening.
+    """
+    path = path or socket_path()
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as connection:
+        try:
+            connection.connect(path)
+        except (FileNotFoundError, ConnectionRefusedError) as e:
+            raise ConnectionError(f'No render server on {path}') from e
+        connection.sendall(json.dumps(message).encode('utf-8') + b'\n')
+        with connection.makefile('rb') as replies:
+            for line in replies:
+                reply = json.loads(line)
+                yield reply
+                if reply.get('done'):
+                    return
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Render figures on a running render server.')
+    parser.add_argument('scripts', nargs='*', metavar='SCRIPT',
+                        help='generator scripts to render, e.g. generate_qubit_visualizations '
+                             '(default: all)')
+    parser.add_argument('--only', action='append', metavar='FIGURE',
+                        help='render only this figure (repeatable)')
+    parser.add_argument('--socket', default=None, help='server socket path')
+    parser.add_argument('--status', action='store_true', help='show server status')
+    parser.add_argument('--stop', action='store_true', help='stop the server')
+    parser.add_argument('-v', '--verbose', action='store_true',
+                        help="show each generator's own output")
+    args = parser.parse_args(argv)
+
+    if args.stop:
+        message = {'command': 'stop'}
+    elif args.status:
+        message = {'command': 'status'}
+    else:
+        scripts = [name[:-3] if name.endswith('.py') else name for name in args.scripts]
+        message = {'command': 'render', 'scripts': [name.split('/')[-1] for name in scripts],
+                   'only': args.only}
+
+    failed = []
+    try:
+        for reply in request(message, args.socket):
+            if reply.get('error'):
+                print(f"❌ {reply['error']}")
+                return 1
+            if 'reloaded' in reply:
+                print(f"♻️  Reloaded: {', '.join(reply['reloaded'])}")
+            elif 'figure' in reply:
+                status = '✅' if reply['ok'] else '❌'
+                print(f"{status} {reply['figure']:<40} {reply['seconds']:6.2f}s  {reply['path']}")
+                if args.verbose and reply['output'].strip():
+                    print(reply['output'].rstrip())
+                if not reply['ok']:
+                    print(reply['error'].rstrip())
+                    failed.append(reply['figure'])
+            elif 'pid' in reply:
+                print(f"🔥 Server pid {reply['pid']}, up {reply['uptime']:.0f}s, "
+                      f"{reply['renders']} render(s)")
+                print(f"     loaded: {', '.join(reply['loaded'])}")
+    except ConnectionError as e:
+        print(f"❌ {e}. Start one with: python scripts/render_server.py &")
+        return 2
+
+    if args.stop:
+        print("👋 Server stopping")
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,272 @@
+#!/usr/bin/env python3
+"""
+Long-lived render server for writing sessions.
+
+Starting Python, importing Qiskit and Aer, loading matplotlib's font cache
+and applying the seaborn style costs more than rendering most figures.
+This server pays for all of that once, then renders figures on request
+over a Unix socket, so rerunning a figure costs only its render time.
+
+Generator scripts and the helper modules they use (bloch_sphere,
+statevector_sim, ...) are hot-reloaded: before each request the server
+checks scripts/*.py for changes. An edited generator script is
+re-imported on its own. When a helper changed, every module in scripts/
+is re-imported, build_illustrations.py included, because modules that
+import a helper keep its old functions and state otherwise; third-party
+libraries stay loaded. Changes to this file and render_client.py need a
+restart.
+
+Requests are handled one at a time: rendering captures stdout and
+reloading swaps modules, both process-wide. The figures themselves are
+built without pyplot and can be rendered from threads (see figure_api.py).
+Use render_client.py to talk to the server.
+
+Requirements:
+- matplotlib
+- numpy
+- qiskit (preloaded when installed)
+- qiskit-aer (preloaded when installed)
+
+Usage:
+    python scripts/render_server.py &
+    python scripts/render_client.py generate_qubit_visualizations
+    python scripts/render_client.py --only bloch_sphere_basic
+    python scripts/render_client.py --stop
+"""
+
+import argparse
+import contextlib
+import glob
+import io
+import importlib
+import json
+import os
+import socket
+import socketserver
+import sys
+import tempfile
+import threading
+import time
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.dirname(SCRIPT_DIR)
+
+SOCKET_ENV = 'QC101_RENDER_SOCKET'
+
+# Imported once at startup; missing optional ones are skipped
+PRELOAD_MODULES = [
+    'numpy',
+    'matplotlib.figure',
+    'matplotlib.backends.backend_agg',
+    'matplotlib.font_manager',
+    'mpl_toolkits.mplot3d',
+    'PIL.Image',
+    'qiskit',
+    'qiskit.visualization',
+    'qiskit_aer',
+]
+
+# Modules the server itself runs on; editing them needs a restart
+SERVER_MODULES = {'render_server', 'render_client'}
+
+
+def socket_path():
+    """Socket the server listens on (``QC101_RENDER_SOCKET`` or a per-user temp file)."""
+    default = os.path.join(tempfile.gettempdir(), f'qc101-render-{os.getuid()}.sock')
+    return os.environ.get(SOCKET_ENV, default)
+
+
+# ============================================================================
+# Warm renderer
+# ============================================================================
+
+class WarmRenderer:
+    """Keeps libraries and generator scripts imported and reloads edited scripts."""
+
+    def __init__(self):
+        import build_illustrations
+
+        self.build = build_illustrations
+        self.started = time.time()
+        self.renders = 0
+        self.mtimes = self._script_mtimes()
+
+    @staticmethod
+    def _script_mtimes():
+        return {os.path.splitext(os.path.basename(path))[0]: os.path.getmtime(path)
+                for path in glob.glob(os.path.join(SCRIPT_DIR, '*.py'))}
+
+    def preload(self):
+        """Import the heavy libraries and every generator script; returns {name: ms}."""
+        from illustration_registry import GENERATOR_SCRIPTS
+
+        timings = {}
+        for name in PRELOAD_MODULES:
+            start = time.perf_counter()
+            try:
+                importlib.import_module(name)
+            except ImportError:
+                continue
+            timings[name] = (time.perf_counter() - start) * 1000
+        for module_name in GENERATOR_SCRIPTS:
+            start = time.perf_counter()
+            self._load(module_name)
+            timings[module_name] = (time.perf_counter() - start) * 1000
+        return timings
+
+    def _load(self, module_name):
+        with contextlib.redirect_stdout(io.StringIO()):
+            self.build._load_module(module_name)
+
+    def reload_changed(self):
+        """
+        Forget scripts edited since the last check so the next render re-imports them.
+
+        Returns:
+            Names of the modules that were dropped.
+        """
+        from illustration_registry import GENERATOR_SCRIPTS
+
+        mtimes = self._script_mtimes()
+        changed = {name for name, mtime in mtimes.items() if self.mtimes.get(name) != mtime}
+        self.mtimes = mtimes
+        changed -= SERVER_MODULES
+        if not changed:
+            return []
+
+        dropped = set(changed)
+        if changed - set(GENERATOR_SCRIPTS):
+            # A helper changed: whatever imported it holds its old objects
+            dropped = set(mtimes) - SERVER_MODULES
+        for name in dropped:
+            sys.modules.pop(name, None)
+            self.build._loaded_modules.pop(name, None)
+        if 'build_illustrations' in dropped:
+            self.build = importlib.import_module('build_illustrations')
+        return sorted(dropped)
+
+    def select(self, request):
+        """Figures a request asks for: by script, by figure name, or all."""
+        registry = importlib.import_module('illustration_registry')
+        specs = registry.discover_figures()
+        scripts = request.get('scripts')
+        if scripts:
+            unknown = set(scripts) - {spec.module for spec in specs}
+            if unknown:
+                raise ValueError(f"Unknown script(s): {', '.join(sorted(unknown))}")
+            specs = [spec for spec in specs if spec.module in scripts]
+        only = request.get('only')
+        if only:
+            wanted = {name if name.startswith('generate_') else f'generate_{name}'
+                      for name in only}
+            unknown = wanted - {spec.name for spec in specs}
+            if unknown:
+                raise ValueError(f"Unknown figure(s): {', '.join(sorted(unknown))}")
+            specs = [spec for spec in specs if spec.name in wanted]
+        return specs
+
+    def render(self, request):
+        """Render the requested figures, yielding one result dict per figure."""
+        reloaded = self.reload_changed()
+        if reloaded:
+            yield {'reloaded': reloaded}
+        for spec in self.select(request):
+            result = self.build.render_figure(
+                spec.module, spec.name, os.path.join(PROJECT_ROOT, spec.output_path),
+                interactive=spec.interactive)
+            self.renders += 1
+            result['path'] = spec.output_path
+            yield result
+
+    def status(self):
+        return {
+            'pid': os.getpid(),
+            'uptime': time.time() - self.started,
+            'renders': self.renders,
+            'loaded': sorted(self.build._loaded_modules),
+        }
+
+
+# ============================================================================
+# Socket server
+# ============================================================================
+
+class RenderHandler(socketserver.StreamRequestHandler):
+    """One JSON request line in, JSON result lines out, then a final ``done`` line."""
+
+    def handle(self):
+        renderer = self.server.renderer
+        try:
+            request = json.loads(self.rfile.readline())
+            command = request.get('command', 'render')
+            if command == 'render':
+                for result in renderer.render(request):
+                    self._send(result)
+            elif command == 'status':
+                self._send(renderer.status())
+            elif command == 'stop':
+                # shutdown() waits for serve_forever, which runs this handler
+                threading.Thread(target=self.server.shutdown).start()
+            else:
+                raise ValueError(f'Unknown command: {command}')
+            self._send({'done': True})
+        except Exception as e:
+            self._send({'done': True, 'error': f'{type(e).__name__}: {e}'})
+
+    def _send(self, message):
+        self.wfile.write(json.dumps(message, default=str).encode('utf-8') + b'\n')
+        self.wfile.flush()
+
+
+class RenderServer(socketserver.UnixStreamServer):
+    """Single-threaded Unix socket server around a ``WarmRenderer``."""
+
+    def __init__(self, path, renderer):
+        self.renderer = renderer
+        super().__init__(path, RenderHandler)
+
+
+def _remove_stale_socket(path):
+    """Delete a socket file left by a server that is no longer running."""
+    if not os.path.exists(path):
+        return
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as probe:
+        try:
+            probe.connect(path)
+        except OSError:
+            os.unlink(path)
+            return
+    raise SystemExit(f"❌ A render server is already listening on {path}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Keep figures warm and render them on request.')
+    parser.add_argument('--socket', default=socket_path(),
+                        help=f'Unix socket path (default: ${SOCKET_ENV} or a temp file)')
+    args = parser.parse_args(argv)
+
+    os.environ.setdefault('MPLBACKEND', 'Agg')
+    if SCRIPT_DIR not in sys.path:
+        sys.path.insert(0, SCRIPT_DIR)
+    os.chdir(PROJECT_ROOT)
+
+    _remove_stale_socket(args.socket)
+    renderer = WarmRenderer()
+    print("🔥 Preloading libraries and generator scripts...")
+    for name, ms in renderer.preload().items():
+        print(f"     {name:<38} {ms:8.1f} ms")
+
+    with RenderServer(args.socket, renderer) as server:
+        print(f"✅ Render server listening on {args.socket} (pid {os.getpid()})")
+        try:
+            server.serve_forever(poll_interval=0.2)
+        except KeyboardInterrupt:
+            pass
+        finally:
+            os.unlink(args.socket)
+    print("👋 Render server stopped")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,432 @@
+#!/usr/bin/env python3
+"""
+Persistent on-disk cache for simulation results.
+
+Figures sample their circuits with a fixed seed, so the counts for a
+given circuit, engine, shot count and seed never change between builds.
+``run_counts`` (and ``statevector``) in statevector_sim.py look results up
+here before simulating and store what they compute, so a rebuild, another
+worker or a sweep that revisits a point never simulates it twice. A hit
+also skips importing the engine's framework.
+
+A result's key is a SHA-256 over:
+- the circuit in canonical form: qubit and clbit counts plus every
+  instruction's name, parameters and bit indices, in order (register
+  names and labels do not matter)
+- what was computed: counts with their engine, shots and seed, or the
+  statevector
+- the installed numpy, qiskit and engine package versions, and the
+  source of this project's simulator modules
+
+Entries are compressed NPZ files in ``.simulation-cache/`` at the project
+root (``QC101_SIM_CACHE_DIR`` to move it): counts as integer outcome and
+count arrays, statevectors as complex128. Each is written to a temporary
+file and renamed into place, so readers never see a partial entry, and
+the computation of a key is serialised across processes with a file lock,
+so parallel render workers wait for each other's result instead of
+repeating it. A hit refreshes the entry's mtime; when the cache outgrows
+its limit (``QC101_SIM_CACHE_MB``, default 256) the least recently used
+entries are removed. ``QC101_SIM_CACHE=0`` turns the cache off.
+
+Unseeded runs (``seed=None``) and engines that cannot be seeded are never
+cached, since their results are meant to differ.
+
+Usage:
+    python scripts/simulation_cache.py            # entries and size
+    python scripts/simulation_cache.py --evict    # enforce the size limit now
+    python scripts/simulation_cache.py --clear
+"""
+
+import argparse
+import contextlib
+import functools
+import hashlib
+import json
+import os
+import sys
+import tempfile
+import zipfile
+from importlib import metadata
+
+import numpy as np
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.dirname(SCRIPT_DIR)
+
+CACHE_ENV = 'QC101_SIM_CACHE'
+CACHE_DIR_ENV = 'QC101_SIM_CACHE_DIR'
+CACHE_SIZE_ENV = 'QC101_SIM_CACHE_MB'
+
+DEFAULT_CACHE_DIR = os.path.join(PROJECT_ROOT, '.simulation-cache')
+DEFAULT_CACHE_MB = 256
+CACHE_VERSION = 1
+
+# Eviction trims the cache to this share of its limit, so it does not run
+# again on the very next write
+EVICT_TO = 0.9
+
+# A single result larger than this share of the limit is not stored
+MAX_ENTRY_SHARE = 0.25
+
+# Lock files; keys share one of 256 locks by their first two hex digits
+LOCK_DIR = 'locks'
+
+ENTRY_SUFFIX = '.npz'
+
+# Engine -> installed package whose version is part of its keys
+ENGINE_PACKAGES = {
+    'numpy': 'numpy',
+    'memmap': 'numpy',
+    'aer': 'qiskit-aer',
+    'cirq': 'cirq-core',
+    'pennylane': 'pennylane',
+    'braket': 'amazon-braket-sdk',
+}
+
+# Engine -> this project's modules that implement it
+ENGINE_SOURCES = {
+    'numpy': ('statevector_sim',),
+    'memmap': ('statevector_sim', 'memmap_statevector'),
+    'aer': ('statevector_sim',),
+    'cirq': ('statevector_sim', 'simulator_backends'),
+    'pennylane': ('statevector_sim', 'simulator_backends'),
+    'braket': ('statevector_sim', 'simulator_backends'),
+}
+
+# Engines that ignore the seed, so their results are never reused
+UNSEEDED_ENGINES = {'braket'}
+
+
+# ============================================================================
+# Keys
+# ============================================================================
+
+def _canonical_param(param):
+    if isinstance(param, np.ndarray):
+        return {'array': hashlib.sha256(np.ascontiguousarray(param).tobytes()).hexdigest(),
+                'shape': list(param.shape), 'dtype': str(param.dtype)}
+    try:
+        return repr(complex(param)) if isinstance(param, complex) else repr(float(param))
+    except (TypeError, ValueError):
+        return str(param)
+
+
+def circuit_fingerprint(circuit):
+    """
+    SHA-256 of a circuit's canonical form.
+
+    Two circuits with the same instructions on the same bit indices and
+    the same global phase have the same fingerprint whatever their
+    registers, names or labels.
+    """
+    from statevector_sim import _walk
+
+    instructions = [[operation.name, [_canonical_param(p) for p in operation.params],
+                     qubits, clbits]
+                    for operation, qubits, clbits in _walk(circuit)]
+    payload = json.dumps([circuit.num_qubits, circuit.num_clbits,
+                          _canonical_param(circuit.global_phase), instructions],
+                         separators=(',', ':'))
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+@functools.lru_cache(maxsize=None)
+def _package_version(name):
+    try:
+        return metadata.version(name)
+    except metadata.PackageNotFoundError:
+        return None
+
+
+@functools.lru_cache(maxsize=None)
+def _source_digest(modules):
+    digest = hashlib.sha256()
+    for module in modules:
+        with open(os.path.join(SCRIPT_DIR, f'{module}.py'), 'rb') as f:
+            digest.update(f.read())
+    return digest.hexdigest()
+
+
+def result_key(circuit, kind, engine='numpy', **params):
+    """
+    Cache key of one simulation result.
+
+    Args:
+        circuit: The simulated QuantumCircuit
+        kind: What was computed, e.g. 'counts' or 'statevector'
+        engine: Engine name (see statevector_sim.ENGINES)
+        **params: Everything else the result depends on (shots, seed, ...)
+
+    Returns:
+        Hex SHA-256 digest
+    """
+    payload = json.dumps({
+        'version': CACHE_VERSION,
+        'circuit': circuit_fingerprint(circuit),
+        'kind': kind,
+        'engine': engine,
+        'params': params,
+        'packages': {name: _package_version(name)
+                     for name in ('numpy', 'qiskit', ENGINE_PACKAGES.get(engine, engine))},
+        'source': _source_digest(ENGINE_SOURCES.get(engine, ('statevector_sim',))),
+    }, sort_keys=True)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+# ============================================================================
+# Store
+# ============================================================================
+
+def scan_entries(directory, suffix):
+    """(mtime, size, path) of every file in ``directory`` ending in ``suffix``."""
+    entries = []
+    try:
+        scan = os.scandir(directory)
+    except FileNotFoundError:
+        return entries
+    with scan:
+        for item in scan:
+            if not item.name.endswith(suffix):
+                continue
+            with contextlib.suppress(FileNotFoundError):
+                stat = item.stat()
+                entries.append((stat.st_mtime, stat.st_size, item.path))
+    return entries
+
+
+def evict_least_recent(entries, max_bytes):
+    """
+    Remove the oldest entries until the rest fit in ``EVICT_TO`` of ``max_bytes``.
+
+    Args:
+        entries: (mtime, size, path) of every entry, as from ``scan_entries``
+        max_bytes: Size limit of the cache
+
+    Returns:
+        Number of entries removed
+    """
+    entries = sorted(entries)
+    total = sum(size for _, size, _ in entries)
+    removed = 0
+    for _, size, path in entries:
+        if total <= max_bytes * EVICT_TO:
+            break
+        with contextlib.suppress(FileNotFoundError):
+            os.remove(path)
+            removed += 1
+        total -= size
+    return removed
+
+
+try:
+    import fcntl
+except ImportError:  # Windows: no cross-process locking, duplicates are just wasted work
+    fcntl = None
+
+
+class SimulationCache:
+    """
+    Size-bounded directory of NPZ results, safe to share between processes.
+
+    Args:
+        directory: Cache directory (created on first write)
+        max_bytes: Size limit; least recently used entries go first
+    """
+
+    def __init__(self, directory=DEFAULT_CACHE_DIR, max_bytes=DEFAULT_CACHE_MB * 1024 * 1024):
+        self.directory = directory
+        self.max_bytes = max_bytes
+
+    def path(self, key):
+        return os.path.join(self.directory, key + ENTRY_SUFFIX)
+
+    def get(self, key):
+        """
+        The arrays stored under ``key``, or None.
+
+        A hit marks the entry as recently used. Unreadable entries (from a
+        crash or a full disk) are removed and reported as misses.
+        """
+        path = self.path(key)
+        try:
+            with np.load(path, allow_pickle=False) as entry:
+                arrays = {name: entry[name] for name in entry.files}
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError, EOFError, zipfile.BadZipFile):
+            with contextlib.suppress(FileNotFoundError):
+                os.remove(path)
+            return None
+        with contextlib.suppress(FileNotFoundError):
+            os.utime(path)
+        return arrays
+
+    def put(self, key, **arrays):
+        """
+        Store arrays under ``key``, atomically; evicts if over the limit.
+
+        Returns:
+            True if stored, False if the result is too large to cache
+        """
+        if sum(np.asarray(a).nbytes for a in arrays.values()) > self.max_bytes * MAX_ENTRY_SHARE:
+            return False
+        os.makedirs(self.directory, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(suffix='.tmp', dir=self.directory)
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                np.savez_compressed(f, **arrays)
+            os.replace(tmp, self.path(key))
+        except BaseException:
+            with contextlib.suppress(FileNotFoundError):
+                os.remove(tmp)
+            raise
+        if self.size() > self.max_bytes:
+            self.evict()
+        return True
+
+    @contextlib.contextmanager
+    def lock(self, key):
+        """Hold the (striped) cross-process lock for ``key``."""
+        if fcntl is None:
+            yield
+            return
+        directory = os.path.join(self.directory, LOCK_DIR)
+        os.makedirs(directory, exist_ok=True)
+        with open(os.path.join(directory, key[:2] + '.lock'), 'a') as f:
+            fcntl.flock(f, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(f, fcntl.LOCK_UN)
+
+    def get_or_compute(self, key, compute):
+        """
+        The entry for ``key``, computing and storing it on a miss.
+
+        Processes that miss on the same key at once compute it only once:
+        the others wait for the lock and then read the stored result.
+
+        Args:
+            key: From ``result_key``
+            compute: Callable returning a dict of arrays
+        """
+        arrays = self.get(key)
+        if arrays is not None:
+            return arrays
+        with self.lock(key):
+            arrays = self.get(key)
+            if arrays is None:
+                arrays = compute()
+                self.put(key, **arrays)
+        return arrays
+
+    def _entries(self):
+        """(mtime, size, path) of every entry."""
+        return scan_entries(self.directory, ENTRY_SUFFIX)
+
+    def size(self):
+        """Total bytes of all entries."""
+        return sum(size for _, size, _ in self._entries())
+
+    def evict(self):
+        """
+        Remove least recently used entries until the cache is under ``EVICT_TO`` of its limit.
+
+        Returns:
+            Number of entries removed
+        """
+        return evict_least_recent(self._entries(), self.max_bytes)
+
+    def clear(self):
+        """Remove every entry. Returns the number removed."""
+        removed = 0
+        for _, _, path in self._entries():
+            with contextlib.suppress(FileNotFoundError):
+                os.remove(path)
+                removed += 1
+        return removed
+
+
+def default_cache():
+    """The cache configured by the environment, or None when it is turned off."""
+    if os.environ.get(CACHE_ENV, '1') == '0':
+        return None
+    megabytes = float(os.environ.get(CACHE_SIZE_ENV, DEFAULT_CACHE_MB))
+    return SimulationCache(os.environ.get(CACHE_DIR_ENV, DEFAULT_CACHE_DIR),
+                           int(megabytes * 1024 * 1024))
+
+
+# ============================================================================
+# Cached results
+# ============================================================================
+
+def cached_counts(run, circuit, shots, seed, engine):
+    """
+    Counts from ``run(circuit, shots, seed)``, through the cache when possible.
+
+    Args:
+        run: The engine's counts function
+        circuit: QuantumCircuit with measurements
+        shots: Number of shots
+        seed: Sampling seed; None bypasses the cache
+        engine: Engine name, part of the key
+
+    Returns:
+        Dict of bitstring counts, in the order the engine returned them
+    """
+    cache = default_cache()
+    if cache is None or seed is None or engine in UNSEEDED_ENGINES:
+        return run(circuit, shots, seed)
+
+    def compute():
+        counts = run(circuit, shots, seed)
+        return {'outcomes': np.array([int(bits, 2) for bits in counts], dtype=np.int64),
+                'counts': np.array(list(counts.values()), dtype=np.int64),
+                'width': np.array(len(next(iter(counts), '')))}
+
+    arrays = cache.get_or_compute(
+        result_key(circuit, 'counts', engine, shots=shots, seed=seed), compute)
+    width = int(arrays['width'])
+    return {format(int(outcome), f'0{width}b'): int(count)
+            for outcome, count in zip(arrays['outcomes'], arrays['counts'])}
+
+
+def cached_statevector(simulate, circuit):
+    """
+    ``simulate(circuit)`` (a flat statevector), through the cache when it is on.
+
+    States too large for the cache's entry limit are computed every time.
+    """
+    cache = default_cache()
+    if cache is None:
+        return simulate(circuit)
+    arrays = cache.get_or_compute(
+        result_key(circuit, 'statevector'),
+        lambda: {'statevector': np.asarray(simulate(circuit), dtype=complex)})
+    return arrays['statevector']
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Inspect or trim the simulation results cache.')
+    parser.add_argument('--evict', action='store_true', help='enforce the size limit now')
+    parser.add_argument('--clear', action='store_true', help='remove every entry')
+    args = parser.parse_args(argv)
+
+    cache = default_cache()
+    if cache is None:
+        print(f"⚠️  The simulation cache is turned off ({CACHE_ENV}=0)")
+        return 0
+    if args.clear:
+        print(f"🧹 Removed {cache.clear()} entries from {cache.directory}")
+    elif args.evict:
+        print(f"🧹 Evicted {cache.evict()} least recently used entries")
+    entries = cache._entries()
+    print(f"📦 {len(entries)} entries, {sum(size for _, size, _ in entries) / 1024:.1f} KB "
+          f"of {cache.max_bytes / 2**20:.0f} MB in {cache.directory}")
+    return 0
+
+
+if __name__ == '__main__':
+    if SCRIPT_DIR not in sys.path:
+        sys.path.insert(0, SCRIPT_DIR)
+    sys.exit(main())
@@ -0,0 +1,367 @@
+"""
+Run the teaching circuits on any of the local simulators.
+
+The course shows the same few circuits in Qiskit, Cirq, PennyLane and
+Amazon Braket. This module keeps one definition of each circuit, as a
+Qiskit ``QuantumCircuit`` (``TEACHING_CIRCUITS``), and translates it gate
+by gate for the other frameworks' local simulators:
+
+- cirq:      ``cirq.Simulator``
+- pennylane: PennyLane's ``default.qubit`` device
+- braket:    the Braket SDK's ``LocalSimulator`` (state vector)
+
+Gates without a direct equivalent are passed as their unitary matrix.
+Every backend returns Qiskit-style counts (clbit ``num_clbits - 1``
+first), so the figures and the benchmark do not care which one ran. As in
+statevector_sim.py, only terminal measurements are supported. None of the
+simulators needs network access or credentials.
+
+The backends are registered as engines in statevector_sim.py, next to the
+NumPy, Aer and memmap engines, so a build can use any of them
+(``--engine cirq`` on build_illustrations.py, or ``QC101_SIM_ENGINE``).
+benchmark_simulators.py compares their throughput. The Braket local
+simulator cannot be seeded, so its histograms change from run to run.
+
+Requirements:
+- numpy
+- qiskit
+- cirq, pennylane, amazon-braket-sdk (each only for its own backend)
+
+Usage:
+    from simulator_backends import TEACHING_CIRCUITS
+    from statevector_sim import run_counts
+
+    run_counts(TEACHING_CIRCUITS['bell'](), shots=1000, engine='cirq')
+"""
+
+import importlib.util
+
+import numpy as np
+
+from statevector_sim import _IGNORED, _operation_matrix, _walk
+
+# Engine name -> module that must be importable for it
+BACKEND_MODULES = {
+    'numpy': 'numpy',
+    'aer': 'qiskit_aer',
+    'memmap': 'numpy',
+    'cirq': 'cirq',
+    'pennylane': 'pennylane',
+    'braket': 'braket.devices',
+}
+
+
+def available_backends(names=BACKEND_MODULES):
+    """The engines among ``names`` whose framework is installed."""
+    available = []
+    for name in names:
+        try:
+            found = importlib.util.find_spec(BACKEND_MODULES[name]) is not None
+        except ModuleNotFoundError:
+            # The parent package of a dotted module is missing
+            found = False
+        if found:
+            available.append(name)
+    return available
+
+
+# ============================================================================
+# Teaching circuits
+# ============================================================================
+
+def superposition_circuit():
+    """|0⟩ → H → measure: a fair coin."""
+    from qiskit import QuantumCircuit
+
+    qc = QuantumCircuit(1, 1)
+    qc.h(0)
+    qc.measure(0, 0)
+    return qc
+
+
+def bell_circuit(measure=True):
+    """H + CNOT, preparing |Φ⁺⟩ = (|00⟩ + |11⟩)/√2."""
+    from qiskit import QuantumCircuit
+
+    qc = QuantumCircuit(2)
+    qc.h(0)
+    qc.cx(0, 1)
+    if measure:
+        qc.measure_all()
+    return qc
+
+
+def gate_sequence_circuit():
+    """The single-qubit gates of the foundations chapter in one sequence."""
+    from qiskit import QuantumCircuit
+
+    qc = QuantumCircuit(1)
+    qc.h(0)
+    qc.s(0)
+    qc.t(0)
+    qc.h(0)
+    qc.rx(np.pi / 3, 0)
+    qc.ry(np.pi / 5, 0)
+    qc.rz(np.pi / 7, 0)
+    qc.measure_all()
+    return qc
+
+
+def ghz_circuit(num_qubits):
+    """GHZ chain (H then a CNOT ladder) over ``num_qubits``, measured."""
+    from qiskit import QuantumCircuit
+
+    qc = QuantumCircuit(num_qubits)
+    qc.h(0)
+    for qubit in range(num_qubits - 1):
+        qc.cx(qubit, qubit + 1)
+    qc.measure_all()
+    return qc
+
+
+# Name -> factory; 'ghz' takes the qubit count
+TEACHING_CIRCUITS = {
+    'superposition': superposition_circuit,
+    'bell': bell_circuit,
+    'gate-sequence': gate_sequence_circuit,
+    'ghz': ghz_circuit,
+}
+
+
+# ============================================================================
+# Translation
+# ============================================================================
+
+def _program(circuit):
+    """
+    Gates and terminal measurements of a circuit.
+
+    Returns:
+        (gates, measured): ``gates`` lists (operation, qubits) in order,
+        ``measured`` maps clbit index to qubit index
+
+    Raises:
+        NotImplementedError: for gates after a measurement or reset
+    """
+    gates = []
+    measured = {}
+    for operation, qubits, clbits in _walk(circuit):
+        if operation.name in _IGNORED:
+            continue
+        if operation.name == 'measure':
+            measured[clbits[0]] = qubits[0]
+            continue
+        if operation.name == 'reset' or any(q in measured.values() for q in qubits):
+            raise NotImplementedError(
+                'Only terminal measurements are supported; use the Aer engine')
+        gates.append((operation, qubits))
+    return gates, measured
+
+
+def _counts(samples, sampled_qubits, measured, num_clbits):
+    """
+    Qiskit-style counts from per-shot samples.
+
+    Args:
+        samples: Integer array of shape (shots, len(sampled_qubits)); a
+            squeezed array (one shot or one qubit, as older PennyLane
+            returns) is fine
+        sampled_qubits: Qubit index of each sample column
+        measured: clbit index -> qubit index
+        num_clbits: Width of the bitstrings
+    """
+    samples = np.asarray(samples, dtype=np.int64).reshape(-1, len(sampled_qubits))
+    column = {qubit: index for index, qubit in enumerate(sampled_qubits)}
+    outcomes = np.zeros(len(samples), dtype=np.int64)
+    for clbit, qubit in measured.items():
+        outcomes |= samples[:, column[qubit]] << clbit
+    values, counts = np.unique(outcomes, return_counts=True)
+    return {format(value, f'0{num_clbits}b'): int(count) for value, count in zip(values, counts)}
+
+
+def _measured_qubits(measured):
+    return sorted(set(measured.values()))
+
+
+def _no_measurements(circuit, shots):
+    # As the NumPy engine: every shot reads the all-zero bitstring
+    return {format(0, f'0{circuit.num_clbits}b'): shots}
+
+
+# Qiskit gate name -> Cirq gate (qubit arguments keep Qiskit's order)
+def _cirq_gates():
+    import cirq
+
+    return {
+        'id': lambda: cirq.I,
+        'x': lambda: cirq.X,
+        'y': lambda: cirq.Y,
+        'z': lambda: cirq.Z,
+        'h': lambda: cirq.H,
+        's': lambda: cirq.S,
+        'sdg': lambda: cirq.S ** -1,
+        't': lambda: cirq.T,
+        'tdg': lambda: cirq.T ** -1,
+        'rx': cirq.rx,
+        'ry': cirq.ry,
+        'rz': cirq.rz,
+        'cx': lambda: cirq.CNOT,
+        'cz': lambda: cirq.CZ,
+        'swap': lambda: cirq.SWAP,
+    }
+
+
+def to_cirq(circuit):
+    """
+    A Qiskit circuit as a ``cirq.Circuit`` measuring into key 'm'.
+
+    Returns:
+        (cirq circuit, measured) with ``measured`` as for ``_program``
+    """
+    import cirq
+
+    gates, measured = _program(circuit)
+    table = _cirq_gates()
+    qubits = cirq.LineQubit.range(circuit.num_qubits)
+    operations = []
+    for operation, targets in gates:
+        if operation.name in table:
+            gate = table[operation.name](*(float(p) for p in operation.params))
+            operations.append(gate.on(*(qubits[q] for q in targets)))
+        else:
+            # Cirq's matrices put the first qubit most significant, Qiskit's last
+            operations.append(cirq.MatrixGate(_operation_matrix(operation))
+                              .on(*(qubits[q] for q in reversed(targets))))
+    if measured:
+        operations.append(cirq.measure(*(qubits[q] for q in _measured_qubits(measured)),
+                                       key='m'))
+    return cirq.Circuit(operations), measured
+
+
+def cirq_counts(circuit, shots=1024, seed=None):
+    """Sample counts on ``cirq.Simulator``."""
+    import cirq
+
+    program, measured = to_cirq(circuit)
+    if not measured:
+        return _no_measurements(circuit, shots)
+    result = cirq.Simulator(seed=seed).run(program, repetitions=shots)
+    return _counts(result.measurements['m'], _measured_qubits(measured), measured,
+                   circuit.num_clbits)
+
+
+def _pennylane_gates():
+    import pennylane as qml
+
+    return {
+        'id': qml.Identity,
+        'x': qml.PauliX,
+        'y': qml.PauliY,
+        'z': qml.PauliZ,
+        'h': qml.Hadamard,
+        's': qml.S,
+        'sdg': lambda wires: qml.adjoint(qml.S(wires=wires)),
+        't': qml.T,
+        'tdg': lambda wires: qml.adjoint(qml.T(wires=wires)),
+        'sx': qml.SX,
+        'rx': qml.RX,
+        'ry': qml.RY,
+        'rz': qml.RZ,
+        'p': qml.PhaseShift,
+        'cx': qml.CNOT,
+        'cy': qml.CY,
+        'cz': qml.CZ,
+        'swap': qml.SWAP,
+    }
+
+
+def pennylane_counts(circuit, shots=1024, seed=None):
+    """Sample counts on PennyLane's ``default.qubit``."""
+    import pennylane as qml
+
+    gates, measured = _program(circuit)
+    if not measured:
+        return _no_measurements(circuit, shots)
+    table = _pennylane_gates()
+    wires = _measured_qubits(measured)
+    # Shots are set on the QNode; older PennyLane only takes them on the device
+    set_shots = getattr(qml, 'set_shots', None)
+    device = (qml.device('default.qubit', wires=circuit.num_qubits, seed=seed) if set_shots
+              else qml.device('default.qubit', wires=circuit.num_qubits, shots=shots, seed=seed))
+
+    @qml.qnode(device)
+    def run():
+        for operation, targets in gates:
+            params = [float(p) for p in operation.params]
+            if operation.name in table:
+                table[operation.name](*params, wires=targets)
+            else:
+                # PennyLane's matrices put the first wire most significant, Qiskit's last
+                qml.QubitUnitary(_operation_matrix(operation), wires=list(reversed(targets)))
+        return qml.sample(wires=wires)
+
+    if set_shots:
+        run = set_shots(run, shots=shots)
+    return _counts(run(), wires, measured, circuit.num_clbits)
+
+
+# Qiskit gate name -> Braket Circuit method (qubit arguments keep Qiskit's order)
+BRAKET_GATES = {
+    'id': 'i',
+    'x': 'x',
+    'y': 'y',
+    'z': 'z',
+    'h': 'h',
+    's': 's',
+    'sdg': 'si',
+    't': 't',
+    'tdg': 'ti',
+    'sx': 'v',
+    'rx': 'rx',
+    'ry': 'ry',
+    'rz': 'rz',
+    'p': 'phaseshift',
+    'cx': 'cnot',
+    'cy': 'cy',
+    'cz': 'cz',
+    'swap': 'swap',
+}
+
+
+def to_braket(circuit):
+    """
+    A Qiskit circuit as a ``braket.circuits.Circuit``.
+
+    Returns:
+        (braket circuit, measured) with ``measured`` as for ``_program``
+    """
+    from braket.circuits import Circuit
+
+    gates, measured = _program(circuit)
+    program = Circuit()
+    # Braket only simulates qubits that carry a gate; keep idle ones measurable
+    for qubit in range(circuit.num_qubits):
+        program.i(qubit)
+    for operation, targets in gates:
+        params = [float(p) for p in operation.params]
+        if operation.name in BRAKET_GATES:
+            getattr(program, BRAKET_GATES[operation.name])(*targets, *params)
+        else:
+            # Braket's matrices put the first target most significant, Qiskit's last
+            program.unitary(matrix=_operation_matrix(operation), targets=list(reversed(targets)))
+    return program, measured
+
+
+def braket_counts(circuit, shots=1024, seed=None):
+    """
+    Sample counts on the Braket SDK's ``LocalSimulator``.
+
+    ``seed`` is ignored: the local simulator has no seed.
+    """
+    from braket.devices import LocalSimulator
+
+    program, measured = to_braket(circuit)
+    if not measured:
+        return _no_measurements(circuit, shots)
+    result = LocalSimulator().run(program, shots=shots).result()
+    return _counts(result.measurements, result.measured_qubits, measured, circuit.num_clbits)
@@ -0,0 +1,274 @@
+#!/usr/bin/env python3
+"""
+Measure what statevector simulation costs on this machine.
+
+Simulates a fixed circuit family (a GHZ chain followed by a layer of RY
+rotations, so every amplitude is touched) from 1 qubit upwards on each
+local engine that is installed:
+
+- numpy:  the NumPy engine in statevector_sim.py
+- qiskit: qiskit.quantum_info.Statevector
+- aer:    Qiskit Aer's statevector method
+
+Every (engine, qubits) point runs in a fresh process, which reports its
+wall time and the growth of its peak RSS over the baseline after imports.
+An engine stops when a point exceeds the time limit or the next one
+would need more than a fraction of physical RAM.
+
+Results are written as JSON (default: data/statevector-scaling.json).
+generate_multi_qubit_growth plots them, with memory walls extrapolated
+from the fitted bytes-per-amplitude, when the file exists.
+
+data/statevector-scaling.json is committed: it is the reference the docs
+figure is rendered from, so every checkout renders the same image.
+Re-measuring with the default --output replaces the reference and shows
+up in git status as a deliberate change. Pass --output to keep a run
+local.
+
+Requirements:
+- numpy
+- qiskit
+- qiskit-aer (optional)
+
+Usage:
+    python scripts/statevector_scaling.py
+    python scripts/statevector_scaling.py --max-qubits 24 --time-limit 5
+    python scripts/statevector_scaling.py --engine numpy --engine aer --output /tmp/scaling.json
+"""
+
+import argparse
+import functools
+import importlib.util
+import json
+import math
+import os
+import platform
+import subprocess
+import sys
+import time
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.dirname(SCRIPT_DIR)
+DATA_PATH = os.path.join(PROJECT_ROOT, 'data', 'statevector-scaling.json')
+
+DATA_VERSION = 1
+CIRCUIT_FAMILY = 'ghz-ry'
+
+# Engine name -> module that must be importable
+ENGINE_MODULES = {
+    'numpy': 'numpy',
+    'qiskit': 'qiskit',
+    'aer': 'qiskit_aer',
+}
+
+# Complex128 amplitude
+AMPLITUDE_BYTES = 16
+
+# Points below this many qubits are dominated by interpreter overhead and
+# are left out of the bytes-per-amplitude fit
+FIT_FROM_QUBITS = 16
+
+
+def physical_memory():
+    """Physical RAM in bytes."""
+    return os.sysconf('SC_PAGE_SIZE') * os.sysconf('SC_PHYS_PAGES')
+
+
+def peak_rss_bytes():
+    """Peak resident set size of this process so far, in bytes."""
+    import resource
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # kilobytes on Linux, bytes on macOS
+    return peak if sys.platform == 'darwin' else peak * 1024
+
+
+def available_engines(names=ENGINE_MODULES):
+    return [name for name in names if importlib.util.find_spec(ENGINE_MODULES[name]) is not None]
+
+
+def scaling_circuit(num_qubits):
+    """GHZ chain followed by an RY layer, without measurements."""
+    from qiskit import QuantumCircuit
+
+    qc = QuantumCircuit(num_qubits)
+    qc.h(0)
+    for qubit in range(num_qubits - 1):
+        qc.cx(qubit, qubit + 1)
+    for qubit in range(num_qubits):
+        qc.ry(0.1 * (qubit + 1), qubit)
+    return qc
+
+
+# ============================================================================
+# Child process: one measurement
+# ============================================================================
+
+def _simulator(engine):
+    """Return a function that simulates a circuit to its final statevector."""
+    if engine == 'numpy':
+        from statevector_sim import statevector
+        return functools.partial(statevector, cache=False)
+    if engine == 'qiskit':
+        from qiskit.quantum_info import Statevector
+        return Statevector
+    if engine == 'aer':
+        from qiskit_aer import AerSimulator
+        backend = AerSimulator(method='statevector')
+
+        def run(circuit):
+            circuit = circuit.copy()
+            circuit.save_statevector()
+            return backend.run(circuit).result().get_statevector()
+        return run
+    raise ValueError(f'Unknown engine: {engine}')
+
+
+def _measure(engine, num_qubits, repeats):
+    """Run inside a fresh interpreter: time one point and print it as JSON."""
+    simulate = _simulator(engine)
+    circuit = scaling_circuit(num_qubits)
+    simulate(scaling_circuit(1))  # warm up lazy imports and JIT caches
+    baseline = peak_rss_bytes()
+
+    times = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        simulate(circuit)
+        times.append(time.perf_counter() - start)
+    print(json.dumps({
+        'qubits': num_qubits,
+        'seconds': min(times),
+        'peak_bytes': max(0, peak_rss_bytes() - baseline),
+    }))
+
+
+def measure(engine, num_qubits, repeats=3, timeout=None):
+    """Measure one point in a fresh Python process."""
+    code = (f'import sys; sys.path.insert(0, {SCRIPT_DIR!r}); '
+            f'from statevector_scaling import _measure; '
+            f'_measure({engine!r}, {num_qubits}, {repeats})')
+    result = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True,
+                            timeout=timeout)
+    if result.returncode != 0:
+        raise RuntimeError(f'{engine} at {num_qubits} qubits failed:\n{result.stderr.rstrip()}')
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+# ============================================================================
+# Benchmark and model
+# ============================================================================
+
+def qubit_limit(memory_bytes, bytes_per_amplitude=3 * AMPLITUDE_BYTES):
+    """Largest qubit count whose state fits in ``memory_bytes``."""
+    return int(math.floor(math.log2(memory_bytes / bytes_per_amplitude)))
+
+
+def run_scaling(engines, max_qubits=None, time_limit=10.0, memory_fraction=0.5):
+    """
+    Measure every engine from 1 qubit up to its limit.
+
+    Args:
+        engines: Engine names
+        max_qubits: Optional hard cap on the qubit count
+        time_limit: Stop an engine once a point takes longer than this (seconds)
+        memory_fraction: Share of physical RAM a point may use, assuming a
+            working set of three statevectors
+
+    Returns:
+        Results dict ready to be written as JSON
+    """
+    from illustration_cache import library_versions
+
+    ram = physical_memory()
+    ram_limit = qubit_limit(ram * memory_fraction)
+    limit = min(ram_limit, max_qubits) if max_qubits else ram_limit
+    results = {}
+    for engine in engines:
+        points = []
+        print(f"⚙️  {engine} (up to {limit} qubits)")
+        for num_qubits in range(1, limit + 1):
+            repeats = 3 if num_qubits < FIT_FROM_QUBITS else 1
+            try:
+                point = measure(engine, num_qubits, repeats=repeats, timeout=time_limit * 10)
+            except (RuntimeError, subprocess.TimeoutExpired) as e:
+                print(f"   ⚠️  stopping {engine}: {e}")
+                break
+            points.append(point)
+            print(f"   {num_qubits:3d} qubits {point['seconds'] * 1000:10.2f} ms "
+                  f"{point['peak_bytes'] / 2**20:10.1f} MB")
+            if point['seconds'] > time_limit:
+                break
+        results[engine] = points
+
+    return {
+        'version': DATA_VERSION,
+        'circuit': CIRCUIT_FAMILY,
+        'machine': {
+            'platform': platform.platform(),
+            'processor': platform.processor() or platform.machine(),
+            'cpu_count': os.cpu_count(),
+            'ram_bytes': ram,
+        },
+        'libraries': library_versions(),
+        'engines': results,
+    }
+
+
+def bytes_per_amplitude(points):
+    """
+    Fitted memory cost per amplitude for one engine's points.
+
+    Uses the median of peak_bytes / 2**n over points large enough for the
+    statevector to dominate; falls back to the raw complex128 size.
+    """
+    ratios = sorted(point['peak_bytes'] / 2 ** point['qubits'] for point in points
+                    if point['qubits'] >= FIT_FROM_QUBITS and point['peak_bytes'] > 0)
+    if not ratios:
+        return AMPLITUDE_BYTES
+    return max(AMPLITUDE_BYTES, ratios[len(ratios) // 2])
+
+
+def load_scaling(path=DATA_PATH):
+    """Saved scaling results, or None if there are none (or they are outdated)."""
+    if not os.path.exists(path):
+        return None
+    with open(path, encoding='utf-8') as f:
+        data = json.load(f)
+    return data if data.get('version') == DATA_VERSION else None
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Measure statevector simulation scaling.')
+    parser.add_argument('--engine', action='append', choices=sorted(ENGINE_MODULES), dest='engines',
+                        help='engine to measure (repeatable, default: every installed one)')
+    parser.add_argument('--max-qubits', type=int, default=None,
+                        help='stop at this many qubits (default: what RAM allows)')
+    parser.add_argument('--time-limit', type=float, default=10.0,
+                        help='stop an engine after a point slower than this, in seconds')
+    parser.add_argument('--memory-fraction', type=float, default=0.5,
+                        help='share of physical RAM a point may use (default: 0.5)')
+    parser.add_argument('--output', default=DATA_PATH, help='results file')
+    args = parser.parse_args(argv)
+
+    if SCRIPT_DIR not in sys.path:
+        sys.path.insert(0, SCRIPT_DIR)
+    engines = available_engines(args.engines or list(ENGINE_MODULES))
+    if not engines:
+        print("❌ None of the requested engines is installed")
+        return 1
+
+    print(f"📈 Statevector scaling on {', '.join(engines)}")
+    print("=" * 60)
+    data = run_scaling(engines, max_qubits=args.max_qubits, time_limit=args.time_limit,
+                       memory_fraction=args.memory_fraction)
+
+    os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(data, f, indent=2)
+        f.write('\n')
+    print(f"\n💾 Saved results to {args.output}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
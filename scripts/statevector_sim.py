@@ -0,0 +1,484 @@
+"""
+Lightweight NumPy statevector simulator for the teaching circuits.
+
+The illustrations only ever simulate a handful of qubits, where starting
+Qiskit Aer costs far more than the linear algebra itself. This module runs
+the same ``QuantumCircuit`` objects with plain NumPy:
+- exact statevectors and outcome probabilities
+- shot sampling as a single seeded multinomial draw, so histograms are
+  reproducible from build to build
+
+For single-qubit figures, ``bloch_vectors`` turns a whole batch of
+circuits or gate sequences into Bloch coordinates in one vectorised pass
+(stacked 2x2 unitaries and an einsum) rather than hand-typed vectors.
+``parameter_sweep`` does the same for a whole grid of gate parameters,
+returning amplitudes, probabilities and sampled counts as arrays.
+
+It is the default engine for illustration builds. Aer stays available as
+an opt-in, either per call (``engine='aer'``) or for a whole build through
+the ``QC101_SIM_ENGINE`` environment variable (``--engine aer`` on
+build_illustrations.py). For states larger than RAM, memmap_statevector.py
+keeps the amplitudes in a memory-mapped file (``engine='memmap'``). The
+Cirq, PennyLane and Braket local simulators run the same circuits as
+``engine='cirq'``, ``'pennylane'`` and ``'braket'`` (see
+simulator_backends.py; benchmark_simulators.py compares all engines).
+
+Seeded counts and statevectors are kept in a persistent on-disk cache
+(see simulation_cache.py), so a circuit is simulated once per engine,
+shot count and seed across builds and worker processes.
+
+Usage:
+    from statevector_sim import run_counts
+
+    qc = QuantumCircuit(1, 1)
+    qc.h(0)
+    qc.measure(0, 0)
+    counts = run_counts(qc, shots=1000, seed=SEED)  # {'0': 493, '1': 507}
+
+    bloch_vectors([[], ['x'], ['h'], ['h', 's'], [('ry', np.pi / 3)]])
+    parameter_sweep([('ry', np.linspace(0, 2 * np.pi, 240))], shots=1000)
+"""
+
+import os
+from collections import namedtuple
+
+import numpy as np
+
+# Environment variable selecting the simulation engine for a build
+ENGINE_ENV = 'QC101_SIM_ENGINE'
+DEFAULT_ENGINE = 'numpy'
+
+# Seed used by the figures so sampled histograms are stable between builds
+DEFAULT_SEED = 101
+
+_SQRT2 = np.sqrt(2)
+
+# Fixed gate matrices, in Qiskit's little-endian qubit convention
+GATE_MATRICES = {
+    'id': np.eye(2, dtype=complex),
+    'x': np.array([[0, 1], [1, 0]], dtype=complex),
+    'y': np.array([[0, -1j], [1j, 0]], dtype=complex),
+    'z': np.array([[1, 0], [0, -1]], dtype=complex),
+    'h': np.array([[1, 1], [1, -1]], dtype=complex) / _SQRT2,
+    's': np.array([[1, 0], [0, 1j]], dtype=complex),
+    'sdg': np.array([[1, 0], [0, -1j]], dtype=complex),
+    't': np.array([[1, 0], [0, np.exp(1j * np.pi / 4)]], dtype=complex),
+    'tdg': np.array([[1, 0], [0, np.exp(-1j * np.pi / 4)]], dtype=complex),
+    'sx': np.array([[1 + 1j, 1 - 1j], [1 - 1j, 1 + 1j]], dtype=complex) / 2,
+    # Two-qubit gates: first qubit argument is the least significant bit
+    'cx': np.array([[1, 0, 0, 0], [0, 0, 0, 1], [0, 0, 1, 0], [0, 1, 0, 0]], dtype=complex),
+    'cy': np.array([[1, 0, 0, 0], [0, 0, 0, -1j], [0, 0, 1, 0], [0, 1j, 0, 0]], dtype=complex),
+    'cz': np.diag([1, 1, 1, -1]).astype(complex),
+    'swap': np.array([[1, 0, 0, 0], [0, 0, 1, 0], [0, 1, 0, 0], [0, 0, 0, 1]], dtype=complex),
+}
+for _matrix in GATE_MATRICES.values():
+    _matrix.flags.writeable = False
+
+
+def _matrix(rows):
+    """
+    2x2 matrix from its entries; array-valued entries give a stack of shape (..., 2, 2).
+    """
+    entries = np.broadcast_arrays(*(np.asarray(entry, dtype=complex)
+                                    for row in rows for entry in row))
+    return np.stack(entries, axis=-1).reshape(entries[0].shape + (2, 2))
+
+
+def _rx(theta):
+    c, s = np.cos(theta / 2), np.sin(theta / 2)
+    return _matrix([[c, -1j * s], [-1j * s, c]])
+
+
+def _ry(theta):
+    c, s = np.cos(theta / 2), np.sin(theta / 2)
+    return _matrix([[c, -s], [s, c]])
+
+
+def _rz(phi):
+    return _matrix([[np.exp(-1j * phi / 2), 0], [0, np.exp(1j * phi / 2)]])
+
+
+def _p(lam):
+    return _matrix([[1, 0], [0, np.exp(1j * lam)]])
+
+
+def _u(theta, phi, lam):
+    c, s = np.cos(theta / 2), np.sin(theta / 2)
+    return _matrix([[c, -np.exp(1j * lam) * s],
+                    [np.exp(1j * phi) * s, np.exp(1j * (phi + lam)) * c]])
+
+
+# Parametrised gate matrices, keyed by Qiskit gate name; parameters may be
+# arrays, giving one matrix per element
+PARAMETRIC_GATES = {
+    'rx': _rx,
+    'ry': _ry,
+    'rz': _rz,
+    'p': _p,
+    'u': _u,
+}
+
+# Instructions that do not change the state
+_IGNORED = {'barrier', 'delay'}
+
+
+def gate_matrix(name, params=()):
+    """
+    Matrix for a standard gate by its Qiskit name.
+
+    Args:
+        name: Gate name, e.g. 'h', 'cx', 'rx'
+        params: Numeric parameters for parametrised gates
+
+    Returns:
+        Complex NumPy array of shape (2**k, 2**k)
+    """
+    if name in GATE_MATRICES:
+        return GATE_MATRICES[name]
+    if name in PARAMETRIC_GATES:
+        return PARAMETRIC_GATES[name](*(float(p) for p in params))
+    raise KeyError(f"Unsupported gate '{name}'")
+
+
+def _operation_matrix(operation):
+    try:
+        return gate_matrix(operation.name, operation.params)
+    except (KeyError, TypeError):
+        # Any other gate Qiskit knows how to turn into a matrix
+        if hasattr(operation, 'to_matrix'):
+            return np.asarray(operation.to_matrix(), dtype=complex)
+        raise
+
+
+def apply_gate(state, matrix, qubits):
+    """
+    Apply a k-qubit gate to a statevector tensor.
+
+    Args:
+        state: Tensor of shape (2,) * n; axis ``n - 1 - q`` is qubit ``q``
+        matrix: Gate matrix of shape (2**k, 2**k)
+        qubits: The k qubit indices the gate acts on, in argument order
+
+    Returns:
+        New state tensor
+    """
+    n = state.ndim
+    k = len(qubits)
+    # The most significant matrix index belongs to the last qubit argument
+    axes = [n - 1 - q for q in reversed(qubits)]
+    tensor = np.reshape(matrix, (2,) * (2 * k))
+    state = np.tensordot(tensor, state, axes=(list(range(k, 2 * k)), axes))
+    return np.moveaxis(state, list(range(k)), axes)
+
+
+def _walk(circuit):
+    """Yield (operation, qubit indices, clbit indices) for each instruction."""
+    for instruction in circuit.data:
+        qubits = [circuit.find_bit(q).index for q in instruction.qubits]
+        clbits = [circuit.find_bit(c).index for c in instruction.clbits]
+        yield instruction.operation, qubits, clbits
+
+
+def simulate(circuit):
+    """
+    Run a circuit's unitary part and collect its terminal measurements.
+
+    Returns:
+        (statevector, measured) where ``statevector`` is a flat complex array
+        of length 2**n in Qiskit's ordering, including the circuit's
+        ``global_phase``, and ``measured`` maps clbit index to qubit index.
+
+    Raises:
+        NotImplementedError: for gates after a measurement or reset
+    """
+    n = circuit.num_qubits
+    state = np.zeros((2,) * n, dtype=complex)
+    state[(0,) * n] = 1
+    measured = {}
+    for operation, qubits, clbits in _walk(circuit):
+        if operation.name in _IGNORED:
+            continue
+        if operation.name == 'measure':
+            measured[clbits[0]] = qubits[0]
+            continue
+        if operation.name == 'reset' or any(q in measured.values() for q in qubits):
+            raise NotImplementedError(
+                'Only terminal measurements are supported; use the Aer engine')
+        state = apply_gate(state, _operation_matrix(operation), qubits)
+    state = state.reshape(-1)
+    if circuit.global_phase:
+        state = state * np.exp(1j * float(circuit.global_phase))
+    return state, measured
+
+
+def statevector(circuit, cache=True):
+    """
+    Final statevector of a circuit (measurements ignored).
+
+    Args:
+        circuit: QuantumCircuit
+        cache: Reuse and store the result in the simulation cache
+    """
+    if cache:
+        from simulation_cache import cached_statevector
+
+        return cached_statevector(lambda c: simulate(c)[0], circuit)
+    return simulate(circuit)[0]
+
+
+def probabilities(circuit):
+    """
+    Exact outcome probabilities over the circuit's classical bits.
+
+    Returns:
+        Dict mapping bitstrings (clbit ``num_clbits - 1`` first, as in Qiskit
+        counts) to probabilities, for every outcome with non-zero probability.
+    """
+    state, measured = simulate(circuit)
+    probs = np.abs(state) ** 2
+
+    # Classical outcome of each basis state: copy measured qubit bits to their clbits
+    basis = np.arange(len(probs))
+    outcomes = np.zeros(len(probs), dtype=np.int64)
+    for clbit, qubit in measured.items():
+        outcomes |= ((basis >> qubit) & 1) << clbit
+    marginal = np.bincount(outcomes, weights=probs, minlength=2 ** circuit.num_clbits)
+
+    width = circuit.num_clbits
+    return {format(value, f'0{width}b'): float(prob)
+            for value, prob in enumerate(marginal) if prob > 1e-12}
+
+
+def sample_counts(circuit, shots=1024, seed=None):
+    """
+    Sample measurement counts with one multinomial draw.
+
+    Args:
+        circuit: QuantumCircuit with terminal measurements
+        shots: Number of shots
+        seed: Seed for the random generator (None for fresh entropy)
+
+    Returns:
+        Dict of bitstring counts, like ``Result.get_counts()``
+    """
+    probs = probabilities(circuit)
+    outcomes = list(probs)
+    weights = np.array([probs[o] for o in outcomes])
+    samples = np.random.default_rng(seed).multinomial(shots, weights / weights.sum())
+    return {outcome: int(count) for outcome, count in zip(outcomes, samples) if count}
+
+
+def _aer_counts(circuit, shots, seed):
+    from qiskit_aer import AerSimulator
+
+    backend = AerSimulator(seed_simulator=seed)
+    return backend.run(circuit, shots=shots).result().get_counts()
+
+
+def _memmap_counts(circuit, shots, seed):
+    from memmap_statevector import memmap_counts
+
+    return memmap_counts(circuit, shots, seed)
+
+
+def _cirq_counts(circuit, shots, seed):
+    from simulator_backends import cirq_counts
+
+    return cirq_counts(circuit, shots, seed)
+
+
+def _pennylane_counts(circuit, shots, seed):
+    from simulator_backends import pennylane_counts
+
+    return pennylane_counts(circuit, shots, seed)
+
+
+def _braket_counts(circuit, shots, seed):
+    from simulator_backends import braket_counts
+
+    return braket_counts(circuit, shots, seed)
+
+
+ENGINES = {
+    'numpy': sample_counts,
+    'aer': _aer_counts,
+    'memmap': _memmap_counts,
+    'cirq': _cirq_counts,
+    'pennylane': _pennylane_counts,
+    'braket': _braket_counts,
+}
+
+
+def selected_engine():
+    """Engine chosen for this process (``QC101_SIM_ENGINE``, default 'numpy')."""
+    return os.environ.get(ENGINE_ENV, DEFAULT_ENGINE)
+
+
+def run_counts(circuit, shots=1024, seed=DEFAULT_SEED, engine=None, cache=True):
+    """
+    Sample counts for a circuit on the selected engine.
+
+    Args:
+        circuit: QuantumCircuit with measurements
+        shots: Number of shots
+        seed: Sampling seed; the default keeps figures reproducible
+        engine: A name from ``ENGINES`` (default: ``selected_engine()``)
+        cache: Reuse and store seeded results in the simulation cache
+
+    Returns:
+        Dict of bitstring counts
+    """
+    engine = engine or selected_engine()
+    if engine not in ENGINES:
+        raise ValueError(f"Unknown engine '{engine}' (choose from {', '.join(ENGINES)})")
+    if not cache:
+        return ENGINES[engine](circuit, shots, seed)
+    from simulation_cache import cached_counts
+
+    return cached_counts(ENGINES[engine], circuit, shots, seed, engine)
+
+
+# ============================================================================
+# Batched single-qubit Bloch coordinates
+# ============================================================================
+
+def _sequence_gates(item):
+    """Normalise a circuit or gate sequence to a list of 2x2 matrices."""
+    if hasattr(item, 'data'):
+        if item.num_qubits != 1:
+            raise ValueError('bloch_vectors only takes single-qubit circuits')
+        return [_operation_matrix(operation) for operation, _, _ in _walk(item)
+                if operation.name not in _IGNORED and operation.name != 'measure']
+    gates = []
+    for gate in item:
+        if isinstance(gate, str):
+            gates.append(gate_matrix(gate))
+        elif isinstance(gate, np.ndarray):
+            gates.append(gate)
+        else:
+            name, *params = gate
+            gates.append(gate_matrix(name, params))
+    return gates
+
+
+def sequence_unitaries(items):
+    """
+    Overall unitary of each single-qubit circuit or gate sequence.
+
+    Sequences are padded with identities to a common length and multiplied
+    step by step across the whole batch, so the cost grows with the longest
+    sequence rather than with the number of sequences.
+
+    Args:
+        items: Iterable of single-qubit QuantumCircuits or gate sequences.
+            A gate is a name ('h'), a (name, *params) tuple (('rx', 0.5))
+            or a 2x2 matrix; gates apply in sequence order.
+
+    Returns:
+        Complex array of shape (n, 2, 2)
+    """
+    sequences = [_sequence_gates(item) for item in items]
+    length = max((len(gates) for gates in sequences), default=0)
+    stacked = np.tile(np.eye(2, dtype=complex), (len(sequences), max(length, 1), 1, 1))
+    for index, gates in enumerate(sequences):
+        if gates:
+            stacked[index, :len(gates)] = gates
+
+    unitaries = np.tile(np.eye(2, dtype=complex), (len(sequences), 1, 1))
+    for step in range(length):
+        unitaries = np.einsum('nij,njk->nik', stacked[:, step], unitaries)
+    return unitaries
+
+
+def bloch_coordinates(states):
+    """
+    Bloch coordinates of single-qubit states.
+
+    Args:
+        states: Complex array of shape (n, 2) (or (2,) for one state)
+
+    Returns:
+        Float array of shape (n, 3) (or (3,)) with x, y, z
+    """
+    states = np.asarray(states, dtype=complex)
+    alpha, beta = states[..., 0], states[..., 1]
+    overlap = np.conj(alpha) * beta
+    return np.stack([2 * overlap.real, 2 * overlap.imag,
+                     np.abs(alpha) ** 2 - np.abs(beta) ** 2], axis=-1)
+
+
+def bloch_vectors(items, initial_state=(1, 0)):
+    """
+    Bloch coordinates reached by a batch of single-qubit circuits or gate sequences.
+
+    Args:
+        items: See ``sequence_unitaries``
+        initial_state: Starting amplitudes (default |0⟩), shape (2,) or (n, 2)
+
+    Returns:
+        Float array of shape (n, 3)
+    """
+    unitaries = sequence_unitaries(items)
+    initial = np.broadcast_to(np.asarray(initial_state, dtype=complex), (len(unitaries), 2))
+    return bloch_coordinates(np.einsum('nij,nj->ni', unitaries, initial))
+
+
+# ============================================================================
+# Batched parameter sweeps
+# ============================================================================
+
+class Sweep(namedtuple('Sweep', ['states', 'probabilities', 'counts', 'shots'])):
+    """
+    A single-qubit circuit evaluated over a parameter grid.
+
+    ``states`` (complex), ``probabilities`` and ``counts`` (sampled outcomes
+    0 and 1) all have shape grid + (2,); ``shots`` is per grid point.
+    """
+    __slots__ = ()
+
+    @property
+    def grid_shape(self):
+        return self.states.shape[:-1]
+
+
+def _sweep_matrices(gate):
+    """A sweep gate as one 2x2 matrix or a stack of shape (..., 2, 2)."""
+    if isinstance(gate, np.ndarray):
+        return gate
+    if isinstance(gate, str):
+        return gate_matrix(gate)
+    name, *params = gate
+    if name in PARAMETRIC_GATES:
+        return PARAMETRIC_GATES[name](*(np.asarray(p, dtype=float) for p in params))
+    return gate_matrix(name, params)
+
+
+def parameter_sweep(gates, shots=1024, seed=DEFAULT_SEED, initial_state=(1, 0)):
+    """
+    States, probabilities and sampled counts of a single-qubit circuit over a parameter grid.
+
+    Parameters may be arrays: every gate is built for the whole grid at once
+    and the sequence costs one broadcast matmul per gate, whatever the grid
+    size. Counts come from a single vectorised binomial draw.
+
+    Args:
+        gates: Gate sequence as for ``sequence_unitaries``, where parameters
+            can be arrays that broadcast together to the grid's shape, e.g.
+            ``[('ry', thetas[:, None]), ('rz', phis[None, :]), 'h']``
+        shots: Shots per grid point
+        seed: Sampling seed; the default keeps figures reproducible
+        initial_state: Starting amplitudes (default |0⟩)
+
+    Returns:
+        Sweep
+    """
+    unitary = np.eye(2, dtype=complex)
+    for gate in gates:
+        unitary = np.matmul(_sweep_matrices(gate), unitary)
+    states = unitary @ np.asarray(initial_state, dtype=complex)
+
+    probabilities = np.abs(states) ** 2
+    probabilities /= probabilities.sum(axis=-1, keepdims=True)
+    ones = np.random.default_rng(seed).binomial(shots, probabilities[..., 1])
+    counts = np.stack([shots - ones, ones], axis=-1)
+    return Sweep(states, probabilities, counts, shots)
@@ -0,0 +1,121 @@
+"""
+Small-multiples galleries for parameter sweeps.
+
+A sweep over hundreds of parameter values would otherwise mean hundreds of
+subplots, each with its own ``ax.bar`` call and a loop of text labels.
+``SmallMultiples`` lays the whole grid out inside one Axes instead: every
+cell's bars are rectangles in a single ``PolyCollection``, so a panel is
+one artist whose vertices and colours are set from arrays in one update.
+Grid coordinates are labelled once on the axis ticks, not per cell.
+
+Usage:
+    from statevector_sim import parameter_sweep
+    from sweep_gallery import SmallMultiples
+
+    sweep = parameter_sweep([('ry', thetas.reshape(12, 20))], shots=1000)
+    panel = SmallMultiples(ax, sweep.grid_shape, ylim=(0, 1))
+    panel.update(sweep.probabilities, colors=['#2E86AB', '#E63946'])
+    panel.label_rows([f'{t:.0f}°' for t in np.degrees(thetas[::20])])
+"""
+
+import matplotlib
+import numpy as np
+from matplotlib import colors as mcolors
+from matplotlib.collections import LineCollection, PolyCollection
+
+# Bars per cell: outcome |0⟩ and |1⟩
+OUTCOMES = 2
+
+
+class SmallMultiples:
+    """A rows x columns grid of tiny bar charts drawn as one collection in one Axes."""
+
+    def __init__(self, ax, grid_shape, bars=OUTCOMES, ylim=(0, 1), pad=0.12, **bar_style):
+        """
+        Args:
+            ax: Axes to draw the whole grid in
+            grid_shape: (rows, columns) of the parameter grid; row 0 is drawn at the top
+            bars: Bars per cell
+            ylim: Value range every cell spans; a zero line is drawn when it is signed
+            pad: Empty margin around each cell's bars, as a fraction of the cell
+            **bar_style: PolyCollection styling (edgecolor, linewidth, ...)
+        """
+        self.ax = ax
+        self.grid_shape = tuple(grid_shape)
+        self.bars = bars
+        self.ylim = ylim
+        self.pad = pad
+
+        rows, columns = self.grid_shape
+        row, column, bar = np.meshgrid(np.arange(rows), np.arange(columns), np.arange(bars),
+                                       indexing='ij')
+        self.bar_width = (1 - 2 * pad) / bars
+        self._left = (column + pad + bar * self.bar_width).reshape(-1)
+        self._cell_bottom = (rows - 1 - row + pad).reshape(-1)
+        self._scale = (1 - 2 * pad) / (ylim[1] - ylim[0])
+
+        style = {'edgecolor': 'black', 'linewidth': 0.3}
+        style.update(bar_style)
+        self.collection = PolyCollection([], **style)
+        ax.add_collection(self.collection)
+
+        if ylim[0] < 0 < ylim[1]:
+            zero = (rows - 1 - np.arange(rows) + pad - ylim[0] * self._scale)[:, None]
+            x0 = np.arange(columns)[None, :] + pad
+            ys = np.broadcast_to(zero, (rows, columns))
+            x0 = np.broadcast_to(x0, (rows, columns))
+            segments = np.stack([np.stack([x0, ys], -1), np.stack([x0 + 1 - 2 * pad, ys], -1)],
+                                axis=-2)
+            ax.add_collection(LineCollection(segments.reshape(-1, 2, 2), colors='black',
+                                             linewidths=0.3))
+
+        ax.set_xlim(0, columns)
+        ax.set_ylim(0, rows)
+        ax.set_xticks(np.arange(columns + 1), minor=True)
+        ax.set_yticks(np.arange(rows + 1), minor=True)
+        ax.set_xticks([])
+        ax.set_yticks([])
+        ax.grid(False, which='major')
+        ax.grid(True, which='minor', color='white', linewidth=1.5)
+        ax.tick_params(which='minor', length=0)
+
+    def update(self, values, colors=None):
+        """
+        Redraw every bar of the grid from one array.
+
+        Args:
+            values: Bar heights, shape grid_shape + (bars,); clipped to ylim
+            colors: One colour per bar index, or an RGBA array of shape
+                grid_shape + (bars, 4)
+        """
+        values = np.clip(np.asarray(values, dtype=float), *self.ylim).reshape(-1)
+        base = self._cell_bottom - self.ylim[0] * self._scale
+        top = base + values * self._scale
+        left, right = self._left, self._left + self.bar_width
+        verts = np.stack([np.stack([left, base], -1), np.stack([right, base], -1),
+                          np.stack([right, top], -1), np.stack([left, top], -1)], axis=1)
+        self.collection.set_verts(verts)
+
+        if colors is not None:
+            colors = np.asarray(colors)
+            if colors.ndim <= 2 and len(colors) == self.bars:
+                colors = np.tile(mcolors.to_rgba_array(colors), (len(values) // self.bars, 1))
+            self.collection.set_facecolor(np.reshape(colors, (-1, 4)))
+
+    def label_rows(self, labels, **text_style):
+        """Label each row (top to bottom) on the y axis."""
+        rows = self.grid_shape[0]
+        self.ax.set_yticks(rows - 0.5 - np.arange(rows))
+        self.ax.set_yticklabels(labels, **text_style)
+
+    def label_columns(self, labels, every=1, **text_style):
+        """Label every ``every``-th column on the x axis."""
+        columns = np.arange(0, self.grid_shape[1], every)
+        self.ax.set_xticks(columns + 0.5)
+        self.ax.set_xticklabels(labels[::every], **text_style)
+
+
+def phase_colors(amplitudes, cmap='twilight'):
+    """RGBA colour of each complex amplitude's phase, shape amplitudes.shape + (4,)."""
+    phase = (np.angle(amplitudes) + np.pi) / (2 * np.pi)
+    return matplotlib.colormaps[cmap](phase)
@@ -0,0 +1,7 @@
+import os
+import sys
+
+# The modules under test are flat scripts in scripts/
+SCRIPT_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'scripts')
+if SCRIPT_DIR not in sys.path:
+    sys.path.insert(0, SCRIPT_DIR)
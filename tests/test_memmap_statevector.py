@@ -0,0 +1,109 @@
+"""
+The memory-mapped engine against ``qiskit.quantum_info.Statevector``.
+
+Chunks are made tiny, so random circuits on a few qubits exercise gates
+inside a chunk, gates across chunks and batched passes, as a 30-qubit
+state would with the default chunk size.
+"""
+
+import math
+import os
+
+import numpy as np
+import pytest
+from benchmark_simulators import TVD_TOLERANCE, total_variation
+from memmap_statevector import MemmapStatevector, simulate_memmap
+from qiskit.quantum_info import Statevector
+from statevector_sim import gate_matrix, run_counts
+from test_statevector_sim import MEASUREMENTS, expected_probabilities, random_circuit
+
+SHOTS = 4000
+SEED = 11
+
+
+def _qubits(circuit, measured):
+    return [measured.get(clbit) for clbit in range(circuit.num_clbits)]
+
+
+@pytest.mark.parametrize('chunk_qubits', [1, 2, 3])
+@pytest.mark.parametrize('seed', range(4))
+def test_statevector_matches_qiskit(chunk_qubits, seed):
+    circuit = random_circuit(5, depth=16, seed=seed)
+    state, _ = simulate_memmap(circuit, chunk_qubits=chunk_qubits)
+    with state:
+        amplitudes = np.array(state.amplitudes)
+        assert state.norm() == pytest.approx(1.0)
+
+    # simulate_memmap leaves out the global phase, so compare up to it
+    expected = Statevector(circuit).data * np.exp(-1j * circuit.global_phase)
+    np.testing.assert_allclose(amplitudes, expected, atol=1e-10)
+
+
+def test_batched_pass_matches_single_gates():
+    rng = np.random.default_rng(0)
+    gates = [(gate_matrix('h'), [q]) for q in range(5)]
+    gates += [(gate_matrix('cx'), [int(a), int(b)])
+              for a, b in (rng.permutation(5)[:2] for _ in range(8))]
+    gates += [(gate_matrix('ry', [0.1 * q]), [q]) for q in range(5)]
+
+    with MemmapStatevector(5, chunk_qubits=1) as batched, \
+            MemmapStatevector(5, chunk_qubits=1) as single:
+        batched.apply_gates(gates)
+        for matrix, qubits in gates:
+            single.apply_gate(matrix, qubits)
+        np.testing.assert_allclose(batched.amplitudes, single.amplitudes, atol=1e-12)
+
+
+@pytest.mark.parametrize('measured', MEASUREMENTS, ids=str)
+@pytest.mark.parametrize('seed', range(3))
+def test_probabilities_match_qiskit(measured, seed):
+    circuit = random_circuit(3, depth=10, seed=seed, measured=measured)
+    state, found = simulate_memmap(circuit, chunk_qubits=1)
+    with state:
+        probs = state.probabilities(_qubits(circuit, found))
+
+    expected = expected_probabilities(circuit, measured)
+    for value, prob in enumerate(probs):
+        key = format(value, f'0{circuit.num_clbits}b')
+        assert prob == pytest.approx(expected.get(key, 0.0), abs=1e-10)
+
+
+@pytest.mark.parametrize('measured', MEASUREMENTS, ids=str)
+@pytest.mark.parametrize('seed', range(3))
+def test_counts_match_qiskit(measured, seed):
+    circuit = random_circuit(3, depth=10, seed=seed, measured=measured)
+    state, found = simulate_memmap(circuit, chunk_qubits=1)
+    with state:
+        counts = state.sample_counts(SHOTS, qubits=_qubits(circuit, found), seed=SEED)
+    expected = expected_probabilities(circuit, measured)
+    noise = TVD_TOLERANCE * math.sqrt(len(expected) / SHOTS)
+
+    assert sum(counts.values()) == SHOTS
+    assert set(counts) <= set(expected)
+    assert total_variation(counts, expected) <= noise
+
+
+def test_engine_matches_numpy_distribution():
+    circuit = random_circuit(4, depth=12, seed=3, measured={0: 3, 1: 0, 2: 2})
+    counts = run_counts(circuit, shots=SHOTS, seed=SEED, engine='memmap', cache=False)
+    expected = expected_probabilities(circuit, {0: 3, 1: 0, 2: 2})
+    noise = TVD_TOLERANCE * math.sqrt(len(expected) / SHOTS)
+
+    assert set(counts) <= set(expected)
+    assert total_variation(counts, expected) <= noise
+    assert run_counts(circuit, shots=SHOTS, seed=SEED, engine='memmap', cache=False) == counts
+
+
+def test_temporary_file_removed(tmp_path, monkeypatch):
+    monkeypatch.setenv('QC101_MEMMAP_DIR', str(tmp_path))
+    with MemmapStatevector(4, chunk_qubits=2) as state:
+        assert os.path.dirname(state.path) == str(tmp_path)
+        assert os.path.getsize(state.path) == state.nbytes
+    assert os.listdir(tmp_path) == []
+
+
+def test_given_file_kept(tmp_path):
+    path = str(tmp_path / 'state.bin')
+    with MemmapStatevector(3, path=path) as state:
+        state.apply_gate(gate_matrix('x'), [1])
+    assert np.fromfile(path, dtype=np.complex128)[0b010] == 1
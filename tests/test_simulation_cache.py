@@ -0,0 +1,207 @@
+"""
+Circuit fingerprints, result keys and the on-disk simulation cache.
+
+Fingerprints must ignore what does not change a simulation (register
+names, labels) and tell apart everything that does, global phase
+included. Cached counts and statevectors must come back exactly as
+computed.
+"""
+
+import os
+
+import numpy as np
+import pytest
+from qiskit import ClassicalRegister, QuantumCircuit, QuantumRegister
+from qiskit.circuit.library import HGate
+from simulation_cache import (CACHE_DIR_ENV, CACHE_ENV, EVICT_TO, SimulationCache, cached_counts,
+                              cached_statevector, circuit_fingerprint, result_key)
+from statevector_sim import run_counts, simulate, statevector
+from test_statevector_sim import random_circuit
+
+SEED = 11
+
+
+@pytest.fixture
+def cache_dir(tmp_path, monkeypatch):
+    monkeypatch.setenv(CACHE_DIR_ENV, str(tmp_path))
+    monkeypatch.delenv(CACHE_ENV, raising=False)
+    return tmp_path
+
+
+def _entries(directory):
+    return sorted(name for name in os.listdir(directory) if name.endswith('.npz'))
+
+
+def _bell(qreg='q', creg='c', label=None):
+    qr, cr = QuantumRegister(2, qreg), ClassicalRegister(2, creg)
+    circuit = QuantumCircuit(qr, cr)
+    circuit.append(HGate(label=label), [0])
+    circuit.cx(0, 1)
+    circuit.rz(0.25, 1)
+    circuit.measure([0, 1], [0, 1])
+    return circuit
+
+
+class Counter:
+    """A counts function that records how often it ran."""
+
+    def __init__(self, run):
+        self.run = run
+        self.calls = 0
+
+    def __call__(self, circuit, shots, seed):
+        self.calls += 1
+        return self.run(circuit, shots, seed)
+
+
+# ============================================================================
+# Fingerprints and keys
+# ============================================================================
+
+def test_fingerprint_ignores_names_and_labels():
+    assert circuit_fingerprint(_bell()) == circuit_fingerprint(_bell('alice', 'bits', 'hadamard'))
+
+
+@pytest.mark.parametrize('seed', range(4))
+def test_fingerprint_stable_across_copies(seed):
+    circuit = random_circuit(3, depth=10, seed=seed)
+    assert circuit_fingerprint(circuit) == circuit_fingerprint(circuit.copy())
+
+
+def _variants():
+    base = _bell()
+    variants = {}
+
+    phase = base.copy()
+    phase.global_phase = 0.5
+    variants['global-phase'] = phase
+
+    angle = base.copy()
+    angle.data[2] = angle.data[2].replace(params=[0.26])
+    variants['parameter'] = angle
+
+    swapped = QuantumCircuit(2, 2)
+    swapped.h(1)
+    swapped.cx(1, 0)
+    swapped.rz(0.25, 0)
+    swapped.measure([0, 1], [0, 1])
+    variants['qubit-order'] = swapped
+
+    clbits = QuantumCircuit(2, 2)
+    clbits.compose(base.remove_final_measurements(inplace=False), inplace=True)
+    clbits.measure([0, 1], [1, 0])
+    variants['clbit-mapping'] = clbits
+
+    wider = QuantumCircuit(2, 3)
+    wider.compose(base, inplace=True)
+    variants['clbit-count'] = wider
+    return base, variants
+
+
+@pytest.mark.parametrize('name', ['global-phase', 'parameter', 'qubit-order', 'clbit-mapping',
+                                  'clbit-count'])
+def test_fingerprint_tells_circuits_apart(name):
+    base, variants = _variants()
+    assert circuit_fingerprint(variants[name]) != circuit_fingerprint(base)
+
+
+def test_result_key_covers_what_was_computed():
+    circuit = _bell()
+    keys = {
+        result_key(circuit, 'counts', 'numpy', shots=100, seed=1),
+        result_key(circuit, 'counts', 'numpy', shots=101, seed=1),
+        result_key(circuit, 'counts', 'numpy', shots=100, seed=2),
+        result_key(circuit, 'counts', 'aer', shots=100, seed=1),
+        result_key(circuit, 'statevector'),
+    }
+    assert len(keys) == 5
+    assert result_key(_bell('r'), 'statevector') == result_key(circuit, 'statevector')
+
+
+# ============================================================================
+# Cached results
+# ============================================================================
+
+@pytest.mark.parametrize('measured', [{0: 0, 1: 1, 2: 2}, {1: 0, 3: 2}], ids=str)
+def test_counts_roundtrip(cache_dir, measured):
+    circuit = random_circuit(3, depth=10, seed=2, measured=measured)
+    run = Counter(lambda c, shots, seed: run_counts(c, shots, seed, 'numpy', cache=False))
+
+    first = cached_counts(run, circuit, 1000, SEED, 'numpy')
+    second = cached_counts(run, circuit, 1000, SEED, 'numpy')
+
+    assert run.calls == 1
+    # Same outcomes, counts, widths and order
+    assert list(second.items()) == list(first.items())
+    assert first == run_counts(circuit, 1000, SEED, 'numpy', cache=False)
+    assert len(_entries(cache_dir)) == 1
+
+
+def test_statevector_roundtrip(cache_dir):
+    circuit = random_circuit(3, depth=10, seed=4)
+    first = statevector(circuit)
+    second = statevector(circuit)
+
+    np.testing.assert_array_equal(second, first)
+    np.testing.assert_array_equal(first, simulate(circuit)[0])
+    assert len(_entries(cache_dir)) == 1
+
+    # A different global phase is a different entry, not the cached state
+    shifted = circuit.copy()
+    shifted.global_phase += 1.0
+    np.testing.assert_allclose(statevector(shifted), first * np.exp(1j), atol=1e-12)
+    assert len(_entries(cache_dir)) == 2
+
+
+@pytest.mark.parametrize('seed,engine', [(None, 'numpy'), (SEED, 'braket')])
+def test_unseeded_runs_bypass(cache_dir, seed, engine):
+    run = Counter(lambda c, shots, seed: {'00': shots})
+    cached_counts(run, _bell(), 10, seed, engine)
+    cached_counts(run, _bell(), 10, seed, engine)
+
+    assert run.calls == 2
+    assert not os.path.exists(cache_dir / 'locks')
+
+
+def test_turned_off(cache_dir, monkeypatch):
+    monkeypatch.setenv(CACHE_ENV, '0')
+    run = Counter(lambda c, shots, seed: {'00': shots})
+    cached_counts(run, _bell(), 10, SEED, 'numpy')
+    cached_statevector(lambda c: simulate(c)[0], _bell())
+
+    assert _entries(cache_dir) == []
+
+
+def test_corrupt_entry_is_a_miss(tmp_path):
+    cache = SimulationCache(str(tmp_path))
+    cache.put('ab' * 32, values=np.arange(4))
+    with open(cache.path('ab' * 32), 'r+b') as f:
+        f.truncate(10)
+
+    assert cache.get('ab' * 32) is None
+    assert not os.path.exists(cache.path('ab' * 32))
+
+
+# ============================================================================
+# Size limit
+# ============================================================================
+
+def test_evicts_least_recently_used(tmp_path):
+    cache = SimulationCache(str(tmp_path), max_bytes=10**9)
+    keys = [f'{n:02x}' * 32 for n in range(4)]
+    for age, key in enumerate(keys):
+        cache.put(key, values=np.random.default_rng(age).random(1000))
+        os.utime(cache.path(key), (1000 + age, 1000 + age))
+    cache.get(keys[0])  # now the most recently used
+
+    entry = os.path.getsize(cache.path(keys[0]))
+    cache.max_bytes = int(2.5 * entry / EVICT_TO)
+    assert cache.evict() == 2
+    assert cache.get(keys[1]) is None and cache.get(keys[2]) is None
+    assert cache.get(keys[0]) is not None and cache.get(keys[3]) is not None
+
+
+def test_oversized_entry_not_stored(tmp_path):
+    cache = SimulationCache(str(tmp_path), max_bytes=1000)
+    assert not cache.put('cd' * 32, values=np.zeros(1000))
+    assert cache.get('cd' * 32) is None
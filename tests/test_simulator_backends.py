@@ -0,0 +1,86 @@
+"""
+The Cirq, PennyLane and Braket engines against the NumPy engine.
+
+Every teaching circuit (see simulator_backends.py) is sampled on each
+engine and compared with the NumPy engine's exact distribution and with
+its histogram. A test is skipped when its framework is not installed.
+"""
+
+import math
+import warnings
+
+import pytest
+from benchmark_simulators import TVD_TOLERANCE, total_variation
+from simulator_backends import BACKEND_MODULES, TEACHING_CIRCUITS
+from statevector_sim import probabilities, run_counts
+
+ENGINES = ['cirq', 'pennylane', 'braket']
+SHOTS = 4000
+SEED = 11
+
+
+def _circuits():
+    from qiskit import QuantumCircuit
+
+    circuits = {}
+    for name, factory in TEACHING_CIRCUITS.items():
+        if name == 'ghz':
+            circuits.update({f'ghz-{n}': factory(n) for n in (1, 2, 3, 5)})
+        else:
+            circuits[name] = factory()
+    circuits['bell-unmeasured'] = TEACHING_CIRCUITS['bell'](measure=False)
+
+    # A gate none of the engines' tables has, passed as a matrix: checks qubit order
+    controlled_h = QuantumCircuit(2)
+    controlled_h.x(0)
+    controlled_h.ch(0, 1)
+    controlled_h.measure_all()
+    circuits['controlled-h'] = controlled_h
+    return circuits
+
+
+CIRCUITS = _circuits()
+
+
+@pytest.fixture(params=ENGINES)
+def engine(request):
+    pytest.importorskip(BACKEND_MODULES[request.param])
+    return request.param
+
+
+def _run(circuit, shots, engine, seed=SEED):
+    with warnings.catch_warnings():
+        # Deprecated framework APIs fail the test
+        warnings.simplefilter('error', DeprecationWarning)
+        warnings.filterwarnings('error', message='.*deprecated', category=UserWarning)
+        return run_counts(circuit, shots=shots, seed=seed, engine=engine, cache=False)
+
+
+@pytest.mark.parametrize('name', sorted(CIRCUITS))
+def test_matches_numpy(engine, name):
+    circuit = CIRCUITS[name]
+    counts = _run(circuit, SHOTS, engine)
+    reference = run_counts(circuit, shots=SHOTS, seed=SEED, engine='numpy', cache=False)
+    exact = probabilities(circuit)
+    noise = TVD_TOLERANCE * math.sqrt(len(exact) / SHOTS)
+
+    assert sum(counts.values()) == SHOTS
+    assert set(counts) <= set(exact)
+    assert total_variation(counts, exact) <= noise
+    assert total_variation(counts, {bits: n / SHOTS for bits, n in reference.items()}) <= 2 * noise
+
+
+@pytest.mark.parametrize('name', sorted(CIRCUITS))
+def test_single_shot(engine, name):
+    circuit = CIRCUITS[name]
+    counts = _run(circuit, 1, engine)
+
+    assert list(counts.values()) == [1]
+    assert set(counts) <= set(probabilities(circuit))
+
+
+def test_seeded_runs_repeat(engine):
+    if engine == 'braket':
+        pytest.skip("Braket's local simulator cannot be seeded")
+    circuit = CIRCUITS['ghz-3']
+    assert _run(circuit, 500, engine) == _run(circuit, 500, engine)
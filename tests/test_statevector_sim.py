@@ -0,0 +1,154 @@
+"""
+The NumPy engine against ``qiskit.quantum_info.Statevector``.
+
+Random circuits over every gate in statevector_sim.py's tables, plus gates
+it can only reach through ``to_matrix``, are simulated by both. Statevectors
+must agree including the global phase; probabilities and sampled counts
+must agree over the measured clbits, whichever qubits they measure.
+"""
+
+import math
+
+import numpy as np
+import pytest
+from benchmark_simulators import TVD_TOLERANCE, total_variation
+from qiskit import QuantumCircuit
+from qiskit.quantum_info import Statevector
+from statevector_sim import (GATE_MATRICES, PARAMETRIC_GATES, probabilities, run_counts,
+                             statevector)
+
+SHOTS = 4000
+SEED = 11
+
+# Gates without an entry in the tables, simulated from their to_matrix()
+MATRIX_GATES = {
+    'ch': 2,
+    'crx': 2,
+    'rzz': 2,
+    'ccx': 3,
+    'cswap': 3,
+}
+
+# Parameter count of each gate that takes parameters
+PARAM_COUNTS = {'rx': 1, 'ry': 1, 'rz': 1, 'p': 1, 'u': 3, 'crx': 1, 'rzz': 1}
+
+
+def _arity(name):
+    if name in GATE_MATRICES:
+        return int(math.log2(len(GATE_MATRICES[name])))
+    return MATRIX_GATES.get(name, 1)
+
+
+GATES = sorted(set(GATE_MATRICES) | set(PARAMETRIC_GATES) | set(MATRIX_GATES))
+
+
+def random_circuit(num_qubits, depth, seed, measured=None):
+    """
+    A random circuit over ``GATES``, with a random global phase.
+
+    ``measured`` maps clbit index to the qubit it measures; the circuit has
+    one more clbit than the highest index, so unmeasured clbits read 0.
+    """
+    rng = np.random.default_rng(seed)
+    num_clbits = max(measured) + 1 if measured else 0
+    circuit = QuantumCircuit(num_qubits, num_clbits)
+    gates = [name for name in GATES if _arity(name) <= num_qubits]
+    for _ in range(depth):
+        name = gates[rng.integers(len(gates))]
+        qubits = [int(q) for q in rng.permutation(num_qubits)[:_arity(name)]]
+        params = [float(p) for p in rng.uniform(-np.pi, np.pi, PARAM_COUNTS.get(name, 0))]
+        getattr(circuit, name)(*params, *qubits)
+    circuit.global_phase = float(rng.uniform(0, 2 * np.pi))
+    for clbit, qubit in (measured or {}).items():
+        circuit.measure(qubit, clbit)
+    return circuit
+
+
+def expected_probabilities(circuit, measured):
+    """Outcome probabilities from Qiskit, over the clbits in ``measured``."""
+    clbits = sorted(measured)
+    probs = Statevector(circuit.remove_final_measurements(inplace=False)).probabilities(
+        [measured[c] for c in clbits])
+    expected = {}
+    for index, prob in enumerate(probs):
+        value = sum(((index >> i) & 1) << clbit for i, clbit in enumerate(clbits))
+        key = format(value, f'0{circuit.num_clbits}b')
+        expected[key] = expected.get(key, 0.0) + float(prob)
+    return {key: prob for key, prob in expected.items() if prob > 1e-12}
+
+
+CASES = [(n, seed) for n in (1, 2, 3, 4) for seed in range(6)]
+
+# clbit -> qubit maps: full, reversed, partial and with an unmeasured clbit
+MEASUREMENTS = [
+    {0: 0, 1: 1, 2: 2},
+    {0: 2, 1: 1, 2: 0},
+    {0: 1},
+    {1: 0, 3: 2},
+]
+
+
+@pytest.mark.parametrize('num_qubits,seed', CASES)
+def test_statevector_matches_qiskit(num_qubits, seed):
+    circuit = random_circuit(num_qubits, depth=12, seed=seed)
+    state = statevector(circuit, cache=False)
+
+    # Global phase included: compared as vectors, not up to phase
+    np.testing.assert_allclose(state, Statevector(circuit).data, atol=1e-10)
+
+
+@pytest.mark.parametrize('name', GATES)
+def test_gate_matrix_and_qubit_order(name):
+    # Each gate on its qubits in descending order, so a flipped convention shows
+    arity = _arity(name)
+    circuit = QuantumCircuit(3)
+    circuit.h(range(3))
+    circuit.t(0)
+    circuit.s(2)
+    params = [0.3, -1.1, 2.2][:PARAM_COUNTS.get(name, 0)]
+    getattr(circuit, name)(*params, *reversed(range(arity)))
+
+    np.testing.assert_allclose(statevector(circuit, cache=False), Statevector(circuit).data,
+                               atol=1e-10)
+
+
+@pytest.mark.parametrize('measured', MEASUREMENTS, ids=str)
+@pytest.mark.parametrize('seed', range(4))
+def test_probabilities_match_qiskit(measured, seed):
+    circuit = random_circuit(3, depth=10, seed=seed, measured=measured)
+    probs = probabilities(circuit)
+    expected = expected_probabilities(circuit, measured)
+
+    assert set(probs) == set(expected)
+    for outcome, prob in expected.items():
+        assert probs[outcome] == pytest.approx(prob, abs=1e-10)
+
+
+@pytest.mark.parametrize('measured', MEASUREMENTS, ids=str)
+@pytest.mark.parametrize('seed', range(4))
+def test_run_counts_match_qiskit(measured, seed):
+    circuit = random_circuit(3, depth=10, seed=seed, measured=measured)
+    counts = run_counts(circuit, shots=SHOTS, seed=SEED, engine='numpy', cache=False)
+    expected = expected_probabilities(circuit, measured)
+    noise = TVD_TOLERANCE * math.sqrt(len(expected) / SHOTS)
+
+    assert sum(counts.values()) == SHOTS
+    assert set(counts) <= set(expected)
+    assert all(len(outcome) == circuit.num_clbits for outcome in counts)
+    assert total_variation(counts, expected) <= noise
+
+
+def test_seeded_counts_repeat():
+    circuit = random_circuit(3, depth=10, seed=0, measured=MEASUREMENTS[0])
+    first = run_counts(circuit, shots=500, seed=SEED, engine='numpy', cache=False)
+    assert run_counts(circuit, shots=500, seed=SEED, engine='numpy', cache=False) == first
+
+
+def test_mid_circuit_measurement_rejected():
+    circuit = QuantumCircuit(1, 1)
+    circuit.h(0)
+    circuit.measure(0, 0)
+    circuit.x(0)
+
+    with pytest.raises(NotImplementedError):
+        probabilities(circuit)